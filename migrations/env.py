@@ -73,6 +73,9 @@ def load_models():
         print("Loading SQLModel models...")
 
         # Import all models to register them with SQLModel metadata
+        from src.models.counter import EntityCounter
+        from src.models.status_history import VehicleStatusHistory
+        from src.models.table_version import TableVersion
         from src.models.vehicle import Vehicle
         from src.models.vendor import Vendor
 
@@ -81,7 +84,13 @@ def load_models():
         # from src.models.order import Order
         # from src.models.vehicle import Vehicle
 
-        models = [Vendor, Vehicle]  # Add future models to this list
+        models = [
+            Vendor,
+            Vehicle,
+            EntityCounter,
+            VehicleStatusHistory,
+            TableVersion,
+        ]  # Add future models to this list
         print(f"Loaded {len(models)} models: {[model.__name__ for model in models]}")
 
     except ImportError as e:
@@ -0,0 +1,40 @@
+"""add keyset pagination indexes
+
+Revision ID: 3b8f1c2d4e5a
+Revises: 6d30dda6a76f
+Create Date: 2026-10-17 09:12:44.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b8f1c2d4e5a"
+down_revision: Union[str, Sequence[str], None] = "6d30dda6a76f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_vendor_created_at_id", "vendor", ["created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_vehicle_created_at_id", "vehicle", ["created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_vehicle_vendor_id_created_at_id",
+        "vehicle",
+        ["vendor_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_vehicle_vendor_id_created_at_id", table_name="vehicle")
+    op.drop_index("ix_vehicle_created_at_id", table_name="vehicle")
+    op.drop_index("ix_vendor_created_at_id", table_name="vendor")
@@ -0,0 +1,45 @@
+"""add trigram search indexes
+
+Revision ID: a41c7e9b2f60
+Revises: 3b8f1c2d4e5a
+Create Date: 2026-10-17 10:03:21.775410
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a41c7e9b2f60"
+down_revision: Union[str, Sequence[str], None] = "3b8f1c2d4e5a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = {
+    "vendor": ("company_name", "contact_person", "email"),
+    "vehicle": ("registration_number", "make", "model"),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, columns in TRIGRAM_INDEXES.items():
+        for column in columns:
+            op.create_index(
+                f"ix_{table}_{column}_trgm",
+                table,
+                [column],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, columns in TRIGRAM_INDEXES.items():
+        for column in columns:
+            op.drop_index(f"ix_{table}_{column}_trgm", table_name=table)
+    # pg_trgm stays: it may have existed before, and other objects may use it
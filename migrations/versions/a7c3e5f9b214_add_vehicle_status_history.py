@@ -0,0 +1,69 @@
+"""add partitioned vehicle status history
+
+Revision ID: a7c3e5f9b214
+Revises: f1b6d04c8e27
+Create Date: 2026-10-17 15:32:08.471923
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from src.models.status_history import STATUS_HISTORY_DDL
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e5f9b214"
+down_revision: Union[str, Sequence[str], None] = "f1b6d04c8e27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "vehicle_status_history",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("changed_at", sa.DateTime(), nullable=False),
+        sa.Column("vehicle_id", sa.Uuid(), nullable=False),
+        sa.Column("from_status", sa.String(length=50), nullable=True),
+        sa.Column("to_status", sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint("id", "changed_at"),
+        postgresql_partition_by="RANGE (changed_at)",
+    )
+    op.create_index(
+        "ix_vehicle_status_history_changed_at_brin",
+        "vehicle_status_history",
+        ["changed_at"],
+        unique=False,
+        postgresql_using="brin",
+    )
+    op.create_index(
+        "ix_vehicle_status_history_vehicle_id_changed_at",
+        "vehicle_status_history",
+        ["vehicle_id", "changed_at"],
+        unique=False,
+    )
+    # The default partition, the recording function and its triggers. Monthly
+    # partitions are created by the application's maintenance job.
+    for statement in STATUS_HISTORY_DDL:
+        op.execute(statement)
+    # When existing vehicles entered their current status is unknown; their
+    # last update is the closest recorded time.
+    op.execute(
+        """
+        INSERT INTO vehicle_status_history
+            (vehicle_id, from_status, to_status, changed_at)
+        SELECT id, NULL, status, updated_at FROM vehicle
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS vehicle_record_status_updates ON vehicle")
+    op.execute("DROP TRIGGER IF EXISTS vehicle_record_status_inserts ON vehicle")
+    op.execute("DROP FUNCTION IF EXISTS vehicle_record_status_changes()")
+    # Drops every partition with it
+    op.drop_table("vehicle_status_history")
@@ -0,0 +1,36 @@
+"""add vendor and vehicle change feed triggers
+
+Revision ID: b9d2f4a6c831
+Revises: a7c3e5f9b214
+Create Date: 2026-10-17 17:05:44.218306
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+from src.models.change_feed import CHANGE_FEED_DDL, FEED_TABLES
+
+# revision identifiers, used by Alembic.
+revision: str = "b9d2f4a6c831"
+down_revision: Union[str, Sequence[str], None] = "a7c3e5f9b214"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Trigger suffixes, for the downgrade
+TRIGGER_SUFFIXES = ("inserts", "updates", "deletes")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in CHANGE_FEED_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in FEED_TABLES:
+        for suffix in TRIGGER_SUFFIXES:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_publish_{suffix} ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_publish_changes()")
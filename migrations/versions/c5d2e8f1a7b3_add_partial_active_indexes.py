@@ -0,0 +1,63 @@
+"""add partial indexes on active rows
+
+Revision ID: c5d2e8f1a7b3
+Revises: a41c7e9b2f60
+Create Date: 2026-10-17 11:26:05.482913
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d2e8f1a7b3"
+down_revision: Union[str, Sequence[str], None] = "a41c7e9b2f60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Vehicle list queries only ever read active rows, so the keyset indexes
+    # are replaced by partial ones that skip soft-deleted vehicles.
+    op.create_index(
+        "ix_vehicle_active_created_at_id",
+        "vehicle",
+        ["created_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+    op.create_index(
+        "ix_vehicle_active_vendor_id_created_at_id",
+        "vehicle",
+        ["vendor_id", "created_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+    op.drop_index("ix_vehicle_vendor_id_created_at_id", table_name="vehicle")
+    op.drop_index("ix_vehicle_created_at_id", table_name="vehicle")
+    op.create_index(
+        "ix_vendor_active_id",
+        "vendor",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_vendor_active_id", table_name="vendor")
+    op.create_index(
+        "ix_vehicle_created_at_id", "vehicle", ["created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_vehicle_vendor_id_created_at_id",
+        "vehicle",
+        ["vendor_id", "created_at", "id"],
+        unique=False,
+    )
+    op.drop_index("ix_vehicle_active_vendor_id_created_at_id", table_name="vehicle")
+    op.drop_index("ix_vehicle_active_created_at_id", table_name="vehicle")
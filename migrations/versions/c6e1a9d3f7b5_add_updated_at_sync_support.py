@@ -0,0 +1,40 @@
+"""stamp updated_at in the database and index it for delta sync
+
+Revision ID: c6e1a9d3f7b5
+Revises: b9d2f4a6c831
+Create Date: 2026-10-17 18:12:37.640519
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+from src.models.timestamps import TIMESTAMPED_TABLES, UPDATED_AT_DDL
+
+# revision identifiers, used by Alembic.
+revision: str = "c6e1a9d3f7b5"
+down_revision: Union[str, Sequence[str], None] = "b9d2f4a6c831"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in UPDATED_AT_DDL:
+        op.execute(statement)
+    for table in TIMESTAMPED_TABLES:
+        op.create_index(
+            f"ix_{table}_updated_at_id",
+            table,
+            ["updated_at", "id"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TIMESTAMPED_TABLES:
+        op.drop_index(f"ix_{table}_updated_at_id", table_name=table)
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_set_updated_at ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
@@ -0,0 +1,45 @@
+"""add trigger-maintained table versions for ETags
+
+Revision ID: d2f7b4c9e1a6
+Revises: c6e1a9d3f7b5
+Create Date: 2026-10-17 19:26:03.508174
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from src.models.table_version import TABLE_VERSION_DDL, VERSIONED_TABLES
+
+# revision identifiers, used by Alembic.
+revision: str = "d2f7b4c9e1a6"
+down_revision: Union[str, Sequence[str], None] = "c6e1a9d3f7b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Trigger suffixes, for the downgrade
+TRIGGER_SUFFIXES = ("inserts", "updates", "deletes", "truncates")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "table_versions",
+        sa.Column("table_name", sa.String(length=63), nullable=False),
+        sa.Column("shard", sa.Integer(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("table_name", "shard"),
+    )
+    for statement in TABLE_VERSION_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in VERSIONED_TABLES:
+        for suffix in TRIGGER_SUFFIXES:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_version_{suffix} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS table_versions_bump()")
+    op.drop_table("table_versions")
@@ -0,0 +1,68 @@
+"""add trigger-maintained entity counters
+
+Revision ID: d8a4b1f63e92
+Revises: c5d2e8f1a7b3
+Create Date: 2026-10-17 12:41:37.905126
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from src.models.counter import COUNTED_TABLES, COUNTER_DDL
+
+# revision identifiers, used by Alembic.
+revision: str = "d8a4b1f63e92"
+down_revision: Union[str, Sequence[str], None] = "c5d2e8f1a7b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Trigger suffixes, for the downgrade
+TRIGGER_SUFFIXES = ("inserts", "updates", "deletes", "truncates")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "entity_counters",
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("shard", sa.Integer(), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("name", "shard"),
+    )
+    # The functions and triggers, with the shard count, come from the model
+    for statement in COUNTER_DDL:
+        op.execute(statement)
+
+    # The triggers lock out writers until commit, so the backfill is exact
+    op.execute(
+        """
+        INSERT INTO entity_counters (name, shard, value)
+        SELECT name, 0, value FROM (
+            SELECT 'vendor:active' AS name, count(*) AS value
+            FROM vendor WHERE is_active
+            UNION ALL
+            SELECT 'vehicle:active', count(*) FROM vehicle WHERE is_active
+            UNION ALL
+            SELECT 'vehicle:status:' || status, count(*)
+            FROM vehicle WHERE is_active GROUP BY status
+            UNION ALL
+            SELECT 'vehicle:vendor:' || vendor_id, count(*)
+            FROM vehicle WHERE is_active GROUP BY vendor_id
+        ) AS counts
+        WHERE value > 0
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in COUNTED_TABLES:
+        for suffix in TRIGGER_SUFFIXES:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_count_{suffix} ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_count_changes()")
+    op.execute("DROP FUNCTION IF EXISTS entity_counters_reset()")
+    op.execute("DROP FUNCTION IF EXISTS entity_counters_apply(text[], text[])")
+    op.drop_table("entity_counters")
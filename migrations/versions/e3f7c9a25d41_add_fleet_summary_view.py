@@ -0,0 +1,30 @@
+"""add fleet summary materialized view
+
+Revision ID: e3f7c9a25d41
+Revises: d8a4b1f63e92
+Create Date: 2026-10-17 13:58:12.640377
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+from src.models.fleet import FLEET_SUMMARY_DDL, FLEET_SUMMARY_VIEW
+
+# revision identifiers, used by Alembic.
+revision: str = "e3f7c9a25d41"
+down_revision: Union[str, Sequence[str], None] = "d8a4b1f63e92"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in FLEET_SUMMARY_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(f"DROP MATERIALIZED VIEW IF EXISTS {FLEET_SUMMARY_VIEW}")
@@ -0,0 +1,42 @@
+"""add vehicle capacity indexes
+
+Revision ID: f1b6d04c8e27
+Revises: e3f7c9a25d41
+Create Date: 2026-10-17 14:47:50.118264
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1b6d04c8e27"
+down_revision: Union[str, Sequence[str], None] = "e3f7c9a25d41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_vehicle_active_status_capacity_id",
+        "vehicle",
+        ["status", "capacity", "id"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+    op.create_index(
+        "ix_vehicle_active_capacity_id",
+        "vehicle",
+        ["capacity", "id"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_vehicle_active_capacity_id", table_name="vehicle")
+    op.drop_index("ix_vehicle_active_status_capacity_id", table_name="vehicle")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark the utilization bucketing on a synthetic fleet, without a database.
+
+Every vehicle gets a random status history over the period (a status held at
+the start of the range, then `--changes-per-day` changes a day on average),
+which is then bucketed into per-day status shares for the whole fleet, per
+vendor and per vehicle. Exits non-zero if any grouping takes longer than
+`--max-seconds`, so it can guard against regressions.
+
+Usage:
+    uv run scripts/benchmark_utilization.py
+    uv run scripts/benchmark_utilization.py --vehicles 100000 --days 90
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.analytics.utilization import (  # noqa: E402
+    SECONDS_PER_DAY,
+    daily_status_seconds,
+    status_percentages,
+)
+from src.schemas.vehicle import VehicleStatus  # noqa: E402
+
+
+def synthetic_spans(
+    vehicles: int, days: int, changes_per_day: float, seed: int
+) -> Dict[str, np.ndarray]:
+    """
+    Status spans for `vehicles` vehicles, each with the same number of
+    changes at random times, as the repository would load them.
+    """
+    rng = np.random.default_rng(seed)
+    horizon = days * SECONDS_PER_DAY
+    per_vehicle = max(int(round(changes_per_day * days)), 0) + 1
+
+    # Span starts: 0 for the opening status, then sorted random change times
+    starts = np.sort(rng.uniform(0.0, horizon, (vehicles, per_vehicle)), axis=1)
+    starts[:, 0] = 0.0
+    ends = np.empty_like(starts)
+    ends[:, :-1] = starts[:, 1:]
+    ends[:, -1] = horizon
+
+    return {
+        "vehicle": np.repeat(np.arange(vehicles, dtype=np.int32), per_vehicle),
+        "status": rng.integers(0, len(VehicleStatus), starts.size, dtype=np.int16),
+        "start": starts.ravel(),
+        "end": ends.ravel(),
+    }
+
+
+def run(
+    spans: Dict[str, np.ndarray], groups: np.ndarray, n_groups: int, days: int
+) -> Tuple[float, np.ndarray]:
+    began = time.perf_counter()
+    seconds = daily_status_seconds(
+        groups,
+        spans["status"],
+        spans["start"],
+        spans["end"],
+        n_groups=n_groups,
+        n_statuses=len(VehicleStatus),
+        days=days,
+    )
+    status_percentages(seconds)
+    return time.perf_counter() - began, seconds
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the utilization bucketing on a synthetic fleet."
+    )
+    parser.add_argument("--vehicles", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--changes-per-day", type=float, default=1.0)
+    parser.add_argument("--vendors", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=10.0,
+        help="Fail if any grouping takes longer than this (default: 10).",
+    )
+    args = parser.parse_args()
+
+    began = time.perf_counter()
+    spans = synthetic_spans(args.vehicles, args.days, args.changes_per_day, args.seed)
+    print(
+        f"Generated {len(spans['start']):,} spans for {args.vehicles:,} vehicles "
+        f"x {args.days} days in {time.perf_counter() - began:.2f}s"
+    )
+
+    expected = args.vehicles * args.days * SECONDS_PER_DAY
+    groupings = {
+        "fleet": (np.zeros_like(spans["vehicle"]), 1),
+        "vendor": (spans["vehicle"] % args.vendors, args.vendors),
+        "vehicle": (spans["vehicle"], args.vehicles),
+    }
+    failed = False
+    for name, (groups, n_groups) in groupings.items():
+        elapsed, seconds = run(spans, groups, n_groups, args.days)
+        # Every vehicle has a status for the whole period
+        if not np.isclose(seconds.sum(), expected):
+            print(f"{name}: wrong total {seconds.sum():.0f}s, expected {expected:.0f}s")
+            failed = True
+        rate = len(spans["start"]) / elapsed
+        verdict = "ok" if elapsed <= args.max_seconds else "TOO SLOW"
+        print(
+            f"{name:>8}: {elapsed:6.2f}s  ({rate / 1e6:,.1f}M spans/s, "
+            f"{n_groups:,} groups)  {verdict}"
+        )
+        failed |= elapsed > args.max_seconds
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark the per-request overhead of the response header middleware.
+
+Compares three stacks around the same trivial endpoint, calling the ASGI app
+directly so no network or client overhead is measured:
+
+    bare     - no middleware
+    legacy   - the previous request-id and security-header functions, each
+               registered with app.middleware("http") (BaseHTTPMiddleware)
+    asgi     - the single pure ASGI ResponseHeadersMiddleware
+
+Usage:
+    uv run scripts/benchmarks/middleware.py --requests 20000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.types import Message
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.middleware.headers import ResponseHeadersMiddleware  # noqa: E402
+
+
+async def legacy_request_id_middleware(request: Request, call_next):
+    request_id = str(uuid.uuid4())
+    request.state.request_id = request_id
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
+async def legacy_security_headers_middleware(request: Request, call_next):
+    response = await call_next(request)
+    response.headers["X-Content-Type-Options"] = "nosniff"
+    response.headers["X-Frame-Options"] = "DENY"
+    response.headers["X-XSS-Protection"] = "1; mode=block"
+    return response
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/plain")
+    async def plain():
+        return PlainTextResponse("ok")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(8):
+                yield b"x" * 1024
+
+        return StreamingResponse(chunks())
+
+    if stack == "legacy":
+        app.middleware("http")(legacy_security_headers_middleware)
+        app.middleware("http")(legacy_request_id_middleware)
+    elif stack == "asgi":
+        app.add_middleware(ResponseHeadersMiddleware)
+    return app
+
+
+async def call(app: FastAPI, path: str) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    request_sent = False
+
+    async def receive() -> Message:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # The client stays connected: streaming responses watch for a
+        # disconnect while they send, and would stop at once on one.
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app: FastAPI, path: str, requests: int, rounds: int) -> float:
+    """Returns the best-of-rounds mean time per request, in microseconds."""
+    for _ in range(min(requests, 1000)):
+        await call(app, path)
+    means = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(requests):
+            await call(app, path)
+        means.append((time.perf_counter() - start) / requests * 1e6)
+    return min(means)
+
+
+async def run(requests: int, rounds: int) -> None:
+    apps = {stack: build_app(stack) for stack in ("bare", "legacy", "asgi")}
+    for path in ("/plain", "/stream"):
+        results = {
+            stack: await measure(app, path, requests, rounds)
+            for stack, app in apps.items()
+        }
+        bare = results["bare"]
+        print(f"\n{path} ({requests} requests, best of {rounds} rounds)")
+        print(f"{'stack':<8} {'us/request':>11} {'overhead us':>12}")
+        for stack, value in results.items():
+            print(f"{stack:<8} {value:>11.1f} {value - bare:>12.1f}")
+        reduction = (results["legacy"] - bare) / max(results["asgi"] - bare, 0.01)
+        print(f"overhead reduction: {reduction:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Microbenchmark the response header middleware's overhead."
+    )
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
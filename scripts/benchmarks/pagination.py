@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark offset vs keyset pagination of the vehicle list across page depth.
+
+Seeds synthetic vehicles inside a transaction that is rolled back at the end,
+so it can be pointed at a development database without leaving data behind.
+
+Usage:
+    uv run scripts/benchmarks/pagination.py --rows 200000 --page-size 100
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.config import settings  # noqa: E402
+from src.repositories.vehicle import vehicle_repo  # noqa: E402
+
+SEED_SQL = """
+WITH v AS (
+    INSERT INTO vendor (id, company_name, email, is_active, created_at, updated_at)
+    VALUES (gen_random_uuid(), 'Pagination Bench', 'pagination-bench@example.com',
+            true, now(), now())
+    RETURNING id
+)
+INSERT INTO vehicle (id, vendor_id, registration_number, make, model, capacity,
+                     status, is_active, created_at, updated_at)
+SELECT gen_random_uuid(), v.id, 'BENCH-' || g, 'Tata', 'Prima', 10.0, 'Idle', true,
+       now() - (g || ' seconds')::interval, now()
+FROM v, generate_series(1, :rows) AS g
+"""
+
+
+async def _time(coro_factory, repeat: int) -> float:
+    """Returns the median wall time of `repeat` runs in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await coro_factory()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def run(rows: int, page_size: int, repeat: int) -> None:
+    engine = create_async_engine(settings.DATABASE_URL)
+    async with engine.connect() as conn:
+        await conn.begin()
+        session = AsyncSession(bind=conn, expire_on_commit=False)
+
+        print(f"Seeding {rows} vehicles (rolled back afterwards)...")
+        await session.execute(text(SEED_SQL), {"rows": rows})
+        await session.execute(text("ANALYZE vehicle"))
+
+        max_page = rows // page_size
+        depths = sorted(
+            {1, 10, 100, max_page // 2, max_page - 1} & set(range(1, max_page))
+        )
+
+        print(f"{'page':>8} {'offset (ms)':>12} {'keyset (ms)':>12}")
+        for page in depths:
+            skip = page * page_size
+            # Position the keyset cursor on the last row of the previous page.
+            boundary = await vehicle_repo.get_multi(session, skip=skip - 1, limit=1)
+            after = (boundary[0].created_at, boundary[0].id)
+
+            async def offset_page():
+                await vehicle_repo.get_multi(session, skip=skip, limit=page_size)
+                session.expunge_all()
+
+            async def keyset_page():
+                await vehicle_repo.get_multi(session, limit=page_size, after=after)
+                session.expunge_all()
+
+            offset_ms = await _time(offset_page, repeat)
+            keyset_ms = await _time(keyset_page, repeat)
+            print(f"{page:>8} {offset_ms:>12.2f} {keyset_ms:>12.2f}")
+
+        await session.close()
+        await conn.rollback()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark offset vs keyset pagination of the vehicle list."
+    )
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.page_size, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark the read-only session dependency against the transactional one.
+
+Drives both FastAPI dependencies exactly as a request would (open, run the
+query, close) and reports the per-request latency. The transactional session
+pays for BEGIN and COMMIT round trips around the query; the read-only session
+runs in autocommit mode and sends only the query. The saving per request is
+roughly two network round trips, so it grows with the database's distance.
+
+Both sessions are opened on the primary: get_primary_read_session is the
+read-only session get_read_session falls back to, without the replica routing
+that needs a request.
+
+Usage:
+    uv run scripts/benchmarks/read_session.py --requests 2000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.db import (  # noqa: E402
+    engine,
+    get_db_session,
+    get_primary_read_session,
+)
+from src.repositories.vendor import vendor_repo  # noqa: E402
+
+
+async def one_request(dependency) -> float:
+    start = time.perf_counter()
+    generator = dependency()
+    session = await anext(generator)
+    await vendor_repo.get_active_count(session)
+    try:
+        await anext(generator)
+    except StopAsyncIteration:
+        pass
+    return (time.perf_counter() - start) * 1000
+
+
+async def run(requests: int) -> None:
+    results = {}
+    for name, dependency in (
+        ("get_db_session", get_db_session),
+        ("read-only session", get_primary_read_session),
+    ):
+        for _ in range(min(requests, 100)):
+            await one_request(dependency)
+        timings = [await one_request(dependency) for _ in range(requests)]
+        results[name] = timings
+
+    print(f"GET /vendors/count query, {requests} sequential requests")
+    print(f"{'dependency':<18} {'mean (ms)':>10} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    for name, timings in results.items():
+        timings.sort()
+        print(
+            f"{name:<18} {statistics.fmean(timings):>10.3f} "
+            f"{timings[len(timings) // 2]:>9.3f} "
+            f"{timings[int(len(timings) * 0.99) - 1]:>9.3f}"
+        )
+    saved = statistics.fmean(results["get_db_session"]) - statistics.fmean(
+        results["read-only session"]
+    )
+    print(f"saved per request: {saved:.3f} ms")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the read-only session against the transactional one."
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
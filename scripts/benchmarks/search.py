@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark trigram-indexed vehicle search at scale and verify the plans with EXPLAIN.
+
+Seeds synthetic vehicles (1M by default) inside a transaction that is rolled
+back at the end. Each search term is run through the repository query with
+EXPLAIN (ANALYZE, BUFFERS). The script checks that the trigram GIN indexes are
+used, and compares against the same query with index scans disabled, which is
+how the old leading-wildcard ILIKE search was planned.
+
+Usage:
+    uv run scripts/benchmarks/search.py --rows 1000000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlmodel import col, select
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.config import settings  # noqa: E402
+from src.models.vehicle import Vehicle  # noqa: E402
+from src.repositories.vehicle import VehicleRepository, _trigram_search  # noqa: E402
+
+SEED_SQL = """
+WITH v AS (
+    INSERT INTO vendor (id, company_name, email, is_active, created_at, updated_at)
+    VALUES (gen_random_uuid(), 'Search Bench', 'search-bench@example.com',
+            true, now(), now())
+    RETURNING id
+)
+INSERT INTO vehicle (id, vendor_id, registration_number, make, model, capacity,
+                     status, is_active, created_at, updated_at)
+SELECT gen_random_uuid(), v.id,
+       'KA-' || lpad((g % 100)::text, 2, '0') || '-' || md5(g::text)::varchar(6)
+           || '-' || g,
+       (ARRAY['Tata', 'Ashok Leyland', 'Eicher', 'Mahindra', 'BharatBenz',
+              'Volvo', 'Scania', 'Isuzu'])[1 + g % 8],
+       (ARRAY['Prima', 'Signa', 'Ultra', 'Boss', 'Pro 3015', 'Furio', 'FH16',
+              'R500', 'D-Max', 'Blazo X'])[1 + (g / 8) % 10] || ' ' || (g % 997),
+       (g % 40)::float, 'Idle', true, now(), now()
+FROM v, generate_series(1, :rows) AS g
+"""
+
+TERMS = ["leyland", "furio 42", "KA-17-a1", "volv"]
+
+
+def _search_query(term: str, limit: int):
+    """The query VehicleRepository.search issues, rendered with literal binds."""
+    score = _trigram_search.score(term)
+    query = (
+        select(Vehicle, score.label("score"))
+        .where(Vehicle.is_active, VehicleRepository._search_condition(term))
+        .order_by(score.desc(), col(Vehicle.id))
+        .limit(limit)
+    )
+    return str(
+        query.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+async def _explain(session: AsyncSession, sql: str) -> tuple[float, str]:
+    start = time.perf_counter()
+    result = await session.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"))
+    elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, "\n".join(row[0] for row in result.all())
+
+
+async def run(rows: int, limit: int, show_plans: bool) -> None:
+    engine = create_async_engine(settings.DATABASE_URL)
+    async with engine.connect() as conn:
+        await conn.begin()
+        session = AsyncSession(bind=conn)
+
+        print(f"Seeding {rows} vehicles (rolled back afterwards)...")
+        await session.execute(text(SEED_SQL), {"rows": rows})
+        await session.execute(text("ANALYZE vehicle"))
+
+        print(f"{'term':<12} {'trigram (ms)':>13} {'seq scan (ms)':>14}  index used")
+        failures = []
+        for term in TERMS:
+            sql = _search_query(term, limit)
+
+            indexed_ms, indexed_plan = await _explain(session, sql)
+
+            await session.execute(text("SET LOCAL enable_bitmapscan = off"))
+            await session.execute(text("SET LOCAL enable_indexscan = off"))
+            baseline_ms, baseline_plan = await _explain(session, sql)
+            await session.execute(text("SET LOCAL enable_bitmapscan = on"))
+            await session.execute(text("SET LOCAL enable_indexscan = on"))
+
+            uses_trigram = "_trgm" in indexed_plan
+            if not uses_trigram:
+                failures.append(term)
+            print(
+                f"{term:<12} {indexed_ms:>13.2f} {baseline_ms:>14.2f}  "
+                f"{'yes' if uses_trigram else 'NO'}"
+            )
+            if show_plans:
+                print(indexed_plan, "\n", baseline_plan, sep="")
+
+        await session.close()
+        await conn.rollback()
+    await engine.dispose()
+
+    if failures:
+        print(f"Trigram indexes were not used for: {', '.join(failures)}")
+        sys.exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark trigram-indexed vehicle search and verify its plans."
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--show-plans", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.limit, args.show_plans))
+
+
+if __name__ == "__main__":
+    main()
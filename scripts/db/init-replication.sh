@@ -0,0 +1,5 @@
+#!/bin/sh
+# Runs once when the primary's data directory is initialised (docker-entrypoint-initdb.d).
+# Lets the local streaming replica (docker compose --profile replica) connect.
+set -e
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
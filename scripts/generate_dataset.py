@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Generate a large, reproducible vendor/vehicle dataset and bulk-load it with COPY.
+
+Rows are derived only from `--seed` and their position, so the same arguments
+always produce the same dataset regardless of `--workers`. Each chunk of rows is
+generated and copied by its own process over its own connection; vendors are
+loaded before vehicles because of the foreign key.
+
+Usage:
+    uv run alembic upgrade head
+    uv run scripts/generate_dataset.py --vendors 50000 --vehicles 2000000 --truncate
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Tuple
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import inspect
+from sqlalchemy.engine import make_url
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.config import settings  # noqa: E402
+from src.models.vehicle import Vehicle  # noqa: E402
+from src.models.vendor import Vendor  # noqa: E402
+from src.schemas.vehicle import VehicleStatus  # noqa: E402
+
+# Share of the fleet in each status at any given time.
+STATUS_WEIGHTS = {
+    VehicleStatus.IN_TRANSIT: 0.55,
+    VehicleStatus.IDLE: 0.30,
+    VehicleStatus.MAINTENANCE: 0.10,
+    VehicleStatus.OUT_OF_SERVICE: 0.05,
+}
+
+# (make, model, min capacity, max capacity) in tonnes.
+VEHICLE_MODELS = [
+    ("Tata", "Ace Gold", 0.75, 0.9),
+    ("Tata", "Ultra 1918", 12.0, 13.0),
+    ("Tata", "Prima 4028.S", 25.0, 40.0),
+    ("Tata", "Signa 4825.TK", 30.0, 48.0),
+    ("Ashok Leyland", "Dost+", 1.25, 1.5),
+    ("Ashok Leyland", "Boss 1415", 9.0, 10.0),
+    ("Ashok Leyland", "Captain 3718", 25.0, 37.0),
+    ("Eicher", "Pro 2049", 3.5, 5.0),
+    ("Eicher", "Pro 3015", 10.0, 11.0),
+    ("Mahindra", "Bolero Pik-Up", 1.3, 1.7),
+    ("Mahindra", "Blazo X 49", 35.0, 49.0),
+    ("BharatBenz", "1617R", 10.0, 12.0),
+    ("BharatBenz", "3528C", 25.0, 35.0),
+    ("Volvo", "FMX 460", 30.0, 40.0),
+    ("Volvo", "FH16", 40.0, 55.0),
+]
+
+STATE_CODES = ["MH", "DL", "KA", "TN", "GJ", "RJ", "UP", "HR", "PB", "WB", "TS", "AP"]
+
+COMPANY_PREFIXES = [
+    "Shree", "Sai", "Om", "Jai", "New", "Royal", "National", "Global", "Apex",
+    "Swift", "Prime", "Eastern", "Western", "Northern", "Southern", "Express",
+]  # fmt: skip
+COMPANY_CORES = [
+    "Ganesh", "Balaji", "Krishna", "Durga", "Laxmi", "Sagar", "Vijay", "Bharat",
+    "Ocean", "Highway", "Cargo", "Freight", "Fleet", "Roadways", "Carriers",
+]  # fmt: skip
+COMPANY_SUFFIXES = [
+    "Logistics", "Transport", "Roadlines", "Movers", "Carriers",
+    "Transport Co.", "Logistics Pvt Ltd", "Freight Services", "Supply Chain",
+]  # fmt: skip
+FIRST_NAMES = [
+    "Aarav", "Vivaan", "Aditya", "Arjun", "Rohan", "Priya", "Ananya", "Kavya",
+    "Neha", "Rahul", "Sanjay", "Suresh", "Meera", "Pooja", "Vikram", "Farhan",
+]  # fmt: skip
+LAST_NAMES = [
+    "Sharma", "Verma", "Patel", "Reddy", "Nair", "Iyer", "Singh", "Gupta",
+    "Khan", "Das", "Mehta", "Joshi", "Rao", "Kulkarni", "Chopra", "Bose",
+]  # fmt: skip
+EMAIL_DOMAINS = ["example.com", "example.in", "example.org", "example.net"]
+
+# Registration numbers end in two letters and four digits; a multiplier
+# coprime with their count shuffles them while keeping them unique.
+REGISTRATION_SPACE = 26 * 26 * 10_000
+REGISTRATION_STEP = 2_750_159
+# Ten-digit mobile numbers starting with 9, shuffled the same way.
+PHONE_SPACE = 1_000_000_000
+PHONE_STEP = 7_919
+
+# Fraction of vendors with a phone number on file.
+PHONE_FRACTION = 0.8
+
+VENDOR_COLUMNS = [column.name for column in inspect(Vendor).columns]
+VEHICLE_COLUMNS = [column.name for column in inspect(Vehicle).columns]
+
+
+def stable_uuid(seed: int, kind: str, index: int) -> UUID:
+    """Derives a random-looking but reproducible version 4 UUID."""
+    digest = hashlib.blake2b(f"{seed}:{kind}:{index}".encode(), digest_size=16)
+    return UUID(bytes=digest.digest(), version=4)
+
+
+def chunk_rng(seed: int, kind: str, start: int) -> random.Random:
+    return random.Random(f"{seed}:{kind}:{start}")
+
+
+def timestamps(rng: random.Random, now: datetime, days: int) -> Tuple[datetime, ...]:
+    created_at = now - timedelta(seconds=rng.uniform(0, days * 86_400))
+    updated_at = created_at + (now - created_at) * rng.random() ** 2
+    return created_at, updated_at
+
+
+def vendor_rows(
+    seed: int, start: int, stop: int, inactive_fraction: float, now: datetime, days: int
+) -> List[tuple]:
+    rng = chunk_rng(seed, "vendor", start)
+    rows = []
+    for i in range(start, stop):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        company = " ".join(
+            (
+                rng.choice(COMPANY_PREFIXES),
+                rng.choice(COMPANY_CORES),
+                rng.choice(COMPANY_SUFFIXES),
+            )
+        )
+        phone = None
+        if rng.random() < PHONE_FRACTION:
+            phone = f"+91-9{(i * PHONE_STEP) % PHONE_SPACE:09d}"
+        created_at, updated_at = timestamps(rng, now, days)
+        row = {
+            "id": stable_uuid(seed, "vendor", i),
+            "company_name": company,
+            "contact_person": f"{first} {last}",
+            "email": f"{first}.{last}.{i}@{rng.choice(EMAIL_DOMAINS)}".lower(),
+            "phone_number": phone,
+            "is_active": rng.random() >= inactive_fraction,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+        rows.append(tuple(row[column] for column in VENDOR_COLUMNS))
+    return rows
+
+
+def registration_number(rng: random.Random, index: int) -> str:
+    suffix = (index * REGISTRATION_STEP) % REGISTRATION_SPACE
+    letters, digits = divmod(suffix, 10_000)
+    first, second = divmod(letters, 26)
+    return (
+        f"{rng.choice(STATE_CODES)}{rng.randint(1, 50):02d}"
+        f"{chr(65 + first)}{chr(65 + second)}{digits:04d}"
+    )
+
+
+def vehicle_rows(
+    seed: int,
+    start: int,
+    stop: int,
+    vendors: int,
+    inactive_fraction: float,
+    now: datetime,
+    days: int,
+) -> List[tuple]:
+    rng = chunk_rng(seed, "vehicle", start)
+    statuses = [status.value for status in STATUS_WEIGHTS]
+    status_weights = list(STATUS_WEIGHTS.values())
+    rows = []
+    for i in range(start, stop):
+        make, model, low, high = rng.choice(VEHICLE_MODELS)
+        # Cubing a uniform sample skews fleets: a few vendors own most vehicles.
+        vendor_index = int(vendors * rng.random() ** 3)
+        created_at, updated_at = timestamps(rng, now, days)
+        row = {
+            "id": stable_uuid(seed, "vehicle", i),
+            "vendor_id": stable_uuid(seed, "vendor", vendor_index),
+            "registration_number": registration_number(rng, i),
+            "make": make,
+            "model": model,
+            "capacity": round(rng.uniform(low, high), 2),
+            "status": rng.choices(statuses, status_weights)[0],
+            "is_active": rng.random() >= inactive_fraction,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+        rows.append(tuple(row[column] for column in VEHICLE_COLUMNS))
+    return rows
+
+
+def asyncpg_dsn() -> str:
+    url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+async def _copy(table: str, columns: List[str], rows: List[tuple]) -> None:
+    connection = await asyncpg.connect(asyncpg_dsn())
+    try:
+        await connection.copy_records_to_table(table, records=rows, columns=columns)
+    finally:
+        await connection.close()
+
+
+def load_chunk(kind: str, start: int, stop: int, options: dict) -> int:
+    """Generates one chunk and COPYs it in. Runs in a worker process."""
+    if kind == "vendor":
+        rows = vendor_rows(
+            options["seed"],
+            start,
+            stop,
+            options["inactive_fraction"],
+            options["now"],
+            options["days"],
+        )
+        columns = VENDOR_COLUMNS
+    else:
+        rows = vehicle_rows(
+            options["seed"],
+            start,
+            stop,
+            options["vendors"],
+            options["inactive_fraction"],
+            options["now"],
+            options["days"],
+        )
+        columns = VEHICLE_COLUMNS
+    asyncio.run(_copy(kind, columns, rows))
+    return len(rows)
+
+
+def load(
+    executor: ProcessPoolExecutor, kind: str, total: int, chunk: int, options: dict
+) -> None:
+    start_time = time.perf_counter()
+    futures = [
+        executor.submit(load_chunk, kind, start, min(start + chunk, total), options)
+        for start in range(0, total, chunk)
+    ]
+    loaded = 0
+    for future in futures:
+        loaded += future.result()
+        print(f"\r  {kind}: {loaded:,}/{total:,}", end="", flush=True)
+    elapsed = time.perf_counter() - start_time
+    print(f"\r  {kind}: {loaded:,} rows in {elapsed:.1f}s ({loaded / elapsed:,.0f}/s)")
+
+
+async def prepare(truncate: bool) -> None:
+    connection = await asyncpg.connect(asyncpg_dsn())
+    try:
+        if truncate:
+            await connection.execute("TRUNCATE vehicle, vendor")
+    finally:
+        await connection.close()
+
+
+async def analyze() -> None:
+    connection = await asyncpg.connect(asyncpg_dsn())
+    try:
+        await connection.execute("ANALYZE vendor")
+        await connection.execute("ANALYZE vehicle")
+    finally:
+        await connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate a reproducible vendor/vehicle dataset and bulk-load it."
+    )
+    parser.add_argument("--vendors", type=int, default=50_000)
+    parser.add_argument("--vehicles", type=int, default=2_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--inactive-fraction",
+        type=float,
+        default=0.05,
+        help="Fraction of vendors and vehicles that are soft-deleted",
+    )
+    parser.add_argument(
+        "--days", type=int, default=730, help="Spread created_at over this many days"
+    )
+    parser.add_argument(
+        "--end",
+        type=datetime.fromisoformat,
+        default=datetime(2025, 1, 1),
+        help="Latest created_at/updated_at (ISO date), fixed for reproducibility",
+    )
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--truncate",
+        action="store_true",
+        help="Delete all existing vendors and vehicles first",
+    )
+    args = parser.parse_args()
+
+    if args.vehicles and not args.vendors:
+        parser.error("--vehicles requires at least one vendor")
+    if args.vehicles > REGISTRATION_SPACE:
+        parser.error(f"--vehicles can be at most {REGISTRATION_SPACE:,}")
+    if not 0 <= args.inactive_fraction <= 1:
+        parser.error("--inactive-fraction must be between 0 and 1")
+
+    options = {
+        "seed": args.seed,
+        "vendors": args.vendors,
+        "inactive_fraction": args.inactive_fraction,
+        "days": args.days,
+        "now": args.end,
+    }
+
+    asyncio.run(prepare(args.truncate))
+    print(f"Loading with {args.workers} workers, {args.chunk_size:,} rows per chunk")
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        load(executor, "vendor", args.vendors, args.chunk_size, options)
+        load(executor, "vehicle", args.vehicles, args.chunk_size, options)
+    asyncio.run(analyze())
+
+
+if __name__ == "__main__":
+    main()
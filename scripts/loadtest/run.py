@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Load-test the API from a TOML scenario and report latency percentiles.
+
+Each scenario lists weighted request templates (see scripts/loadtest/scenarios).
+Requests run either closed-loop (every worker sends its next request as soon as
+the previous one finishes) or open-loop at a fixed arrival rate. In open-loop
+mode latency is measured from each request's scheduled start, so a server that
+falls behind is charged for the queueing it causes.
+
+Results (per request and overall RPS, error count, p50/p95/p99) are written as
+JSON. With --baseline, results are compared to a stored run and the script
+exits with status 1 when p99 latency or RPS regresses beyond --max-regression.
+A missing baseline is an error rather than a skipped comparison, so the gate
+cannot silently switch off; record one with --update-baseline
+(`make loadtest-baseline`) on the machine the comparisons will run on.
+
+Usage:
+    uv run uvicorn src.main:app --workers 2 &
+    uv run scripts/loadtest/run.py scripts/loadtest/scenarios/mixed.toml \\
+        --concurrency 32 --rate 200 --duration 30 --output loadtest.json \\
+        --baseline scripts/loadtest/baselines/mixed.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+import sys
+import time
+import tomllib
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+@dataclass
+class RequestTemplate:
+    name: str
+    method: str
+    path: str
+    weight: float = 1.0
+    params: Dict[str, Any] = field(default_factory=dict)
+    json: Optional[Dict[str, Any]] = None
+    expect: int = 200
+    # Store the response's "id" in this pool (e.g. "vendor_id") for later requests
+    capture: Optional[str] = None
+    # Follow the X-Next-Cursor header for up to this many extra pages
+    follow_cursor: int = 0
+
+
+@dataclass
+class Scenario:
+    name: str
+    requests: List[RequestTemplate]
+    duration: float = 30.0
+    warmup: float = 5.0
+    concurrency: int = 16
+    rate: float = 0.0
+    seed_vendors: int = 0
+    seed_vehicles_per_vendor: int = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "Scenario":
+        data = tomllib.loads(path.read_text())
+        seed = data.get("seed", {})
+        return cls(
+            name=data.get("name", path.stem),
+            requests=[RequestTemplate(**r) for r in data["requests"]],
+            duration=data.get("duration", 30.0),
+            warmup=data.get("warmup", 5.0),
+            concurrency=data.get("concurrency", 16),
+            rate=data.get("rate", 0.0),
+            seed_vendors=seed.get("vendors", 0),
+            seed_vehicles_per_vendor=seed.get("vehicles_per_vendor", 0),
+        )
+
+
+class Pools:
+    """IDs created during the run, used to fill {vendor_id}/{vehicle_id} templates."""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.ids: Dict[str, List[str]] = {"vendor_id": [], "vehicle_id": []}
+        self._counter = 0
+
+    def render(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {k: self.render(v) for k, v in value.items()}
+        if not isinstance(value, str):
+            return value
+        return _PLACEHOLDER.sub(lambda m: self._resolve(m.group(1)), value)
+
+    def _resolve(self, name: str) -> str:
+        if name == "uid":
+            self._counter += 1
+            return f"{self.run_id}-{self._counter}"
+        if name in self.ids:
+            if not self.ids[name]:
+                raise LookupError(f"No {name} available yet")
+            return random.choice(self.ids[name])
+        raise KeyError(f"Unknown placeholder {{{name}}}")
+
+
+@dataclass
+class Sample:
+    name: str
+    latency: float
+    ok: bool
+    at: float
+
+
+async def send(
+    client: httpx.AsyncClient, template: RequestTemplate, pools: Pools
+) -> bool:
+    """Sends one templated request (following cursors if asked); True on success."""
+    try:
+        path = pools.render(template.path)
+        params = pools.render(template.params)
+        body = pools.render(template.json) if template.json is not None else None
+    except LookupError:
+        return False
+
+    response = await client.request(template.method, path, params=params, json=body)
+    if response.status_code != template.expect:
+        return False
+    if template.capture:
+        pools.ids[template.capture].append(response.json()["id"])
+    for _ in range(template.follow_cursor):
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+        response = await client.request(
+            template.method, path, params={**params, "cursor": cursor}
+        )
+        if response.status_code != template.expect:
+            return False
+    return True
+
+
+async def timed(
+    client: httpx.AsyncClient,
+    template: RequestTemplate,
+    pools: Pools,
+    scheduled: float,
+    samples: List[Sample],
+) -> None:
+    try:
+        ok = await send(client, template, pools)
+    except httpx.HTTPError:
+        ok = False
+    now = time.perf_counter()
+    samples.append(Sample(template.name, now - scheduled, ok, now))
+
+
+async def run_closed_loop(client, scenario, pools, samples, deadline) -> None:
+    weights = [r.weight for r in scenario.requests]
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            template = random.choices(scenario.requests, weights)[0]
+            await timed(client, template, pools, time.perf_counter(), samples)
+
+    await asyncio.gather(*(worker() for _ in range(scenario.concurrency)))
+
+
+async def run_open_loop(client, scenario, pools, samples, deadline) -> None:
+    weights = [r.weight for r in scenario.requests]
+    slots = asyncio.Semaphore(scenario.concurrency)
+    tasks = set()
+    interval = 1.0 / scenario.rate
+    next_start = time.perf_counter()
+
+    async def limited(template: RequestTemplate, scheduled: float) -> None:
+        async with slots:
+            await timed(client, template, pools, scheduled, samples)
+
+    while next_start < deadline:
+        delay = next_start - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        template = random.choices(scenario.requests, weights)[0]
+        task = asyncio.create_task(limited(template, next_start))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        next_start += interval
+    await asyncio.gather(*tasks)
+
+
+async def seed(client: httpx.AsyncClient, scenario: Scenario, pools: Pools) -> None:
+    for i in range(scenario.seed_vendors):
+        response = await client.post(
+            "/api/v1/vendors/",
+            json={
+                "company_name": f"Load Vendor {i}",
+                "contact_person": f"Load Contact {i}",
+                "email": f"load-{pools.run_id}-{i}@example.com",
+            },
+        )
+        response.raise_for_status()
+        vendor_id = response.json()["id"]
+        pools.ids["vendor_id"].append(vendor_id)
+        for j in range(scenario.seed_vehicles_per_vendor):
+            response = await client.post(
+                "/api/v1/vehicles/",
+                json={
+                    "vendor_id": vendor_id,
+                    "registration_number": f"LT-{pools.run_id}-{i}-{j}",
+                    "make": random.choice(["Tata", "Eicher", "Volvo", "Ashok Leyland"]),
+                    "model": random.choice(["Prima", "Pro 3015", "FH16", "Boss"]),
+                    "capacity": random.uniform(1, 40),
+                },
+            )
+            response.raise_for_status()
+            pools.ids["vehicle_id"].append(response.json()["id"])
+
+
+async def cleanup(client: httpx.AsyncClient, pools: Pools) -> None:
+    """Permanently deletes everything the run created, vehicles first."""
+    for kind, path in (("vehicle_id", "vehicles"), ("vendor_id", "vendors")):
+        for obj_id in set(pools.ids[kind]):
+            await client.delete(
+                f"/api/v1/{path}/{obj_id}", params={"permanent": "true"}
+            )
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict[str, Any]:
+    def stats(group: List[Sample]) -> Dict[str, Any]:
+        latencies = sorted(s.latency * 1000 for s in group)
+        return {
+            "requests": len(group),
+            "errors": sum(not s.ok for s in group),
+            "rps": round(len(group) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50), 2),
+            "p95_ms": round(percentile(latencies, 0.95), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+            "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+        }
+
+    by_name: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_name.setdefault(sample.name, []).append(sample)
+    return {
+        "overall": stats(samples),
+        "requests": {name: stats(group) for name, group in sorted(by_name.items())},
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], max_regression: float
+) -> List[str]:
+    """Lists every p99 or RPS regression beyond the allowed fraction."""
+    regressions = []
+    current = {"overall": results["overall"], **results["requests"]}
+    expected = {"overall": baseline["overall"], **baseline["requests"]}
+    for name, base in expected.items():
+        now = current.get(name)
+        if now is None:
+            continue
+        if base["p99_ms"] and now["p99_ms"] > base["p99_ms"] * (1 + max_regression):
+            regressions.append(
+                f"{name}: p99 {now['p99_ms']:.1f} ms vs baseline {base['p99_ms']:.1f} ms"
+            )
+        if name == "overall" and now["rps"] < base["rps"] * (1 - max_regression):
+            regressions.append(
+                f"{name}: {now['rps']:.1f} rps vs baseline {base['rps']:.1f} rps"
+            )
+        if now["errors"] > base["errors"]:
+            regressions.append(
+                f"{name}: {now['errors']} errors vs baseline {base['errors']}"
+            )
+    return regressions
+
+
+def print_table(results: Dict[str, Any]) -> None:
+    print(
+        f"{'request':<24} {'count':>7} {'err':>5} {'rps':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    rows = {**results["requests"], "overall": results["overall"]}
+    for name, s in rows.items():
+        print(
+            f"{name:<24} {s['requests']:>7} {s['errors']:>5} {s['rps']:>8.1f} "
+            f"{s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f}"
+        )
+
+
+async def run(args: argparse.Namespace) -> int:
+    scenario = Scenario.load(args.scenario)
+    for option in ("duration", "warmup", "concurrency", "rate"):
+        if getattr(args, option) is not None:
+            setattr(scenario, option, getattr(args, option))
+
+    pools = Pools(uuid.uuid4().hex[:8])
+    limits = httpx.Limits(max_connections=scenario.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        await seed(client, scenario, pools)
+        loop = run_open_loop if scenario.rate > 0 else run_closed_loop
+
+        if scenario.warmup > 0:
+            deadline = time.perf_counter() + scenario.warmup
+            await loop(client, scenario, pools, [], deadline)
+
+        samples: List[Sample] = []
+        start = time.perf_counter()
+        await loop(client, scenario, pools, samples, start + scenario.duration)
+        elapsed = time.perf_counter() - start
+
+        if not args.keep_data:
+            await cleanup(client, pools)
+
+    results = {
+        "scenario": scenario.name,
+        "config": {
+            "duration": scenario.duration,
+            "concurrency": scenario.concurrency,
+            "rate": scenario.rate,
+            "base_url": args.base_url,
+        },
+        **summarize(samples, elapsed),
+    }
+    print_table(results)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if args.update_baseline and args.baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if args.baseline:
+        regressions = compare(
+            results, json.loads(args.baseline.read_text()), args.max_regression
+        )
+        if regressions:
+            print("Regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Load-test the API from a TOML scenario."
+    )
+    parser.add_argument("scenario", type=Path)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--duration", type=float, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, help="Unmeasured seconds first")
+    parser.add_argument("--concurrency", type=int, help="Max in-flight requests")
+    parser.add_argument("--rate", type=float, help="Requests/second; 0 = closed loop")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="Baseline results JSON")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.25,
+        help="Allowed fractional p99/RPS regression against the baseline",
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="Store this run as baseline"
+    )
+    parser.add_argument(
+        "--keep-data", action="store_true", help="Do not delete created rows"
+    )
+    args = parser.parse_args()
+    # Checked before any load is sent, rather than after a wasted run
+    if args.baseline and not args.update_baseline and not args.baseline.exists():
+        parser.error(
+            f"no baseline at {args.baseline}; record one with --update-baseline"
+        )
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,11 @@ CI_COMMANDS = [
     {"cmd": "uv run ruff format .", "desc": "Formatting code with Ruff"},
     {"cmd": "uv run pytest", "desc": "Running tests with Pytest"},
     {"cmd": "hurl tests/hurl/ --test", "desc": "Tests API with hurl"},
+    {
+        "cmd": "uv run scripts/loadtest/run.py scripts/loadtest/scenarios/mixed.toml"
+        " --duration 15 --baseline scripts/loadtest/baselines/mixed.json",
+        "desc": "Load testing the API",
+    },
     {"cmd": "hurl scripts/seed_data.hurl", "desc": "Seeds the data to api"},
     {"cmd": "hurl scripts/cleanup_data.hurl", "desc": "Cleans up the data"},
     {"cmd": "uv run pyright .", "desc": "Type checking with Pyright"},
@@ -0,0 +1,6 @@
+"""
+Analytics Package
+
+Vectorized computations over bulk data pulled from the database, kept free of
+I/O so that they can be tested and benchmarked on synthetic arrays.
+"""
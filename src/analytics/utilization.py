@@ -0,0 +1,173 @@
+"""
+Per-day time-in-status bucketing for fleet utilization reports.
+
+A status span is a [start, end) interval, in seconds from the start of day 0,
+during which one vehicle was in one status. Spans are summed per
+(group, day, status) without a Python loop over spans or days: the partial
+first and last day of every span are added directly, and the whole days in
+between through a difference array that is integrated with a cumulative sum.
+The cost is linear in the number of spans, however many days each one covers.
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+SECONDS_PER_DAY = 86400.0
+# Spans bucketed per vectorized pass
+CHUNK_SIZE = 1 << 20
+
+_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+# Signature, flags field and header extension length
+_COPY_HEADER_SIZE = len(_COPY_SIGNATURE) + 8
+# A field count of -1 marks the end of the data
+_COPY_TRAILER_SIZE = 2
+
+
+def read_binary_copy(data: bytes, columns: Sequence[Tuple[str, str]]) -> np.ndarray:
+    """
+    Reads the output of `COPY ... TO STDOUT (FORMAT binary)` into a structured
+    array without parsing it row by row.
+
+    Every column must be fixed-width and NOT NULL, so that each row has the
+    same layout: a 16-bit field count, then a 32-bit length before each value,
+    all big-endian.
+
+    Args:
+        data: The complete COPY output.
+        columns: (name, NumPy dtype) per column in query order, e.g.
+            ("id", ">i4") for integer or ("key", "V16") for uuid.
+
+    Raises:
+        ValueError: If the data is not binary COPY output or its rows do not
+            match the columns.
+    """
+    if not data.startswith(_COPY_SIGNATURE):
+        raise ValueError("Not PostgreSQL binary COPY output.")
+    extension = int.from_bytes(data[_COPY_HEADER_SIZE - 4 : _COPY_HEADER_SIZE], "big")
+    body = memoryview(data)[_COPY_HEADER_SIZE + extension : -_COPY_TRAILER_SIZE]
+
+    fields = [("field_count", ">i2")]
+    for name, dtype in columns:
+        fields += [(f"{name}_length", ">i4"), (name, dtype)]
+    row = np.dtype(fields)
+    if len(body) % row.itemsize:
+        raise ValueError(
+            "COPY rows do not match the expected columns; "
+            "a value may be NULL or of variable width."
+        )
+    return np.frombuffer(body, dtype=row)
+
+
+def daily_status_seconds(
+    groups: np.ndarray,
+    statuses: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    *,
+    n_groups: int,
+    n_statuses: int,
+    days: int,
+) -> np.ndarray:
+    """
+    Sums the seconds each group spent in each status on each day.
+
+    Args:
+        groups: Group number, in [0, n_groups), of each span.
+        statuses: Status number, in [0, n_statuses), of each span. Spans with
+            a negative status are ignored.
+        starts: Span start, in seconds from the start of day 0.
+        ends: Span end (exclusive), likewise. Spans are clipped to the days.
+        n_groups: Number of groups.
+        n_statuses: Number of statuses.
+        days: Number of days.
+
+    Returns:
+        A float64 array of shape (n_groups, days, n_statuses).
+    """
+    # One row of days + 1 slots per (group, status); the extra slot takes the
+    # difference array's closing entries for spans running to the last day.
+    shape = (n_groups, n_statuses, days + 1)
+    seconds = np.zeros(shape).ravel()
+    whole_days = np.zeros(shape).ravel()
+
+    # Spans are processed in blocks so that the temporaries stay small and
+    # warm in cache; the work within a block is fully vectorized.
+    for begin in range(0, len(starts), CHUNK_SIZE):
+        block = slice(begin, begin + CHUNK_SIZE)
+        _add_spans(
+            seconds,
+            whole_days,
+            groups[block],
+            statuses[block],
+            starts[block],
+            ends[block],
+            n_statuses=n_statuses,
+            days=days,
+        )
+
+    seconds = seconds.reshape(shape)
+    whole_days = whole_days.reshape(shape)
+    seconds += np.cumsum(whole_days, axis=2, out=whole_days)
+    return seconds[:, :, :days].transpose(0, 2, 1)
+
+
+def _add_spans(
+    seconds: np.ndarray,
+    whole_days: np.ndarray,
+    groups: np.ndarray,
+    statuses: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    *,
+    n_statuses: int,
+    days: int,
+) -> None:
+    horizon = days * SECONDS_PER_DAY
+    starts = np.clip(starts, 0.0, horizon, dtype=np.float64)
+    ends = np.clip(ends, 0.0, horizon, dtype=np.float64)
+    keep = (ends > starts) & (statuses >= 0)
+    if not keep.all():
+        groups, statuses = groups[keep], statuses[keep]
+        starts, ends = starts[keep], ends[keep]
+
+    # Day numbers are kept as floats until they become indices. True division
+    # keeps exact day boundaries exact, unlike multiplying by the reciprocal.
+    first_day = np.floor(starts / SECONDS_PER_DAY)
+    # The day holding the last instant before `end`
+    last_day = np.ceil(ends / SECONDS_PER_DAY) - 1.0
+    next_midnight = first_day + 1.0
+    spanning = last_day > next_midnight
+
+    # Up to the first midnight, and from the last one (nothing if the span
+    # ends on its first day)
+    head = np.minimum(ends, next_midnight * SECONDS_PER_DAY) - starts
+    tail = ends - np.maximum(last_day, next_midnight) * SECONDS_PER_DAY
+    np.maximum(tail, 0.0, out=tail)
+
+    row = (groups.astype(np.int64) * n_statuses + statuses) * (days + 1)
+    first = first_day.astype(np.int64) + row
+    last = last_day.astype(np.int64) + row
+    np.add.at(seconds, first, head)
+    np.add.at(seconds, last, tail)
+    # Whole days in between, as +1 day from the day after the first and -1
+    # day from the last, integrated by the caller
+    np.add.at(whole_days, first[spanning] + 1, SECONDS_PER_DAY)
+    np.subtract.at(whole_days, last[spanning], SECONDS_PER_DAY)
+
+
+def status_percentages(seconds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converts per-status seconds (statuses on the last axis) into percentages
+    of the time any status was recorded.
+
+    Returns:
+        The percentages, same shape as `seconds` and 0 where nothing was
+        recorded, and the recorded seconds (the last axis summed).
+    """
+    observed = seconds.sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentages = np.where(
+            observed[..., None] > 0, 100.0 * seconds / observed[..., None], 0.0
+        )
+    return percentages, observed
@@ -1,6 +1,10 @@
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
 
 from src.core.config import settings
+from src.core.db import replica_set
+from src.core.metrics import CONTENT_TYPE, registry
+from src.repositories.vendor import vendor_cache
 
 router = APIRouter()
 
@@ -23,4 +27,12 @@ def health_check():
         "status": "healthy",
         "service": settings.PROJECT_NAME,
         "version": settings.VERSION,
+        "caches": {"vendor": vendor_cache.stats()},
+        "replicas": replica_set.status(),
     }
+
+
+@router.get("/metrics", tags=["Health Check"], response_class=PlainTextResponse)
+def metrics():
+    """Prometheus metrics, aggregated across worker processes when configured."""
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
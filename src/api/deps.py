@@ -8,11 +8,23 @@ into API endpoints. It follows a simple, maintainable pattern that's easy to und
 from typing import Annotated
 
 from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from src.core.db import get_db_session
+from src.core.db import (
+    get_db_session,
+    get_primary_read_session,
+    get_read_session,
+    get_session_factory,
+)
+from src.repositories.fleet import fleet_summary_repo
+from src.repositories.status_history import status_history_repo
 from src.repositories.vehicle import vehicle_repo
 from src.repositories.vendor import vendor_repo
+from src.services.analytics_service import AnalyticsService
+from src.services.change_feed_service import ChangeBroadcaster, change_broadcaster
+from src.services.fleet_service import FleetService
+from src.services.status_history_service import StatusHistoryService
+from src.services.vehicle_import_service import VehicleImportService
 from src.services.vehicle_service import VehicleService
 from src.services.vendor_service import VendorService
 
@@ -29,10 +41,49 @@ def get_vehicle_service() -> VehicleService:
     return VehicleService(vehicle_repo=vehicle_repo, vendor_repo=vendor_repo)
 
 
+def get_vehicle_import_service() -> VehicleImportService:
+    """Dependency to provide the VehicleImportService instance."""
+    return VehicleImportService(vehicle_repo)
+
+
+def get_fleet_service() -> FleetService:
+    """Dependency to provide the FleetService instance."""
+    return FleetService(fleet_summary_repo)
+
+
+def get_status_history_service() -> StatusHistoryService:
+    """Dependency to provide the StatusHistoryService instance."""
+    return StatusHistoryService(status_history_repo)
+
+
+def get_analytics_service() -> AnalyticsService:
+    """Dependency to provide the AnalyticsService instance."""
+    return AnalyticsService(status_history_repo)
+
+
+def get_change_broadcaster() -> ChangeBroadcaster:
+    """Dependency to provide this worker's ChangeBroadcaster."""
+    return change_broadcaster
+
+
 # Type hint for dependencies for cleaner endpoint signatures
 DBSession = Annotated[AsyncSession, Depends(get_db_session)]
+ReadSession = Annotated[AsyncSession, Depends(get_read_session)]
+PrimaryReadSession = Annotated[AsyncSession, Depends(get_primary_read_session)]
+SessionFactory = Annotated[
+    async_sessionmaker[AsyncSession], Depends(get_session_factory)
+]
 VendorServiceDep = Annotated[VendorService, Depends(get_vendor_service)]
 VehicleServiceDep = Annotated[VehicleService, Depends(get_vehicle_service)]
+VehicleImportServiceDep = Annotated[
+    VehicleImportService, Depends(get_vehicle_import_service)
+]
+FleetServiceDep = Annotated[FleetService, Depends(get_fleet_service)]
+StatusHistoryServiceDep = Annotated[
+    StatusHistoryService, Depends(get_status_history_service)
+]
+AnalyticsServiceDep = Annotated[AnalyticsService, Depends(get_analytics_service)]
+ChangeBroadcasterDep = Annotated[ChangeBroadcaster, Depends(get_change_broadcaster)]
 
 # Add more service dependencies here as you create new services
 # Example:
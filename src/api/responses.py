@@ -0,0 +1,55 @@
+from typing import Any, List, Mapping, Optional, Sequence, Type
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+from sqlmodel import SQLModel
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered by pydantic-core's serializer instead of `json.dumps`.
+    Used as the default response class of the v1 API.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+class ORMListSerializer:
+    """
+    Serializes lists of table-model rows straight to a JSON response body.
+
+    FastAPI's `response_model` path validates every row into the read schema,
+    dumps that to Python objects and encodes them with `json.dumps`. Rows loaded
+    from the database were validated on write, so this dumps the ORM instances
+    with a TypeAdapter built once at import time, keeping only the read schema's
+    fields. Endpoints using it keep `response_model` for the OpenAPI schema;
+    FastAPI skips its own serialization when a Response is returned.
+    """
+
+    def __init__(self, model: Type[SQLModel], schema: Type[BaseModel]):
+        missing = set(schema.model_fields) - set(model.model_fields)
+        if missing:
+            raise TypeError(
+                f"{model.__name__} has no fields {sorted(missing)} of {schema.__name__}"
+            )
+        self._adapter = TypeAdapter(List[model])
+        self._include = {"__all__": set(schema.model_fields)}
+
+    def dump_json(self, rows: Sequence[SQLModel]) -> bytes:
+        return self._adapter.dump_json(list(rows), include=self._include)
+
+    def response(
+        self,
+        rows: Sequence[SQLModel],
+        *,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Response:
+        return Response(
+            self.dump_json(rows),
+            status_code=status_code,
+            headers=headers,
+            media_type="application/json",
+        )
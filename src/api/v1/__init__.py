@@ -1,12 +1,20 @@
 from fastapi import APIRouter
 from fastapi.responses import RedirectResponse
 
+from src.api.responses import PydanticJSONResponse
+
+from .analytics import router as analytics_router
+from .changes import router as changes_router
+from .fleet import router as fleet_router
 from .vehicle import router as vehicle_router
 from .vendor import router as vendor_router
 
-api_router = APIRouter()
+api_router = APIRouter(default_response_class=PydanticJSONResponse)
 api_router.include_router(vendor_router, tags=["Vendors"])
 api_router.include_router(vehicle_router, tags=["Vehicles"])
+api_router.include_router(fleet_router, tags=["Fleet"])
+api_router.include_router(analytics_router, tags=["Analytics"])
+api_router.include_router(changes_router, tags=["Changes"])
 
 
 # Add redirects for API documentation
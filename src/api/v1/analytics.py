@@ -0,0 +1,53 @@
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from src.api.deps import AnalyticsServiceDep, ReadSession
+from src.schemas.analytics import Utilization, UtilizationGrouping
+from src.services.analytics_service import InvalidUtilizationQuery
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@router.get("/utilization", response_model=List[Utilization])
+async def get_utilization(
+    session: ReadSession,
+    service: AnalyticsServiceDep,
+    start: date = Query(..., description="First day of the report (UTC)."),
+    days: int = Query(30, ge=1, le=92, description="Number of days to report."),
+    group_by: UtilizationGrouping = Query(UtilizationGrouping.FLEET),
+    vehicle_id: Optional[UUID] = Query(None),
+    vendor_id: Optional[UUID] = Query(None),
+) -> List[Utilization]:
+    """
+    Percentage of each day that vehicles spent in each status, from the status
+    history, for the whole fleet, per (current) vendor or per vehicle.
+
+    Per-vehicle reports must be narrowed with `vehicle_id` or `vendor_id`.
+    Days after the current time are not reported.
+
+    Args:
+        session: The database session dependency.
+        service: The analytics service dependency.
+        start: First day of the report.
+        days: Number of days to report.
+        group_by: Report for the fleet, per vendor or per vehicle.
+        vehicle_id: Only this vehicle.
+        vendor_id: Only this vendor's vehicles.
+
+    Returns:
+        One report per group with any recorded status in the range.
+    """
+    try:
+        return await service.get_utilization(
+            session,
+            start=start,
+            days=days,
+            grouping=group_by,
+            vehicle_id=vehicle_id,
+            vendor_id=vendor_id,
+        )
+    except InvalidUtilizationQuery as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
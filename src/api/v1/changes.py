@@ -0,0 +1,77 @@
+from typing import AsyncIterator, List
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from src.api.deps import ChangeBroadcasterDep
+from src.core.config import settings
+from src.schemas.change import ChangeEntity
+from src.services.change_feed_service import ChangeSubscription, TooManySubscribers
+from src.utils.streaming import SSE_KEEPALIVE
+
+router = APIRouter(prefix="/changes", tags=["Changes"])
+
+
+async def _events(subscription: ChangeSubscription) -> AsyncIterator[bytes]:
+    # Keep-alives also surface disconnected clients, whose writes then fail
+    yield SSE_KEEPALIVE
+    while True:
+        events = await subscription.next_events(
+            settings.CHANGE_STREAM_KEEPALIVE_INTERVAL
+        )
+        yield b"".join(events) if events else SSE_KEEPALIVE
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_changes(
+    broadcaster: ChangeBroadcasterDep,
+    entity: List[ChangeEntity] = Query(
+        [], description="Only changes to these entity types. May be repeated."
+    ),
+    vendor_id: List[UUID] = Query(
+        [],
+        description="Only these vendors and their vehicles. May be repeated.",
+    ),
+) -> StreamingResponse:
+    """
+    Server-Sent Events stream of committed vendor and vehicle changes.
+
+    Each `change` event carries an EntityChange as JSON. Changes to a row that
+    the client has not read yet are merged into the latest one. A `resync`
+    event means changes may have been missed (the client fell too far behind,
+    or the worker lost its database connection) and the client should refetch
+    what it displays.
+
+    Args:
+        broadcaster: This worker's change broadcaster.
+        entity: Entity types to receive; all when omitted.
+        vendor_id: Vendors to receive changes for; all when omitted.
+
+    Returns:
+        A `text/event-stream` response that stays open until the client leaves.
+    """
+    try:
+        subscription = broadcaster.subscribe(entities=entity, vendor_ids=vendor_id)
+    except TooManySubscribers as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        )
+
+    async def events() -> AsyncIterator[bytes]:
+        try:
+            async for event in _events(subscription):
+                yield event
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Stop proxies (nginx in particular) from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
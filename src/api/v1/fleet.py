@@ -0,0 +1,58 @@
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Query, Response
+
+from src.api.deps import FleetServiceDep, ReadSession
+from src.api.responses import ORMListSerializer
+from src.models.fleet import FleetSummary
+from src.schemas.fleet import FleetSummaryRead
+from src.utils.pagination import NEXT_CURSOR_HEADER
+
+router = APIRouter(prefix="/fleet", tags=["Fleet"])
+
+
+fleet_summary_serializer = ORMListSerializer(FleetSummary, FleetSummaryRead)
+
+
+@router.get("/summary", response_model=List[FleetSummaryRead])
+async def get_fleet_summary(
+    session: ReadSession,
+    service: FleetServiceDep,
+    vendor_id: List[UUID] = Query(
+        [], description="Only summarize these vendors. May be repeated."
+    ),
+    limit: int = Query(
+        100, ge=1, le=1000, description="Maximum number of vendors to return."
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description=(
+            f"Opaque keyset cursor taken from the {NEXT_CURSOR_HEADER} header of "
+            "the previous page."
+        ),
+    ),
+) -> Response:
+    """
+    Per-vendor vehicle counts by status and payload capacity, ordered by
+    company name.
+
+    The figures are precomputed and refreshed every
+    FLEET_SUMMARY_REFRESH_INTERVAL seconds; `refreshed_at` tells how current
+    they are.
+
+    Args:
+        session: The database session dependency.
+        service: The fleet service dependency.
+        vendor_id: Vendors to restrict the summary to.
+        limit: Maximum number of vendors to return.
+        cursor: Keyset cursor from a previous page.
+
+    Returns:
+        A JSON response with one summary per active vendor.
+    """
+    summaries, cursor_out = await service.get_summary(
+        session, vendor_ids=vendor_id, limit=limit, cursor=cursor
+    )
+    headers = {NEXT_CURSOR_HEADER: cursor_out} if cursor_out else None
+    return fleet_summary_serializer.response(summaries, headers=headers)
@@ -1,19 +1,92 @@
-from typing import List
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 
-from src.api.deps import DBSession, VehicleServiceDep
+from src.api.deps import (
+    DBSession,
+    PrimaryReadSession,
+    ReadSession,
+    SessionFactory,
+    StatusHistoryServiceDep,
+    VehicleImportServiceDep,
+    VehicleServiceDep,
+)
+from src.api.responses import ORMListSerializer
+from src.core.config import settings
 from src.models.vehicle import Vehicle
-from src.schemas.vehicle import VehicleCreate, VehicleRead, VehicleUpdate
+from src.schemas.vehicle import (
+    TimeInStatus,
+    VehicleClaim,
+    VehicleCreate,
+    VehicleImportReport,
+    VehicleRead,
+    VehicleStatus,
+    VehicleStatusBatchReport,
+    VehicleUpdate,
+)
+from src.services.status_history_service import InvalidTimeRange
+from src.services.vehicle_import_service import (
+    ImportLineTooLong,
+    InvalidImportFile,
+    UnsupportedImportFormat,
+)
 from src.services.vehicle_service import (
     RegistrationAlreadyExists,
     VehicleNotFound,
     VendorNotFound,
 )
+from src.utils.etags import (
+    ETAG_HEADER,
+    collection_etag,
+    expected_updated_at,
+    none_match,
+    not_modified,
+    resource_etag,
+)
+from src.utils.pagination import NEXT_CURSOR_HEADER, SYNC_TOKEN_HEADER, next_cursor
+from src.utils.streaming import ExportFormat, export_response
 
 router = APIRouter(prefix="/vehicles", tags=["Vehicles"])
 
+CURSOR_DESCRIPTION = (
+    f"Opaque keyset cursor taken from the {NEXT_CURSOR_HEADER} header of the "
+    "previous page. When given, `skip` is ignored."
+)
+UPDATED_SINCE_DESCRIPTION = (
+    "Sync mode: only vehicles updated after this time, soft-deleted ones "
+    "included, oldest change first."
+)
+SYNC_TOKEN_DESCRIPTION = (
+    f"Sync mode: resume from the {SYNC_TOKEN_HEADER} header of a previous sync. "
+    "Takes precedence over `updated_since`."
+)
+
+
+vehicle_list_serializer = ORMListSerializer(Vehicle, VehicleRead)
+
+
+def _vehicle_page(
+    vehicles: List[Vehicle], cursor: Optional[str], etag: Optional[str] = None
+) -> Response:
+    headers = {NEXT_CURSOR_HEADER: cursor} if cursor else {}
+    if etag:
+        headers[ETAG_HEADER] = etag
+    return vehicle_list_serializer.response(vehicles, headers=headers or None)
+
 
 @router.post("/", response_model=VehicleRead, status_code=status.HTTP_201_CREATED)
 async def create_vehicle(
@@ -29,52 +102,306 @@ async def create_vehicle(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.post(
+    "/import",
+    response_model=VehicleImportReport,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "text/csv": {"schema": {"type": "string"}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_vehicles(
+    request: Request,
+    session: DBSession,
+    service: VehicleImportServiceDep,
+) -> VehicleImportReport:
+    """
+    Bulk import vehicles from a CSV (with header row) or NDJSON upload.
+    Valid rows are imported; the response lists every rejected row and why.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    try:
+        return await service.import_vehicles(
+            session, stream=request.stream(), content_type=content_type.lower()
+        )
+    except UnsupportedImportFormat as e:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e)
+        )
+    except InvalidImportFile as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ImportLineTooLong as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e)
+        )
+
+
+@router.post("/status", response_model=VehicleStatusBatchReport)
+async def update_vehicle_statuses(
+    session: DBSession,
+    service: VehicleServiceDep,
+    changes: List[Any] = Body(
+        ..., min_length=1, max_length=settings.VEHICLE_STATUS_BATCH_MAX_ITEMS
+    ),
+) -> VehicleStatusBatchReport:
+    """
+    Apply a batch of status changes, e.g.
+    `[{"vehicle_id": "...", "status": "In Transit"},
+    {"registration_number": "KA-01-AB-1234", "status": "Idle"}]`.
+
+    Each item is validated and applied on its own; the response reports the
+    outcome of every item in request order.
+    """
+    return await service.update_vehicle_statuses(session, changes)
+
+
+@router.post("/claim", response_model=List[VehicleRead])
+async def claim_vehicles(
+    claim: VehicleClaim,
+    session: DBSession,
+    service: VehicleServiceDep,
+) -> Response:
+    """
+    Atomically claim up to `count` idle vehicles matching the filters,
+    smallest sufficient capacity first, and mark them In Transit.
+
+    Concurrent claims never return the same vehicle. Fewer vehicles (possibly
+    none) are returned when not enough are available.
+    """
+    vehicles = await service.claim_vehicles(session, claim)
+    return vehicle_list_serializer.response(vehicles)
+
+
 @router.get("/", response_model=List[VehicleRead])
 async def list_vehicles(
-    session: DBSession,
+    session: ReadSession,
+    primary_session: PrimaryReadSession,
     service: VehicleServiceDep,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-) -> List[Vehicle]:
-    return await service.get_all_vehicles(session, skip=skip, limit=limit)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    updated_since: Optional[datetime] = Query(
+        None, description=UPDATED_SINCE_DESCRIPTION
+    ),
+    sync_token: Optional[str] = Query(None, description=SYNC_TOKEN_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    """
+    List active vehicles with offset or keyset pagination, or, in sync mode
+    (`updated_since` or `sync_token`), the vehicles changed since the last
+    sync.
+
+    A sync response carries the token for the next sync in the
+    X-Sync-Token header; while full pages come back, more changes are waiting.
+    Sync reads always go to the primary.
+
+    A page carries the vehicle table's version as its ETag. The version is
+    read before the page, so an ETag is never newer than the page it comes
+    with; when If-None-Match still matches, a 304 is sent without reading
+    the page at all.
+    """
+    if updated_since is not None or sync_token:
+        vehicles, token = await service.sync_vehicles(
+            primary_session,
+            updated_since=updated_since,
+            sync_token=sync_token,
+            limit=limit,
+        )
+        return vehicle_list_serializer.response(
+            vehicles, headers={SYNC_TOKEN_HEADER: token}
+        )
+    etag = collection_etag("vehicle", await service.get_vehicles_version(session))
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    vehicles = await service.get_all_vehicles(
+        session, skip=skip, limit=limit, cursor=cursor
+    )
+    return _vehicle_page(
+        vehicles, next_cursor(vehicles, limit, "created_at", "id"), etag
+    )
 
 
 @router.get("/search/", response_model=List[VehicleRead])
 async def search_vehicles(
-    session: DBSession,
+    session: ReadSession,
     service: VehicleServiceDep,
     q: str = Query(
         "", description="Search term for make, model, status, or registration."
     ),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-) -> List[Vehicle]:
-    return await service.search_vehicles(session, term=q, skip=skip, limit=limit)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+) -> Response:
+    vehicles, cursor_out = await service.search_vehicles(
+        session, term=q, skip=skip, limit=limit, cursor=cursor
+    )
+    return _vehicle_page(vehicles, cursor_out)
+
+
+class CapacitySort(str, Enum):
+    ASCENDING = "capacity"
+    DESCENDING = "-capacity"
+
+
+@router.get("/by-capacity", response_model=List[VehicleRead])
+async def find_vehicles_by_capacity(
+    session: ReadSession,
+    service: VehicleServiceDep,
+    vehicle_status: List[VehicleStatus] = Query(
+        [], alias="status", description="Only these statuses. May be repeated."
+    ),
+    min_capacity: Optional[float] = Query(None, ge=0.0),
+    max_capacity: Optional[float] = Query(None, ge=0.0),
+    vendor_id: Optional[UUID] = Query(None),
+    make: Optional[str] = Query(None, description="Exact make, e.g. `Tata`."),
+    is_active: bool = Query(True),
+    sort: CapacitySort = Query(CapacitySort.ASCENDING),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+) -> Response:
+    """
+    Find vehicles by status, capacity range, vendor and make, sorted by
+    capacity, e.g. idle vehicles that can carry at least 20 tonnes.
+    """
+    vehicles, cursor_out = await service.find_vehicles_by_capacity(
+        session,
+        statuses=vehicle_status,
+        min_capacity=min_capacity,
+        max_capacity=max_capacity,
+        vendor_id=vendor_id,
+        make=make,
+        is_active=is_active,
+        descending=sort == CapacitySort.DESCENDING,
+        limit=limit,
+        cursor=cursor,
+    )
+    return _vehicle_page(vehicles, cursor_out)
+
+
+class TimeInStatusGrouping(str, Enum):
+    VEHICLE = "vehicle"
+    VENDOR = "vendor"
+
+
+@router.get("/time-in-status", response_model=List[TimeInStatus])
+async def get_time_in_status(
+    session: ReadSession,
+    service: StatusHistoryServiceDep,
+    start: datetime = Query(..., description="Start of the range (inclusive)."),
+    end: Optional[datetime] = Query(
+        None, description="End of the range (exclusive). Defaults to now."
+    ),
+    vehicle_id: Optional[UUID] = Query(None),
+    vendor_id: Optional[UUID] = Query(None),
+    group_by: TimeInStatusGrouping = Query(TimeInStatusGrouping.VEHICLE),
+) -> List[TimeInStatus]:
+    """
+    How long vehicles spent in each status over a time range, from the
+    status history, per vehicle or summed per (current) vendor. Naive
+    timestamps are taken as UTC.
+    """
+    try:
+        return await service.get_time_in_status(
+            session,
+            start=start,
+            end=end,
+            vehicle_id=vehicle_id,
+            vendor_id=vendor_id,
+            per_vendor=group_by == TimeInStatusGrouping.VENDOR,
+        )
+    except InvalidTimeRange as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+class VehicleCountResponse(BaseModel):
+    active_vehicles_count: int
+    # Only reported for the whole fleet, not per vendor
+    by_status: Optional[Dict[VehicleStatus, int]] = None
+
+
+@router.get("/count", response_model=VehicleCountResponse)
+async def get_active_vehicles_count(
+    session: ReadSession,
+    service: VehicleServiceDep,
+    vendor_id: Optional[UUID] = Query(
+        None, description="Count only this vendor's vehicles."
+    ),
+) -> VehicleCountResponse:
+    try:
+        total, by_status = await service.get_active_vehicle_counts(
+            session, vendor_id=vendor_id
+        )
+    except VendorNotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return VehicleCountResponse(active_vehicles_count=total, by_status=by_status)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+async def export_vehicles(
+    session_factory: SessionFactory,
+    service: VehicleServiceDep,
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    vendor_id: Optional[UUID] = Query(None, description="Only this vendor's vehicles."),
+    q: Optional[str] = Query(
+        None, description="Search term for make, model, status, or registration."
+    ),
+) -> StreamingResponse:
+    """Stream every matching active vehicle as NDJSON or CSV."""
+
+    async def rows():
+        # The response outlives the request's dependencies, so it owns its session.
+        async with session_factory() as session:
+            async for row in service.stream_vehicles(
+                session, vendor_id=vendor_id, term=q
+            ):
+                yield row
+
+    return export_response(
+        rows(), format, columns=list(VehicleRead.model_fields), filename="vehicles"
+    )
 
 
 @router.get("/{vehicle_id}", response_model=VehicleRead)
 async def get_vehicle_by_id(
     vehicle_id: UUID,
-    session: DBSession,
+    session: ReadSession,
     service: VehicleServiceDep,
-) -> Vehicle:
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+) -> Any:
     try:
-        return await service.get_vehicle_by_id(session, vehicle_id=vehicle_id)
+        vehicle = await service.get_vehicle_by_id(session, vehicle_id=vehicle_id)
     except VehicleNotFound as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    etag = resource_etag(vehicle_id, vehicle.updated_at)
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    response.headers[ETAG_HEADER] = etag
+    return vehicle
 
 
 @router.get("/vendor/{vendor_id}", response_model=List[VehicleRead])
 async def get_vehicles_by_vendor(
     vendor_id: UUID,
-    session: DBSession,
+    session: ReadSession,
     service: VehicleServiceDep,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-) -> List[Vehicle]:
-    return await service.get_vehicles_by_vendor(
-        session, vendor_id=vendor_id, skip=skip, limit=limit
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+) -> Response:
+    vehicles = await service.get_vehicles_by_vendor(
+        session, vendor_id=vendor_id, skip=skip, limit=limit, cursor=cursor
     )
+    return _vehicle_page(vehicles, next_cursor(vehicles, limit, "created_at", "id"))
 
 
 @router.put("/{vehicle_id}", response_model=VehicleRead)
@@ -83,15 +410,22 @@ async def update_vehicle(
     vehicle_in: VehicleUpdate,
     session: DBSession,
     service: VehicleServiceDep,
+    response: Response,
+    if_match: Optional[str] = Header(None),
 ) -> Vehicle:
     try:
-        return await service.update_vehicle(
-            session, vehicle_id=vehicle_id, vehicle_data=vehicle_in
+        vehicle = await service.update_vehicle(
+            session,
+            vehicle_id=vehicle_id,
+            vehicle_data=vehicle_in,
+            expected_updated_at=expected_updated_at(if_match, vehicle_id),
         )
     except (VehicleNotFound, VendorNotFound) as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except RegistrationAlreadyExists as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    response.headers[ETAG_HEADER] = resource_etag(vehicle_id, vehicle.updated_at)
+    return vehicle
 
 
 @router.delete("/{vehicle_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -100,10 +434,14 @@ async def delete_vehicle(
     session: DBSession,
     service: VehicleServiceDep,
     permanent: bool = Query(False),
+    if_match: Optional[str] = Header(None),
 ) -> None:
     try:
         await service.delete_vehicle(
-            session, vehicle_id=vehicle_id, permanent=permanent
+            session,
+            vehicle_id=vehicle_id,
+            permanent=permanent,
+            expected_updated_at=expected_updated_at(if_match, vehicle_id),
         )
     except VehicleNotFound as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -1,16 +1,38 @@
-from typing import List
+from datetime import datetime
+from typing import Any, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Query, status
+from fastapi import APIRouter, Header, Query, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from src.api.deps import DBSession, VendorServiceDep
+from src.api.deps import (
+    DBSession,
+    PrimaryReadSession,
+    ReadSession,
+    SessionFactory,
+    VendorServiceDep,
+)
+from src.api.responses import ORMListSerializer
 from src.models.vendor import Vendor
 from src.schemas.vendor import VendorCreate, VendorRead, VendorUpdate
+from src.utils.etags import (
+    ETAG_HEADER,
+    collection_etag,
+    expected_updated_at,
+    none_match,
+    not_modified,
+    resource_etag,
+)
+from src.utils.pagination import NEXT_CURSOR_HEADER, SYNC_TOKEN_HEADER, next_cursor
+from src.utils.streaming import ExportFormat, export_response
 
 router = APIRouter(prefix="/vendors", tags=["Vendors"])
 
 
+vendor_list_serializer = ORMListSerializer(Vendor, VendorRead)
+
+
 class VendorCountResponse(BaseModel):
     active_vendors_count: int
 
@@ -37,38 +59,96 @@ async def create_vendor(
 
 @router.get("/", response_model=List[VendorRead])
 async def list_vendors(
-    session: DBSession,
+    session: ReadSession,
+    primary_session: PrimaryReadSession,
     service: VendorServiceDep,
     skip: int = Query(0, ge=0, description="Number of records to skip for pagination."),
     limit: int = Query(
         100, ge=1, le=1000, description="Maximum number of records to return."
     ),
-) -> List[Vendor]:
+    cursor: Optional[str] = Query(
+        None,
+        description=(
+            f"Opaque keyset cursor taken from the {NEXT_CURSOR_HEADER} header of "
+            "the previous page. When given, `skip` is ignored."
+        ),
+    ),
+    updated_since: Optional[datetime] = Query(
+        None,
+        description=(
+            "Sync mode: only vendors updated after this time, inactive ones "
+            "included, oldest change first."
+        ),
+    ),
+    sync_token: Optional[str] = Query(
+        None,
+        description=(
+            f"Sync mode: resume from the {SYNC_TOKEN_HEADER} header of a previous "
+            "sync. Takes precedence over `updated_since`."
+        ),
+    ),
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
     """
-    Retrieve all vendors with pagination.
+    Retrieve all vendors with offset or keyset pagination, or, in sync mode,
+    the vendors changed since the last sync.
+
+    When a full page is returned, the cursor for the next page is sent in the
+    X-Next-Cursor response header. A sync response instead sends the token for
+    the next sync in the X-Sync-Token header; while full pages come back, more
+    changes are waiting. Sync reads always go to the primary.
+
+    A page carries the vendor table's version as its ETag, read before the
+    page so that it is never newer than the page. When If-None-Match still
+    matches, a 304 is sent without reading the page.
 
     Args:
         session: The database session dependency.
+        primary_session: A read session on the primary, for sync mode.
         service: The vendor service dependency.
         skip: Number of records to skip.
         limit: Maximum number of records to return.
+        cursor: Keyset cursor from a previous page.
+        updated_since: Start a sync from this time.
+        sync_token: Continue a previous sync.
+        if_none_match: ETag of the client's copy of the page.
 
     Returns:
-        A list of vendor objects.
+        A JSON response with the list of vendors, or a 304 response.
     """
-    return await service.get_all_vendors(session, skip=skip, limit=limit)
+    if updated_since is not None or sync_token:
+        vendors, token = await service.sync_vendors(
+            primary_session,
+            updated_since=updated_since,
+            sync_token=sync_token,
+            limit=limit,
+        )
+        return vendor_list_serializer.response(
+            vendors, headers={SYNC_TOKEN_HEADER: token}
+        )
+    etag = collection_etag("vendor", await service.get_vendors_version(session))
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    vendors = await service.get_all_vendors(
+        session, skip=skip, limit=limit, cursor=cursor
+    )
+    headers = {ETAG_HEADER: etag}
+    cursor_out = next_cursor(vendors, limit, "created_at", "id")
+    if cursor_out:
+        headers[NEXT_CURSOR_HEADER] = cursor_out
+    return vendor_list_serializer.response(vendors, headers=headers)
 
 
 @router.get("/search/", response_model=List[VendorRead])
 async def search_vendors(
-    session: DBSession,
+    session: ReadSession,
     service: VendorServiceDep,
     q: str = Query("", description="Search term for company, contact, or email."),
     skip: int = Query(0, ge=0, description="Number of records to skip for pagination."),
     limit: int = Query(
         100, ge=1, le=1000, description="Maximum number of records to return."
     ),
-) -> List[Vendor]:
+) -> Response:
     """
     Search for vendors by a search term across multiple fields.
 
@@ -80,14 +160,15 @@ async def search_vendors(
         limit: Maximum number of records to return.
 
     Returns:
-        A list of vendors matching the search term.
+        A JSON response with the vendors matching the search term.
     """
-    return await service.search_vendors(session, term=q, skip=skip, limit=limit)
+    vendors = await service.search_vendors(session, term=q, skip=skip, limit=limit)
+    return vendor_list_serializer.response(vendors)
 
 
 @router.get("/count", response_model=VendorCountResponse)
 async def get_active_vendors_count(
-    session: DBSession,
+    session: ReadSession,
     service: VendorServiceDep,
 ) -> VendorCountResponse:
     """
@@ -104,12 +185,54 @@ async def get_active_vendors_count(
     return VendorCountResponse(active_vendors_count=count)
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+async def export_vendors(
+    session_factory: SessionFactory,
+    service: VendorServiceDep,
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="Output format."),
+    q: Optional[str] = Query(
+        None, description="Search term for company, contact, or email."
+    ),
+) -> StreamingResponse:
+    """
+    Stream every matching vendor as NDJSON or CSV.
+
+    Rows are read through a server-side cursor and encoded as they arrive, so
+    memory use stays flat regardless of how many vendors there are.
+
+    Args:
+        session_factory: Factory for the session owned by the streaming response.
+        service: The vendor service dependency.
+        format: The output format.
+        q: Optional search term.
+
+    Returns:
+        A streaming NDJSON or CSV response.
+    """
+
+    async def rows():
+        # The response outlives the request's dependencies, so it owns its session.
+        async with session_factory() as session:
+            async for row in service.stream_vendors(session, term=q):
+                yield row
+
+    return export_response(
+        rows(), format, columns=list(VendorRead.model_fields), filename="vendors"
+    )
+
+
 @router.get("/{vendor_id}", response_model=VendorRead)
 async def get_vendor_by_id(
     vendor_id: UUID,
-    session: DBSession,
+    session: ReadSession,
     service: VendorServiceDep,
-) -> Vendor:
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+) -> Any:
     """
     Retrieve a specific vendor by their unique ID.
 
@@ -117,17 +240,24 @@ async def get_vendor_by_id(
         vendor_id: The UUID of the vendor to retrieve.
         session: The database session dependency.
         service: The vendor service dependency.
+        response: The response, to set the ETag on.
+        if_none_match: ETag of the client's copy of the vendor.
 
     Returns:
-        The vendor object.
+        The vendor object, or a 304 response if the client's copy is current.
     """
-    return await service.get_vendor_by_id(session, vendor_id=vendor_id)
+    vendor = await service.get_vendor_by_id(session, vendor_id=vendor_id)
+    etag = resource_etag(vendor_id, vendor.updated_at)
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    response.headers[ETAG_HEADER] = etag
+    return vendor
 
 
 @router.get("/email/{email}", response_model=VendorRead)
 async def get_vendor_by_email(
     email: str,
-    session: DBSession,
+    session: ReadSession,
     service: VendorServiceDep,
 ) -> Vendor:
     """
@@ -147,7 +277,7 @@ async def get_vendor_by_email(
 @router.get("/phone/{phone_number}", response_model=VendorRead)
 async def get_vendor_by_phone(
     phone_number: str,
-    session: DBSession,
+    session: ReadSession,
     service: VendorServiceDep,
 ) -> Vendor:
     """
@@ -170,6 +300,8 @@ async def update_vendor(
     vendor_in: VendorUpdate,
     session: DBSession,
     service: VendorServiceDep,
+    response: Response,
+    if_match: Optional[str] = Header(None),
 ) -> Vendor:
     """
 
@@ -180,13 +312,20 @@ async def update_vendor(
         vendor_in: The new data for the vendor.
         session: The database session dependency.
         service: The vendor service dependency.
+        response: The response, to set the new ETag on.
+        if_match: Only update the vendor if it still has one of these ETags.
 
     Returns:
         The updated vendor object.
     """
-    return await service.update_vendor(
-        session, vendor_id=vendor_id, vendor_data=vendor_in
+    vendor = await service.update_vendor(
+        session,
+        vendor_id=vendor_id,
+        vendor_data=vendor_in,
+        expected_updated_at=expected_updated_at(if_match, vendor_id),
     )
+    response.headers[ETAG_HEADER] = resource_etag(vendor_id, vendor.updated_at)
+    return vendor
 
 
 @router.delete("/{vendor_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -195,6 +334,7 @@ async def delete_vendor(
     session: DBSession,
     service: VendorServiceDep,
     permanent: bool = Query(False, description="Set to true for permanent deletion."),
+    if_match: Optional[str] = Header(None),
 ) -> None:
     """
     Delete a vendor. By default, this is a soft delete (sets is_active=False).
@@ -204,5 +344,11 @@ async def delete_vendor(
         session: The database session dependency.
         service: The vendor service dependency.
         permanent: If true, the vendor is permanently deleted from the database.
+        if_match: Only delete the vendor if it still has one of these ETags.
     """
-    await service.delete_vendor(session, vendor_id=vendor_id, permanent=permanent)
+    await service.delete_vendor(
+        session,
+        vendor_id=vendor_id,
+        permanent=permanent,
+        expected_updated_at=expected_updated_at(if_match, vendor_id),
+    )
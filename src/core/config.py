@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -16,21 +16,61 @@ class Settings(BaseSettings):
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_RECYCLE: int = 3600
 
+    # Optional read replicas (comma-separated URLs); GET endpoints read from them
+    DATABASE_REPLICA_URLS: list[str] | str = []
+    REPLICA_MAX_LAG_SECONDS: float = 2.0
+    REPLICA_HEALTH_CHECK_INTERVAL: float = 5.0
+    REPLICA_CONNECT_TIMEOUT: float = 2.0
+    # Reads from a client that wrote within this window go to the primary
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
     DEBUG: bool = False
 
+    VEHICLE_IMPORT_CHUNK_SIZE: int = 5000
+    # Longest CSV or NDJSON line an import buffers before rejecting the upload
+    VEHICLE_IMPORT_MAX_LINE_BYTES: int = 64 * 1024
+    # Batched status updates: changes accepted per request, and per UPDATE
+    VEHICLE_STATUS_BATCH_MAX_ITEMS: int = 10000
+    VEHICLE_STATUS_BATCH_CHUNK_SIZE: int = 1000
+    EXPORT_FETCH_SIZE: int = 1000
+
+    # Per-worker vendor lookup cache; a TTL of 0 disables it
+    VENDOR_CACHE_SIZE: int = 10000
+    VENDOR_CACHE_TTL: float = 300.0
+
+    # How often each worker checks the entity counters for drift; 0 disables
+    COUNTER_RECONCILE_INTERVAL: float = 3600.0
+    # How often the fleet summary materialized view is recomputed; 0 disables
+    FLEET_SUMMARY_REFRESH_INTERVAL: float = 60.0
+    # Vehicle status history partitions: how often they are checked, how many
+    # future months are created ahead, and how many past months are kept
+    STATUS_HISTORY_MAINTENANCE_INTERVAL: float = 3600.0
+    STATUS_HISTORY_MONTHS_AHEAD: int = 3
+    STATUS_HISTORY_RETENTION_MONTHS: int = 24
+
+    # Change feed: open streams per worker, distinct rows a slow client may fall
+    # behind by before it is told to resync, and seconds between keep-alives
+    CHANGE_STREAM_MAX_SUBSCRIBERS: int = 1000
+    CHANGE_STREAM_MAX_PENDING: int = 1000
+    CHANGE_STREAM_KEEPALIVE_INTERVAL: float = 15.0
+
     CORS_ORIGINS: list[str] | str = []
 
+    # Shared directory for aggregating /metrics across worker processes
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_FLUSH_INTERVAL: float = 5.0
+
     model_config = SettingsConfigDict(
         env_file=".env", case_sensitive=True, extra="ignore"
     )
 
-    @field_validator("CORS_ORIGINS", mode="before")
+    @field_validator("CORS_ORIGINS", "DATABASE_REPLICA_URLS", mode="before")
     @classmethod
-    def assemble_cors_origins(cls, v: Any) -> list[str]:
+    def assemble_comma_separated(cls, v: Any) -> list[str]:
         if isinstance(v, str):
             if not v:
                 return []
-            return [origin.strip() for origin in v.split(",")]
+            return [item.strip() for item in v.split(",")]
         return v
 
 
@@ -1,14 +1,66 @@
+import asyncio
+import itertools
 import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict, Iterator, List, Optional, Tuple
 
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from src.core.config import settings
+from src.core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_DURATION,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+    registry,
+)
 
 logger = logging.getLogger("tms.database")
 
+
+def _instrumented_pool_class(name: str) -> type[AsyncAdaptedQueuePool]:
+    """A queue pool that records how long each checkout waits, labelled `name`."""
+    checkout_duration = DB_POOL_CHECKOUT_DURATION.labels(name)
+
+    class InstrumentedPool(AsyncAdaptedQueuePool):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                checkout_duration.observe(time.perf_counter() - start)
+
+    return InstrumentedPool
+
+
+def _report_pool_stats(name: str, bind: AsyncEngine) -> None:
+    """Samples pool size and usage into gauges whenever metrics are collected."""
+
+    def collect() -> None:
+        pool = bind.pool
+        if isinstance(pool, QueuePool):
+            DB_POOL_SIZE.labels(name).set(pool.size())
+            DB_POOL_CHECKED_OUT.labels(name).set(pool.checkedout())
+            DB_POOL_OVERFLOW.labels(name).set(pool.overflow())
+
+    registry.on_collect(collect)
+
+
 engine_kwargs = {
     "echo": settings.DEBUG,
     "pool_pre_ping": True,
@@ -17,7 +69,12 @@ engine_kwargs = {
     "pool_recycle": settings.DB_POOL_RECYCLE,
 }
 
-engine = create_async_engine(settings.DATABASE_URL, **engine_kwargs)
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    **engine_kwargs,
+    poolclass=_instrumented_pool_class("primary"),
+)
+_report_pool_stats("primary", engine)
 
 AsyncSessionFactory = async_sessionmaker(
     bind=engine,
@@ -26,6 +83,188 @@ AsyncSessionFactory = async_sessionmaker(
 )
 
 
+class ReadOnlySessionError(RuntimeError):
+    """Raised when a read-only session is asked to write."""
+
+    pass
+
+
+class ReadOnlySession(Session):
+    """Sync session behind read-only requests; refuses to flush any changes."""
+
+    def flush(self, objects=None) -> None:
+        if self.new or self.dirty or self.deleted:
+            raise ReadOnlySessionError("Cannot write through a read-only session.")
+
+
+# Reads share the main pool but run in autocommit mode, so each query is a
+# single round trip with no BEGIN/COMMIT around it. PostgreSQL's default READ
+# COMMITTED isolation already gives every statement its own snapshot, so
+# dropping the transaction does not change what a request can see.
+def _read_only_session_factory(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=bind.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=AsyncSession,
+        sync_session_class=ReadOnlySession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
+
+
+ReadOnlySessionFactory = _read_only_session_factory(engine)
+
+# Seconds of replay lag; 0 when the server is not a standby or has replayed
+# everything it received (replay timestamps go stale when the primary is idle)
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(
+        EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+    )
+END
+"""
+
+# Clients that just wrote carry this cookie (or echo the header) holding the
+# epoch milliseconds until which their reads must go to the primary
+READ_YOUR_WRITES_COOKIE = "tms_read_your_writes"
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+
+
+def read_your_writes_token(now: Optional[float] = None) -> str:
+    """Returns the marker to hand a client after a successful write."""
+    now = time.time() if now is None else now
+    return str(int((now + settings.READ_YOUR_WRITES_SECONDS) * 1000))
+
+
+def is_pinned_to_primary(request: Request, now: Optional[float] = None) -> bool:
+    """True while the request's read-your-writes marker is still in its window."""
+    token = request.headers.get(READ_YOUR_WRITES_HEADER) or request.cookies.get(
+        READ_YOUR_WRITES_COOKIE
+    )
+    if not token:
+        return False
+    try:
+        until = int(token) / 1000
+    except ValueError:
+        return False
+    now = time.time() if now is None else now
+    # Ignore markers further out than the window; clients cannot pin forever
+    return now < until <= now + settings.READ_YOUR_WRITES_SECONDS
+
+
+class Replica:
+    """A read replica with its own pool and last known health."""
+
+    def __init__(self, url: str):
+        self.name = make_url(url).render_as_string(hide_password=True)
+        pool_name = f"replica:{make_url(url).host}:{make_url(url).port or 5432}"
+        self.engine = create_async_engine(
+            url,
+            **engine_kwargs,
+            poolclass=_instrumented_pool_class(pool_name),
+            connect_args={"timeout": settings.REPLICA_CONNECT_TIMEOUT},
+        )
+        _report_pool_stats(pool_name, self.engine)
+        self.session_factory = _read_only_session_factory(self.engine)
+        self.healthy = True
+        self.lag: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def mark_down(self, error: BaseException) -> None:
+        if self.healthy:
+            logger.warning(f"Replica {self.name} is unavailable: {error}")
+        self.healthy = False
+        self.error = str(error)
+
+    async def check(self, max_lag: float) -> None:
+        """Refreshes health from the replica's replay lag."""
+        try:
+            async with self.engine.connect() as connection:
+                lag = (await connection.execute(text(REPLICA_LAG_SQL))).scalar_one()
+        except (OSError, DBAPIError) as e:
+            self.mark_down(e)
+            return
+
+        self.lag = float(lag)
+        if self.lag > max_lag:
+            self.mark_down(RuntimeError(f"replication lag {self.lag:.1f}s"))
+            return
+        if not self.healthy:
+            logger.info(f"Replica {self.name} is back in rotation")
+        self.healthy = True
+        self.error = None
+
+
+class ReplicaSet:
+    """
+    Round-robins reads across healthy replicas.
+
+    A background task re-checks every replica's lag each interval. Replicas
+    that lag more than `max_lag` seconds or fail to connect are taken out of
+    rotation until a later check passes. When none are healthy, `choose`
+    returns None and reads go to the primary.
+    """
+
+    def __init__(self, urls: List[str], *, max_lag: float, interval: float):
+        self.replicas = [Replica(url) for url in urls]
+        self.max_lag = max_lag
+        self.interval = interval
+        self._cycle = itertools.cycle(self.replicas)
+        self._task: Optional[asyncio.Task] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Optional[Replica]:
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if replica.healthy:
+                return replica
+        return None
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(r.check(self.max_lag) for r in self.replicas))
+
+    async def start(self) -> None:
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._monitor(), name="replica-health")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": r.name,
+                "healthy": r.healthy,
+                "lag_seconds": r.lag,
+                "error": r.error,
+            }
+            for r in self.replicas
+        ]
+
+    async def _monitor(self) -> None:
+        while True:
+            await self.check_all()
+            await asyncio.sleep(self.interval)
+
+
+replica_set = ReplicaSet(
+    settings.DATABASE_REPLICA_URLS,  # pyright: ignore [reportArgumentType]
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    interval=settings.REPLICA_HEALTH_CHECK_INTERVAL,
+)
+
+
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """Dependency to get a database session."""
     async with AsyncSessionFactory() as session:
@@ -39,11 +278,108 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get a session for endpoints that only read.
+    There is no transaction to commit, and any attempt to flush changes fails.
+
+    Reads go to a healthy replica when replicas are configured, unless the
+    client wrote recently (see `is_pinned_to_primary`) or the chosen replica
+    cannot be reached, in which case they go to the primary.
+    """
+    session: Optional[AsyncSession] = None
+    replica = None if is_pinned_to_primary(request) else replica_set.choose()
+    if replica is not None:
+        session = replica.session_factory()
+        try:
+            await session.connection()
+        except (OSError, DBAPIError) as e:
+            replica.mark_down(e)
+            await session.close()
+            session = None
+
+    if session is None:
+        session = ReadOnlySessionFactory()
+    async with session:
+        yield session
+
+
+async def get_primary_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get a read-only session on the primary, for reads that must
+    not lag behind commits however recently the client wrote (delta sync).
+    """
+    async with ReadOnlySessionFactory() as session:
+        yield session
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    Dependency for endpoints that must own their session's lifetime, such as
+    streaming responses that keep reading after the endpoint has returned.
+    """
+    return AsyncSessionFactory
+
+
+@dataclass
+class QueryStats:
+    """Statements executed, and time spent in them, while counting was active."""
+
+    count: int = 0
+    duration: float = 0.0
+    statements: List[str] = field(default_factory=list)
+
+
+# Every active `count_queries` block, innermost last
+_active_query_stats: ContextVar[Tuple[QueryStats, ...]] = ContextVar(
+    "active_query_stats", default=()
+)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """
+    Counts the SQL statements run by the current task (or request) inside the
+    block, on any engine. Blocks may nest; each sees every statement within it.
+    """
+    stats = QueryStats()
+    token = _active_query_stats.set((*_active_query_stats.get(), stats))
+    try:
+        yield stats
+    finally:
+        _active_query_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if _active_query_stats.get():
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    active = _active_query_stats.get()
+    if not active or not conn.info.get("query_start"):
+        return
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    for stats in active:
+        stats.count += 1
+        stats.duration += elapsed
+        stats.statements.append(statement)
+
+
 def get_naive_utc_now() -> datetime:
     """Returns a naive UTC datetime to match DB column type."""
     return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
+def get_violated_constraint(exc: IntegrityError) -> Optional[str]:
+    """Returns the name of the constraint behind an IntegrityError, if known."""
+    # The asyncpg adapter chains the driver exception, which carries the name.
+    driver_error = getattr(exc.orig, "__cause__", None)
+    return getattr(driver_error, "constraint_name", None)
+
+
 async def check_database_connection() -> bool:
     """Check if the database connection is working."""
     try:
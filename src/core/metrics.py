@@ -0,0 +1,354 @@
+"""
+A small in-process metrics registry rendered in the Prometheus text format.
+
+Recording a sample is a dict lookup plus a few additions, with no locks: each
+worker process runs a single event loop. When `METRICS_MULTIPROC_DIR` is set,
+every worker periodically writes a JSON snapshot of its samples into that
+directory, and `/metrics` merges the snapshots of all workers. Counters and
+histograms of exited workers are kept, since they are cumulative; gauges only
+count live workers. The directory should be emptied before the server starts.
+"""
+
+import bisect
+import functools
+import inspect
+import json
+import math
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.core.config import settings
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, Any] = {}
+
+    def labels(self, *labelvalues: str) -> Any:
+        """Returns the child for these label values, creating it on first use."""
+        child = self._children.get(labelvalues)
+        if child is None:
+            if len(labelvalues) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[labelvalues] = self._new_child()
+        return child
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "documentation": self.documentation,
+            "labelnames": list(self.labelnames),
+            "samples": [
+                [list(labelvalues), child.value()]
+                for labelvalues, child in self._children.items()
+            ],
+        }
+
+
+class _CounterChild:
+    __slots__ = ("_value",)
+
+    def __init__(self):
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._value += amount
+
+    def value(self) -> float:
+        return self._value
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._value -= amount
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+
+class _HistogramChild:
+    __slots__ = ("_upper_bounds", "_counts", "_sum")
+
+    def __init__(self, upper_bounds: Sequence[float]):
+        self._upper_bounds = upper_bounds
+        self._counts = [0] * (len(upper_bounds) + 1)
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self._upper_bounds, value)] += 1
+        self._sum += value
+
+    def value(self) -> Dict[str, Any]:
+        return {"counts": list(self._counts), "sum": self._sum}
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**super().snapshot(), "buckets": list(self.buckets)}
+
+
+class MetricsRegistry:
+    def __init__(self, multiproc_dir: Optional[str] = None):
+        self.multiproc_dir = multiproc_dir
+        self._metrics: Dict[str, Metric] = {}
+        self._collect_hooks: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def on_collect(self, hook: Callable[[], None]) -> None:
+        """Registers a hook that refreshes sampled gauges before each snapshot."""
+        self._collect_hooks.append(hook)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        for hook in self._collect_hooks:
+            hook()
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def write_snapshot(self) -> None:
+        """Atomically writes this worker's snapshot into the multiprocess directory."""
+        if not self.multiproc_dir:
+            return
+        path = os.path.join(self.multiproc_dir, f"metrics-{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"pid": os.getpid(), "metrics": self.snapshot()}, f)
+        os.replace(tmp_path, path)
+
+    def render(self) -> str:
+        """Renders every worker's metrics (or just this one's) as Prometheus text."""
+        if not self.multiproc_dir:
+            return render_text(self.snapshot())
+        self.write_snapshot()
+        return render_text(merge_snapshots(self._read_snapshots()))
+
+    def _read_snapshots(self) -> Iterable[Tuple[bool, Dict[str, Dict[str, Any]]]]:
+        assert self.multiproc_dir
+        for entry in os.scandir(self.multiproc_dir):
+            if not (entry.name.startswith("metrics-") and entry.name.endswith(".json")):
+                continue
+            try:
+                with open(entry.path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            yield _is_alive(data["pid"]), data["metrics"]
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge_snapshots(
+    snapshots: Iterable[Tuple[bool, Dict[str, Dict[str, Any]]]],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Sums samples with the same labels across workers. Gauges of workers that
+    are no longer running are dropped.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    values: Dict[str, Dict[LabelValues, Any]] = {}
+    for alive, metrics in snapshots:
+        for name, metric in metrics.items():
+            if metric["kind"] == "gauge" and not alive:
+                continue
+            merged.setdefault(name, {**metric, "samples": []})
+            by_labels = values.setdefault(name, {})
+            for labelvalues, value in metric["samples"]:
+                key = tuple(labelvalues)
+                current = by_labels.get(key)
+                if current is None:
+                    by_labels[key] = value
+                elif metric["kind"] == "histogram":
+                    by_labels[key] = {
+                        "counts": [
+                            a + b for a, b in zip(current["counts"], value["counts"])
+                        ],
+                        "sum": current["sum"] + value["sum"],
+                    }
+                else:
+                    by_labels[key] = current + value
+    for name, by_labels in values.items():
+        merged[name]["samples"] = [[list(k), v] for k, v in by_labels.items()]
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def render_text(metrics: Dict[str, Dict[str, Any]]) -> str:
+    """Renders snapshots in the Prometheus text exposition format (0.0.4)."""
+    lines: List[str] = []
+    for name, metric in sorted(metrics.items()):
+        lines.append(f"# HELP {name} {metric['documentation']}")
+        lines.append(f"# TYPE {name} {metric['kind']}")
+        labelnames = metric["labelnames"]
+        for labelvalues, value in sorted(metric["samples"]):
+            if metric["kind"] != "histogram":
+                labels = _format_labels(labelnames, labelvalues)
+                lines.append(f"{name}{labels} {_format_value(value)}")
+                continue
+            cumulative = 0
+            bounds = [*metric["buckets"], math.inf]
+            for bound, count in zip(bounds, value["counts"]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                labels = _format_labels(labelnames, labelvalues, le)
+                lines.append(f"{name}_bucket{labels} {cumulative}")
+            labels = _format_labels(labelnames, labelvalues)
+            lines.append(f"{name}_sum{labels} {_format_value(value['sum'])}")
+            lines.append(f"{name}_count{labels} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry(settings.METRICS_MULTIPROC_DIR)
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served."
+)
+DB_POOL_CHECKOUT_DURATION = registry.histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a pooled database connection.",
+    ("pool",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_SIZE = registry.gauge(
+    "db_pool_size", "Configured number of persistent connections.", ("pool",)
+)
+DB_POOL_CHECKED_OUT = registry.gauge(
+    "db_pool_checked_out", "Connections currently in use.", ("pool",)
+)
+DB_POOL_OVERFLOW = registry.gauge(
+    "db_pool_overflow",
+    "Connections opened beyond the pool size (negative while below it).",
+    ("pool",),
+)
+REPOSITORY_DURATION = registry.histogram(
+    "repository_method_duration_seconds",
+    "Latency of repository methods, including database round trips.",
+    ("repository", "method"),
+)
+
+
+def _timed(fn: Callable, child: _HistogramChild) -> Callable:
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            child.observe(time.perf_counter() - start)
+
+    return wrapper
+
+
+def instrument_repository(name: str) -> Callable[[type], type]:
+    """Class decorator that times every public coroutine method of a repository."""
+
+    def decorate(cls: type) -> type:
+        for attr, fn in list(vars(cls).items()):
+            if attr.startswith("_") or not inspect.iscoroutinefunction(fn):
+                continue
+            setattr(cls, attr, _timed(fn, REPOSITORY_DURATION.labels(name, attr)))
+        return cls
+
+    return decorate
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+
+logger = logging.getLogger("tms.notifications")
+
+NotificationHandler = Callable[[str], None]
+
+
+async def notify(session: AsyncSession, channel: str, payload: str) -> None:
+    """
+    Queues a PostgreSQL NOTIFY on the session's transaction.
+    Listeners only receive it once the transaction commits, and never on rollback.
+    """
+    await session.execute(select(func.pg_notify(channel, payload)))
+
+
+def _asyncpg_dsn(database_url: str) -> str:
+    """Turns the SQLAlchemy database URL into a plain libpq DSN for asyncpg."""
+    url = make_url(database_url).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+class NotificationListener:
+    """
+    Holds a dedicated connection that LISTENs on PostgreSQL channels and
+    dispatches payloads to in-process handlers.
+
+    Every worker process runs its own listener, so a NOTIFY sent by any worker
+    reaches all of them, including the sender. If the connection drops,
+    notifications sent in the meantime are lost, so each channel's
+    `on_reconnect` callback runs after every (re)connect to resynchronise.
+    """
+
+    def __init__(
+        self, database_url: Optional[str] = None, *, reconnect_delay: float = 5.0
+    ):
+        self._dsn = _asyncpg_dsn(database_url or settings.DATABASE_URL)
+        self._reconnect_delay = reconnect_delay
+        self._handlers: Dict[str, List[NotificationHandler]] = {}
+        self._on_reconnect: List[Callable[[], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(
+        self,
+        channel: str,
+        handler: NotificationHandler,
+        *,
+        on_reconnect: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Registers a handler for a channel. Must be called before `start`."""
+        self._handlers.setdefault(channel, []).append(handler)
+        if on_reconnect is not None:
+            self._on_reconnect.append(on_reconnect)
+
+    async def start(self) -> None:
+        if self._handlers and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="pg-listener")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _dispatch(self, _connection, _pid: int, channel: str, payload: str) -> None:
+        for handler in self._handlers.get(channel, []):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception(f"Handler for channel '{channel}' failed")
+
+    async def _run(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self._dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                for channel in self._handlers:
+                    await connection.add_listener(channel, self._dispatch)
+                for callback in self._on_reconnect:
+                    callback()
+                logger.info(f"Listening on {', '.join(self._handlers)}")
+                await closed.wait()
+                logger.warning("Notification connection lost, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Notification listener failed: {e}")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(self._reconnect_delay)
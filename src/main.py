@@ -1,32 +1,153 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.base import router as base_router
 from src.api.v1 import api_router
 from src.core.config import settings
+from src.core.db import (
+    READ_YOUR_WRITES_HEADER,
+    AsyncSessionFactory,
+    get_naive_utc_now,
+    replica_set,
+)
 from src.core.logging import setup_logging
-from src.middleware.request_id import request_id_middleware
-from src.middleware.security import security_headers_middleware
+from src.core.metrics import registry
+from src.core.notifications import NotificationListener
+from src.middleware.consistency import ReadYourWritesMiddleware
+from src.middleware.headers import ResponseHeadersMiddleware
+from src.middleware.metrics import MetricsMiddleware
+from src.middleware.query_stats import QueryStatsMiddleware
+from src.models.change_feed import CHANGE_FEED_CHANNEL
+from src.repositories.counter import counter_repo
+from src.repositories.fleet import fleet_summary_repo
+from src.repositories.status_history import status_history_repo
+from src.repositories.vendor import VENDOR_CHANGED_CHANNEL, vendor_cache, vendor_repo
+from src.services.change_feed_service import change_broadcaster
 from src.services.vendor_service import (
     EmailAlreadyExists,
     InvalidEmailFormat,
     PhoneAlreadyExists,
     VendorNotFound,
 )
+from src.utils.etags import ETAG_HEADER, PreconditionFailed
+from src.utils.pagination import NEXT_CURSOR_HEADER, SYNC_TOKEN_HEADER, InvalidCursor
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
 
+async def _flush_metrics() -> None:
+    """Periodically publishes this worker's metrics for /metrics on other workers."""
+    if not settings.METRICS_MULTIPROC_DIR:
+        return
+    while True:
+        try:
+            registry.write_snapshot()
+        except OSError as e:
+            logger.error(f"Failed to write metrics snapshot: {e}")
+        await asyncio.sleep(settings.METRICS_FLUSH_INTERVAL)
+
+
+async def _run_periodically(
+    name: str, interval: float, job: Callable[[AsyncSession], Awaitable[Any]]
+) -> None:
+    """
+    Runs a maintenance job in its own transaction at startup and then every
+    `interval` seconds.
+    """
+    if interval <= 0:
+        return
+    while True:
+        try:
+            async with AsyncSessionFactory() as session:
+                await job(session)
+                await session.commit()
+        except (OSError, SQLAlchemyError) as e:
+            logger.error(f"{name} failed: {e}")
+        await asyncio.sleep(interval)
+
+
+async def _reconcile_counters(session: AsyncSession) -> None:
+    """Repairs drift in the trigger-maintained entity counters."""
+    drift = await counter_repo.reconcile(session)
+    if drift:
+        logger.warning(f"Repaired drifted counters: {drift}")
+
+
+async def _maintain_status_history(session: AsyncSession) -> None:
+    """Creates upcoming status history partitions and drops expired ones."""
+    changes = await status_history_repo.maintain_partitions(
+        session,
+        today=get_naive_utc_now().date(),
+        months_ahead=settings.STATUS_HISTORY_MONTHS_AHEAD,
+        retain_months=settings.STATUS_HISTORY_RETENTION_MONTHS,
+    )
+    created, dropped = changes or ([], [])
+    if created or dropped:
+        logger.info(f"Status history partitions created: {created}, dropped: {dropped}")
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     logger.info(f"Starting up in {settings.ENVIRONMENT} mode...")
+
+    # Keep this worker's vendor cache coherent with writes made by other workers
+    listener = NotificationListener()
+    listener.subscribe(
+        VENDOR_CHANGED_CHANNEL,
+        vendor_repo.handle_change_notification,
+        on_reconnect=vendor_cache.clear,
+    )
+    # The same connection feeds every change stream client of this worker
+    listener.subscribe(
+        CHANGE_FEED_CHANNEL,
+        change_broadcaster.handle_notification,
+        on_reconnect=change_broadcaster.resync_all,
+    )
+    await listener.start()
+    await replica_set.start()
+    metrics_flusher = asyncio.create_task(_flush_metrics())
+    maintenance_jobs = [
+        asyncio.create_task(
+            _run_periodically(
+                "Counter reconciliation",
+                settings.COUNTER_RECONCILE_INTERVAL,
+                _reconcile_counters,
+            )
+        ),
+        asyncio.create_task(
+            _run_periodically(
+                "Fleet summary refresh",
+                settings.FLEET_SUMMARY_REFRESH_INTERVAL,
+                fleet_summary_repo.refresh,
+            )
+        ),
+        asyncio.create_task(
+            _run_periodically(
+                "Status history partition maintenance",
+                settings.STATUS_HISTORY_MAINTENANCE_INTERVAL,
+                _maintain_status_history,
+            )
+        ),
+    ]
+
     yield
+
     logger.info("Shutting down...")
+    metrics_flusher.cancel()
+    for job in maintenance_jobs:
+        job.cancel()
+    registry.write_snapshot()
+    await listener.stop()
+    await replica_set.stop()
 
 
 def create_app() -> FastAPI:
@@ -40,10 +161,20 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "DELETE"],
         allow_headers=["*"],
+        expose_headers=[
+            NEXT_CURSOR_HEADER,
+            SYNC_TOKEN_HEADER,
+            READ_YOUR_WRITES_HEADER,
+            ETAG_HEADER,
+        ],
     )
 
-    app.middleware("http")(security_headers_middleware)
-    app.middleware("http")(request_id_middleware)
+    if replica_set:
+        app.add_middleware(ReadYourWritesMiddleware)
+    if settings.DEBUG:
+        app.add_middleware(QueryStatsMiddleware)
+    app.add_middleware(ResponseHeadersMiddleware)
+    app.add_middleware(MetricsMiddleware)
 
     @app.exception_handler(VendorNotFound)
     async def vendor_not_found_handler(request: Request, exc: VendorNotFound):
@@ -70,6 +201,19 @@ def create_app() -> FastAPI:
             content={"detail": str(exc)},
         )
 
+    @app.exception_handler(InvalidCursor)
+    async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)}
+        )
+
+    @app.exception_handler(PreconditionFailed)
+    async def precondition_failed_handler(request: Request, exc: PreconditionFailed):
+        return JSONResponse(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            content={"detail": str(exc)},
+        )
+
     app.include_router(base_router)
     app.include_router(api_router, prefix="/api/v1")
 
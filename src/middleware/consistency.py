@@ -0,0 +1,45 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.core.db import (
+    READ_YOUR_WRITES_COOKIE,
+    READ_YOUR_WRITES_HEADER,
+    read_your_writes_token,
+)
+
+_SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReadYourWritesMiddleware:
+    """
+    Marks clients that just wrote so their next reads skip the replicas.
+
+    After any successful non-GET request the response carries a cookie, and the
+    same value in a header for clients without a cookie jar to echo back. While
+    the marker is within its window, `get_read_session` routes to the primary,
+    so a client never reads an older state than the one it just wrote.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in _SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_marker(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                token = read_your_writes_token()
+                headers = MutableHeaders(scope=message)
+                headers[READ_YOUR_WRITES_HEADER] = token
+                headers.append(
+                    "Set-Cookie",
+                    f"{READ_YOUR_WRITES_COOKIE}={token}; "
+                    f"Max-Age={int(settings.READ_YOUR_WRITES_SECONDS) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_marker)
@@ -0,0 +1,47 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
+
+# Requests that match no route share one label, so 404 scans cannot add series
+_UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Records in-flight requests and per-route latency histograms.
+
+    Requests are labelled by route template (e.g. `/api/v1/vendors/{vendor_id}`)
+    rather than raw path. The router stores the matched route in the scope, so
+    it is read after the app has handled the request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._in_flight = HTTP_REQUESTS_IN_FLIGHT.labels()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        self._in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._in_flight.dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or _UNMATCHED_ROUTE
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"], route_path, str(status_code)
+            ).observe(time.perf_counter() - start)
@@ -0,0 +1,38 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.db import count_queries
+
+DB_QUERIES_HEADER = "X-DB-Queries"
+
+
+class QueryStatsMiddleware:
+    """
+    Debug-only middleware reporting how many SQL statements a request ran and
+    how long they took, as `X-DB-Queries` and a `Server-Timing` "db" entry.
+
+    Headers go out with the response start, so statements a streaming response
+    runs while sending its body are not included.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as stats:
+
+            async def send_with_stats(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers[DB_QUERIES_HEADER] = str(stats.count)
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"',
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
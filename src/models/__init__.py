@@ -7,6 +7,13 @@ Models define the database schema and are used for both database operations and
 Available Models:
 - Vendor: Transport service providers and logistics partners
 - Vehicle: Information about vehicles used for transportation
+- EntityCounter: Shards of the trigger-maintained active vendor/vehicle counts
+- VehicleStatusHistory: Monthly-partitioned log of vehicle status transitions
+- TableVersion: Shards of the per-table change counters behind collection ETags
+
+The change feed triggers (src/models/change_feed.py) and the updated_at triggers
+(src/models/timestamps.py) have no model of their own but are registered with
+the metadata here as well.
 
 Usage:
     from src.models import Vendor
@@ -15,6 +22,11 @@ Usage:
 
 """
 
+from .change_feed import CHANGE_FEED_CHANNEL
+from .counter import EntityCounter
+from .status_history import VehicleStatusHistory
+from .table_version import TableVersion
+from .timestamps import TIMESTAMPED_TABLES
 from .vehicle import Vehicle
 from .vendor import Vendor
 
@@ -22,6 +34,11 @@ from .vendor import Vendor
 __all__ = [
     "Vendor",
     "Vehicle",
+    "EntityCounter",
+    "VehicleStatusHistory",
+    "TableVersion",
+    "CHANGE_FEED_CHANNEL",
+    "TIMESTAMPED_TABLES",
     # Add future models here as they are created:
     # "Customer",
     # "Order",
@@ -35,6 +52,9 @@ __all__ = [
 MODELS = {
     "vendor": Vendor,
     "vehicle": Vehicle,
+    "entity_counter": EntityCounter,
+    "vehicle_status_history": VehicleStatusHistory,
+    "table_version": TableVersion,
     # Add future models here:
     # "customer": Customer,
     # "order": Order,
@@ -0,0 +1,63 @@
+from src.models.ddl import install_ddl
+
+# NOTIFY channel carrying one JSON payload per inserted, updated or deleted
+# vendor or vehicle row (see src/services/change_feed_service.py)
+CHANGE_FEED_CHANNEL = "entity_changes"
+
+# JSON fields published for a row `r` of each table, besides the entity name
+# and operation. Payloads stay far below NOTIFY's 8000 byte limit.
+FEED_TABLES = {
+    "vendor": "'id', r.id, 'vendor_id', r.id, 'is_active', r.is_active",
+    "vehicle": "'id', r.id, 'vendor_id', r.vendor_id, 'status', r.status, "
+    "'is_active', r.is_active",
+}
+
+# Soft deletes are published as deletes. pg_notify runs once per row but the
+# notifications are only delivered when the transaction commits.
+_PUBLISH_FUNCTION = """
+CREATE OR REPLACE FUNCTION {table}_publish_changes() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('{channel}', json_build_object(
+            'entity', '{table}', 'op', 'delete', {fields})::text)
+        FROM old_rows AS r;
+    ELSE
+        PERFORM pg_notify('{channel}', json_build_object(
+            'entity', '{table}',
+            'op', CASE WHEN TG_OP = 'INSERT' THEN 'insert'
+                       WHEN r.is_active THEN 'update'
+                       ELSE 'delete' END,
+            {fields})::text)
+        FROM new_rows AS r;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+# Transition tables require one trigger per event
+_TRIGGERS = [
+    "CREATE TRIGGER {table}_publish_inserts AFTER INSERT ON {table} "
+    "REFERENCING NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION {table}_publish_changes()",
+    "CREATE TRIGGER {table}_publish_updates AFTER UPDATE ON {table} "
+    "REFERENCING NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION {table}_publish_changes()",
+    "CREATE TRIGGER {table}_publish_deletes AFTER DELETE ON {table} "
+    "REFERENCING OLD TABLE AS old_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION {table}_publish_changes()",
+]
+
+# Run by the b9d2f4a6c831 migration as well
+CHANGE_FEED_DDL = [
+    *(
+        _PUBLISH_FUNCTION.format(
+            table=table, channel=CHANGE_FEED_CHANNEL, fields=fields
+        )
+        for table, fields in FEED_TABLES.items()
+    ),
+    *(trigger.format(table=table) for table in FEED_TABLES for trigger in _TRIGGERS),
+]
+
+install_ddl(CHANGE_FEED_DDL)
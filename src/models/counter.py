@@ -0,0 +1,109 @@
+from sqlalchemy import BigInteger, Column
+from sqlmodel import Field, SQLModel
+
+from src.models.ddl import install_ddl
+
+# Each counter is spread over this many rows so that concurrent writers (picked
+# by backend PID) rarely wait on each other's row lock. Readers sum the shards.
+COUNTER_SHARDS = 16
+
+
+class EntityCounter(SQLModel, table=True):
+    """
+    One shard of a named counter, maintained by statement-level triggers on
+    the counted tables. The value of a counter is the sum over its shards.
+    """
+
+    __tablename__ = "entity_counters"  # pyright: ignore [reportAssignmentType]
+
+    name: str = Field(primary_key=True, max_length=100)
+    shard: int = Field(primary_key=True)
+    value: int = Field(default=0, sa_column=Column(BigInteger, nullable=False))
+
+
+# Counter names produced for a row `r` of each counted table. Only active rows
+# are counted, so soft deletes and restores move the counts as well.
+COUNTED_TABLES = {
+    "vendor": "CASE WHEN r.is_active THEN ARRAY['vendor:active'] ELSE '{}'::text[] END",
+    "vehicle": "CASE WHEN r.is_active THEN ARRAY["
+    "'vehicle:active', 'vehicle:status:' || r.status, "
+    "'vehicle:vendor:' || r.vendor_id] ELSE '{}'::text[] END",
+}
+
+_APPLY_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION entity_counters_apply(added text[], removed text[])
+RETURNS void LANGUAGE sql AS $$
+    INSERT INTO entity_counters (name, shard, value)
+    SELECT name, mod(pg_backend_pid(), {COUNTER_SHARDS}), sum(delta)
+    FROM (
+        SELECT unnest(added) AS name, 1 AS delta
+        UNION ALL
+        SELECT unnest(removed), -1
+    ) AS deltas
+    GROUP BY name
+    HAVING sum(delta) <> 0
+    ORDER BY name
+    ON CONFLICT (name, shard)
+    DO UPDATE SET value = entity_counters.value + EXCLUDED.value
+$$
+"""
+
+_RESET_FUNCTION = """
+CREATE OR REPLACE FUNCTION entity_counters_reset() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM entity_counters WHERE starts_with(name, TG_ARGV[0]);
+    RETURN NULL;
+END
+$$
+"""
+
+# plpgsql plans each statement on first use, so the INSERT and DELETE
+# triggers never touch the transition table they do not declare.
+_COUNT_CHANGES_FUNCTION = """
+CREATE OR REPLACE FUNCTION {table}_count_changes() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    added text[] := '{{}}';
+    removed text[] := '{{}}';
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        added := ARRAY(SELECT unnest({names}) FROM new_rows AS r);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        removed := ARRAY(SELECT unnest({names}) FROM old_rows AS r);
+    END IF;
+    PERFORM entity_counters_apply(added, removed);
+    RETURN NULL;
+END
+$$
+"""
+
+# Transition tables require one trigger per event
+_TRIGGERS = [
+    "CREATE TRIGGER {table}_count_inserts AFTER INSERT ON {table} "
+    "REFERENCING NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION {table}_count_changes()",
+    "CREATE TRIGGER {table}_count_updates AFTER UPDATE ON {table} "
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION {table}_count_changes()",
+    "CREATE TRIGGER {table}_count_deletes AFTER DELETE ON {table} "
+    "REFERENCING OLD TABLE AS old_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION {table}_count_changes()",
+    "CREATE TRIGGER {table}_count_truncates AFTER TRUNCATE ON {table} "
+    "FOR EACH STATEMENT EXECUTE FUNCTION entity_counters_reset('{table}:')",
+]
+
+# Run by the d8a4b1f63e92 migration as well; changing a statement here needs a
+# migration that runs it again.
+COUNTER_DDL = [
+    _APPLY_FUNCTION,
+    _RESET_FUNCTION,
+    *(
+        _COUNT_CHANGES_FUNCTION.format(table=table, names=names)
+        for table, names in COUNTED_TABLES.items()
+    ),
+    *(trigger.format(table=table) for table in COUNTED_TABLES for trigger in _TRIGGERS),
+]
+
+install_ddl(COUNTER_DDL)
@@ -0,0 +1,19 @@
+from typing import Iterable
+
+from sqlalchemy import DDL, event
+from sqlmodel import SQLModel
+
+
+def install_ddl(statements: Iterable[str]) -> None:
+    """
+    Registers raw PostgreSQL DDL (functions, triggers, views) to run once every
+    table exists, when the schema is created from the metadata (tests, fresh
+    databases). Migrations execute the same statement lists, so each
+    definition has a single copy, in its model module.
+    """
+    for statement in statements:
+        event.listen(
+            SQLModel.metadata,
+            "after_create",
+            DDL(statement).execute_if(dialect="postgresql"),
+        )
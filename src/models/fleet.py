@@ -0,0 +1,78 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import DDL, event
+from sqlmodel import Field, SQLModel
+
+from src.models.ddl import install_ddl
+
+FLEET_SUMMARY_VIEW = "fleet_summary"
+
+# One row per active vendor with its active vehicles aggregated by status.
+# `refreshed_at` is evaluated when the view is refreshed, not when it is read.
+FLEET_SUMMARY_SQL = f"""
+CREATE MATERIALIZED VIEW IF NOT EXISTS {FLEET_SUMMARY_VIEW} AS
+SELECT v.id AS vendor_id,
+       v.company_name,
+       count(h.id) AS total_vehicles,
+       count(h.id) FILTER (WHERE h.status = 'Idle') AS idle_vehicles,
+       count(h.id) FILTER (WHERE h.status = 'In Transit') AS in_transit_vehicles,
+       count(h.id) FILTER (WHERE h.status = 'Maintenance') AS maintenance_vehicles,
+       count(h.id) FILTER (WHERE h.status = 'Out of Service')
+           AS out_of_service_vehicles,
+       coalesce(sum(h.capacity), 0) AS total_capacity,
+       coalesce(sum(h.capacity) FILTER (WHERE h.status = 'Idle'), 0)
+           AS idle_capacity,
+       now() AS refreshed_at
+FROM vendor v
+LEFT JOIN vehicle h ON h.vendor_id = v.id AND h.is_active
+WHERE v.is_active
+GROUP BY v.id, v.company_name
+"""
+
+# Run by the e3f7c9a25d41 migration as well
+FLEET_SUMMARY_DDL = [
+    FLEET_SUMMARY_SQL,
+    # A unique index is required by REFRESH ... CONCURRENTLY
+    f"CREATE UNIQUE INDEX IF NOT EXISTS ix_{FLEET_SUMMARY_VIEW}_vendor_id "
+    f"ON {FLEET_SUMMARY_VIEW} (vendor_id)",
+    # Keyset pagination ordered by (company_name, vendor_id)
+    f"CREATE INDEX IF NOT EXISTS ix_{FLEET_SUMMARY_VIEW}_company_name_vendor_id "
+    f"ON {FLEET_SUMMARY_VIEW} (company_name, vendor_id)",
+]
+
+
+class FleetSummary(SQLModel, table=True):
+    """
+    Maps the fleet_summary materialized view for reading.
+
+    The view is created by FLEET_SUMMARY_DDL, not as a table, so its Table is
+    taken back out of the shared metadata below.
+    """
+
+    __tablename__ = FLEET_SUMMARY_VIEW  # pyright: ignore [reportAssignmentType]
+
+    vendor_id: UUID = Field(primary_key=True)
+    company_name: str
+    total_vehicles: int
+    idle_vehicles: int
+    in_transit_vehicles: int
+    maintenance_vehicles: int
+    out_of_service_vehicles: int
+    total_capacity: float
+    idle_capacity: float
+    refreshed_at: Optional[datetime] = None
+
+
+SQLModel.metadata.remove(SQLModel.metadata.tables[FLEET_SUMMARY_VIEW])
+
+install_ddl(FLEET_SUMMARY_DDL)
+# The view depends on vendor and vehicle, which could not be dropped otherwise
+event.listen(
+    SQLModel.metadata,
+    "before_drop",
+    DDL(f"DROP MATERIALIZED VIEW IF EXISTS {FLEET_SUMMARY_VIEW}").execute_if(
+        dialect="postgresql"
+    ),
+)
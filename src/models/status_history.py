@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import BigInteger, Column, Identity, Index
+from sqlmodel import Field, SQLModel
+
+from src.models.ddl import install_ddl
+
+STATUS_HISTORY_TABLE = "vehicle_status_history"
+# Catches rows for months that have no partition yet (see
+# StatusHistoryRepository.maintain_partitions, which moves them out).
+STATUS_HISTORY_DEFAULT_PARTITION = f"{STATUS_HISTORY_TABLE}_default"
+
+
+class VehicleStatusHistory(SQLModel, table=True):
+    """
+    Append-only log of vehicle status transitions, written by triggers on
+    vehicle in the same transaction as the change. Range partitioned by month
+    on changed_at so that old months can be dropped wholesale.
+
+    vehicle_id has no foreign key: history outlives permanently deleted
+    vehicles, and partitions are cheaper to drop without one.
+    """
+
+    __tablename__ = STATUS_HISTORY_TABLE  # pyright: ignore [reportAssignmentType]
+    __table_args__ = (
+        # Time-range scans across all vehicles; rows arrive in changed_at
+        # order, so a block range index stays tiny even at billions of rows.
+        Index(
+            "ix_vehicle_status_history_changed_at_brin",
+            "changed_at",
+            postgresql_using="brin",
+        ),
+        # Per-vehicle lookups, e.g. the status a vehicle was in at a point in time
+        Index(
+            "ix_vehicle_status_history_vehicle_id_changed_at",
+            "vehicle_id",
+            "changed_at",
+        ),
+        {"postgresql_partition_by": "RANGE (changed_at)"},
+    )
+
+    id: Optional[int] = Field(
+        default=None, sa_column=Column(BigInteger, Identity(), primary_key=True)
+    )
+    # The partition key must be part of the primary key
+    changed_at: datetime = Field(primary_key=True)
+    vehicle_id: UUID
+    # NULL for the status a vehicle was created with
+    from_status: Optional[str] = Field(default=None, max_length=50)
+    to_status: str = Field(max_length=50)
+
+
+# Records the initial status of new vehicles and every status change. The
+# timestamp is the transaction's, as naive UTC like the other timestamps.
+_RECORD_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION vehicle_record_status_changes() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO {STATUS_HISTORY_TABLE}
+            (vehicle_id, from_status, to_status, changed_at)
+        SELECT n.id, NULL, n.status, now() AT TIME ZONE 'UTC' FROM new_rows AS n;
+    ELSE
+        INSERT INTO {STATUS_HISTORY_TABLE}
+            (vehicle_id, from_status, to_status, changed_at)
+        SELECT n.id, o.status, n.status, now() AT TIME ZONE 'UTC'
+        FROM new_rows AS n JOIN old_rows AS o ON o.id = n.id
+        WHERE n.status IS DISTINCT FROM o.status;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+# Run by the a7c3e5f9b214 migration as well
+STATUS_HISTORY_DDL = [
+    f"CREATE TABLE IF NOT EXISTS {STATUS_HISTORY_DEFAULT_PARTITION} "
+    f"PARTITION OF {STATUS_HISTORY_TABLE} DEFAULT",
+    _RECORD_FUNCTION,
+    "CREATE TRIGGER vehicle_record_status_inserts AFTER INSERT ON vehicle "
+    "REFERENCING NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION vehicle_record_status_changes()",
+    "CREATE TRIGGER vehicle_record_status_updates AFTER UPDATE ON vehicle "
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION vehicle_record_status_changes()",
+]
+
+install_ddl(STATUS_HISTORY_DDL)
@@ -0,0 +1,79 @@
+from sqlalchemy import BigInteger, Column
+from sqlmodel import Field, SQLModel
+
+from src.models.counter import COUNTER_SHARDS
+from src.models.ddl import install_ddl
+
+# Tables whose writes bump their version (see TABLE_VERSION_DDL)
+VERSIONED_TABLES = ("vendor", "vehicle")
+
+
+class TableVersion(SQLModel, table=True):
+    """
+    One shard of a table's change counter. Every committed write statement
+    that changed rows of the table adds 1 to a shard, so the sum over the
+    shards only ever grows and tells readers whether anything changed since
+    they last looked (ETags). Sharded like EntityCounter so that concurrent
+    writers rarely queue.
+    """
+
+    __tablename__ = "table_versions"  # pyright: ignore [reportAssignmentType]
+
+    table_name: str = Field(primary_key=True, max_length=63)
+    shard: int = Field(primary_key=True)
+    version: int = Field(default=0, sa_column=Column(BigInteger, nullable=False))
+
+
+# Statements that changed no rows (an UPDATE matching nothing, a conditional
+# write whose If-Match failed) leave the version, and so every ETag, alone.
+# plpgsql plans each statement on first use, so the INSERT and DELETE
+# triggers never touch the transition table they do not declare. A TRUNCATE
+# has no transition table and always counts.
+_BUMP_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION table_versions_bump() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF NOT EXISTS (SELECT 1 FROM new_rows) THEN
+            RETURN NULL;
+        END IF;
+    ELSIF TG_OP = 'DELETE' THEN
+        IF NOT EXISTS (SELECT 1 FROM old_rows) THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+    INSERT INTO table_versions (table_name, shard, version)
+    VALUES (TG_TABLE_NAME, mod(pg_backend_pid(), {COUNTER_SHARDS}), 1)
+    ON CONFLICT (table_name, shard)
+    DO UPDATE SET version = table_versions.version + 1;
+    RETURN NULL;
+END
+$$
+"""
+
+# Transition tables require one trigger per event
+_TRIGGERS = [
+    "CREATE TRIGGER {table}_version_inserts AFTER INSERT ON {table} "
+    "REFERENCING NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION table_versions_bump()",
+    "CREATE TRIGGER {table}_version_updates AFTER UPDATE ON {table} "
+    "REFERENCING NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION table_versions_bump()",
+    "CREATE TRIGGER {table}_version_deletes AFTER DELETE ON {table} "
+    "REFERENCING OLD TABLE AS old_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION table_versions_bump()",
+    "CREATE TRIGGER {table}_version_truncates AFTER TRUNCATE ON {table} "
+    "FOR EACH STATEMENT EXECUTE FUNCTION table_versions_bump()",
+]
+
+# Run by the d2f7b4c9e1a6 migration as well
+TABLE_VERSION_DDL = [
+    _BUMP_FUNCTION,
+    *(
+        trigger.format(table=table)
+        for table in VERSIONED_TABLES
+        for trigger in _TRIGGERS
+    ),
+]
+
+install_ddl(TABLE_VERSION_DDL)
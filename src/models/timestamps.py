@@ -0,0 +1,33 @@
+from src.models.ddl import install_ddl
+
+# Tables whose updated_at is stamped by the database (see UPDATED_AT_DDL)
+TIMESTAMPED_TABLES = ("vendor", "vehicle")
+
+# Every insert and update, whatever the write path, gets the same clock: the
+# database's, as naive UTC like the other timestamps. The transaction takes its
+# ID before the clock is read, so a row is never stamped earlier than its
+# transaction shows up as writing in pg_stat_activity.backend_xid. Delta sync
+# relies on this to ignore transactions that have not written (see
+# src/repositories/sync.py).
+_SET_UPDATED_AT_FUNCTION = """
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_current_xact_id();
+    NEW.updated_at := clock_timestamp() AT TIME ZONE 'UTC';
+    RETURN NEW;
+END
+$$
+"""
+
+# Run by the c6e1a9d3f7b5 migration as well
+UPDATED_AT_DDL = [
+    _SET_UPDATED_AT_FUNCTION,
+    *(
+        f"CREATE TRIGGER {table}_set_updated_at BEFORE INSERT OR UPDATE ON {table} "
+        "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+        for table in TIMESTAMPED_TABLES
+    ),
+]
+
+install_ddl(UPDATED_AT_DDL)
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import func
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel
 
 from src.core.db import get_naive_utc_now
@@ -13,6 +13,50 @@ class Vehicle(SQLModel, table=True):
     Represents the Vehicle table in the database.
     """
 
+    __table_args__ = (
+        # Keyset pagination ordered by (created_at, id). Every list query only
+        # reads active vehicles, so soft-deleted rows are left out of the index.
+        Index(
+            "ix_vehicle_active_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_vehicle_active_vendor_id_created_at_id",
+            "vendor_id",
+            "created_at",
+            "id",
+            postgresql_where=text("is_active"),
+        ),
+        # Delta sync ordered by (updated_at, id), soft-deleted rows included
+        Index("ix_vehicle_updated_at_id", "updated_at", "id"),
+        # Availability lookups: status equality, capacity range and order
+        Index(
+            "ix_vehicle_active_status_capacity_id",
+            "status",
+            "capacity",
+            "id",
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_vehicle_active_capacity_id",
+            "capacity",
+            "id",
+            postgresql_where=text("is_active"),
+        ),
+        # Substring search (ILIKE '%term%'), requires the pg_trgm extension
+        *(
+            Index(
+                f"ix_vehicle_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+            for column in ("registration_number", "make", "model")
+        ),
+    )
+
     id: Optional[UUID] = Field(default_factory=uuid4, primary_key=True)
     vendor_id: UUID = Field(foreign_key="vendor.id", index=True)
     registration_number: str = Field(unique=True, index=True, max_length=50)
@@ -26,8 +70,5 @@ class Vehicle(SQLModel, table=True):
 
     is_active: bool = Field(default=True)
     created_at: datetime = Field(default_factory=get_naive_utc_now, nullable=False)
-    updated_at: datetime = Field(
-        default_factory=get_naive_utc_now,
-        nullable=False,
-        sa_column_kwargs={"onupdate": func.now()},
-    )
+    # Overwritten by the database on every insert and update (set_updated_at)
+    updated_at: datetime = Field(default_factory=get_naive_utc_now, nullable=False)
@@ -3,7 +3,7 @@ from typing import Optional
 from uuid import UUID, uuid4
 
 from pydantic import EmailStr
-from sqlalchemy import func
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel
 
 from src.core.db import get_naive_utc_now
@@ -14,6 +14,25 @@ class Vendor(SQLModel, table=True):
     Represents the Vendor table in the database.
     """
 
+    __table_args__ = (
+        # Keyset pagination ordered by (created_at, id)
+        Index("ix_vendor_created_at_id", "created_at", "id"),
+        # Delta sync ordered by (updated_at, id), soft-deleted rows included
+        Index("ix_vendor_updated_at_id", "updated_at", "id"),
+        # Lets the active vendor count read a small index instead of the table
+        Index("ix_vendor_active_id", "id", postgresql_where=text("is_active")),
+        # Substring search (ILIKE '%term%'), requires the pg_trgm extension
+        *(
+            Index(
+                f"ix_vendor_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+            for column in ("company_name", "contact_person", "email")
+        ),
+    )
+
     id: Optional[UUID] = Field(default_factory=uuid4, primary_key=True)
     company_name: str = Field(index=True, max_length=255)
     contact_person: Optional[str] = Field(default=None, max_length=255)
@@ -24,8 +43,5 @@ class Vendor(SQLModel, table=True):
 
     is_active: bool = Field(default=True)
     created_at: datetime = Field(default_factory=get_naive_utc_now, nullable=False)
-    updated_at: datetime = Field(
-        default_factory=get_naive_utc_now,
-        nullable=False,
-        sa_column_kwargs={"onupdate": func.now()},
-    )
+    # Overwritten by the database on every insert and update (set_updated_at)
+    updated_at: datetime = Field(default_factory=get_naive_utc_now, nullable=False)
@@ -0,0 +1,110 @@
+from typing import Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col, select
+
+from src.core.metrics import instrument_repository
+from src.models.counter import EntityCounter
+
+ACTIVE_VENDORS = "vendor:active"
+ACTIVE_VEHICLES = "vehicle:active"
+
+# Held for the duration of a reconciliation so that two runs (e.g. from several
+# workers) never both apply the same correction.
+_RECONCILE_LOCK_ID = 0x746D73636E74  # "tmscnt"
+
+# True counts computed from the tables, named like the trigger-maintained ones
+_ACTUAL_COUNTS_SQL = """
+SELECT 'vendor:active' AS name, count(*) AS value FROM vendor WHERE is_active
+UNION ALL
+SELECT 'vehicle:active', count(*) FROM vehicle WHERE is_active
+UNION ALL
+SELECT 'vehicle:status:' || status, count(*)
+FROM vehicle WHERE is_active GROUP BY status
+UNION ALL
+SELECT 'vehicle:vendor:' || vendor_id, count(*)
+FROM vehicle WHERE is_active GROUP BY vendor_id
+"""
+
+# Compares the true counts with the recorded ones and adds the difference to
+# shard 0. Both sides are read from the same snapshot and the correction is
+# applied as an increment, so writes committing meanwhile are not lost.
+_RECONCILE_SQL = f"""
+WITH actual AS ({_ACTUAL_COUNTS_SQL}),
+recorded AS (
+    SELECT name, sum(value) AS value FROM entity_counters GROUP BY name
+),
+drift AS (
+    SELECT coalesce(a.name, r.name) AS name,
+           coalesce(a.value, 0) - coalesce(r.value, 0) AS delta
+    FROM actual a FULL JOIN recorded r ON r.name = a.name
+    WHERE coalesce(a.value, 0) <> coalesce(r.value, 0)
+),
+repaired AS (
+    INSERT INTO entity_counters (name, shard, value)
+    SELECT name, 0, delta FROM drift ORDER BY name
+    ON CONFLICT (name, shard)
+    DO UPDATE SET value = entity_counters.value + EXCLUDED.value
+)
+SELECT name, delta FROM drift ORDER BY name
+"""
+
+
+def vehicle_status_counter(status: str) -> str:
+    """Name of the counter of active vehicles in the given status."""
+    return f"vehicle:status:{status}"
+
+
+def vendor_vehicles_counter(vendor_id: UUID) -> str:
+    """Name of the counter of a vendor's active vehicles."""
+    return f"vehicle:vendor:{vendor_id}"
+
+
+@instrument_repository("counter")
+class CounterRepository:
+    """
+    Reads the counters that triggers on vendor and vehicle keep up to date
+    (see src/models/counter.py), and repairs them if they ever drift.
+    """
+
+    async def get(self, session: AsyncSession, name: str) -> int:
+        """Gets a counter's value by summing its shards; unknown counters are 0."""
+        return (await self.get_many(session, [name]))[name]
+
+    async def get_many(
+        self, session: AsyncSession, names: Iterable[str]
+    ) -> Dict[str, int]:
+        """Gets several counters with one query. Unknown counters are 0."""
+        counts = dict.fromkeys(names, 0)
+        query = (
+            select(EntityCounter.name, func.sum(EntityCounter.value))
+            .where(col(EntityCounter.name).in_(counts))
+            .group_by(col(EntityCounter.name))
+        )
+        result = await session.execute(query)
+        counts.update({name: int(value) for name, value in result.all()})
+        return counts
+
+    async def reconcile(self, session: AsyncSession) -> Optional[Dict[str, int]]:
+        """
+        Recomputes every counter from the tables and corrects any drift.
+
+        Returns:
+            The corrections applied, by counter name, or None if another
+            reconciliation is already running.
+        """
+        locked = await session.execute(
+            select(func.pg_try_advisory_xact_lock(_RECONCILE_LOCK_ID))
+        )
+        if not locked.scalar_one():
+            return None
+        result = await session.execute(text(_RECONCILE_SQL))
+        drift = {name: int(delta) for name, delta in result.all()}
+        # Shards that net to zero carry no information; drop them
+        await session.execute(text("DELETE FROM entity_counters WHERE value = 0"))
+        return drift
+
+
+counter_repo = CounterRepository()
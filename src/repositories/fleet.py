@@ -0,0 +1,66 @@
+from typing import List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, literal, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col, select
+
+from src.core.metrics import instrument_repository
+from src.models.fleet import FLEET_SUMMARY_VIEW, FleetSummary
+
+FleetKeyset = Tuple[str, UUID]
+
+# Held while refreshing so that workers do not queue up behind each other's
+# refresh of the same view.
+_REFRESH_LOCK_ID = 0x746D73666C74  # "tmsflt"
+
+
+@instrument_repository("fleet")
+class FleetSummaryRepository:
+    """
+    Reads the precomputed per-vendor fleet aggregates, which are refreshed
+    periodically rather than on every vehicle write.
+    """
+
+    async def get_page(
+        self,
+        session: AsyncSession,
+        *,
+        vendor_ids: Sequence[UUID] = (),
+        limit: int = 100,
+        after: Optional[FleetKeyset] = None,
+    ) -> List[FleetSummary]:
+        """
+        Get vendor fleet summaries ordered by (company_name, vendor_id), after
+        the given keyset position, optionally only for the given vendors.
+        """
+        query = select(FleetSummary).order_by(
+            col(FleetSummary.company_name), col(FleetSummary.vendor_id)
+        )
+        if vendor_ids:
+            query = query.where(col(FleetSummary.vendor_id).in_(vendor_ids))
+        if after is not None:
+            position = tuple_(
+                col(FleetSummary.company_name), col(FleetSummary.vendor_id)
+            )
+            query = query.where(position > tuple_(*map(literal, after)))
+        result = await session.execute(query.limit(limit))
+        return list(result.scalars().all())
+
+    async def refresh(self, session: AsyncSession) -> bool:
+        """
+        Recomputes the summaries without blocking readers.
+        Returns False if another refresh is already in progress.
+        """
+        locked = await session.execute(
+            select(func.pg_try_advisory_xact_lock(_REFRESH_LOCK_ID))
+        )
+        if not locked.scalar_one():
+            return False
+        await session.execute(
+            text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {FLEET_SUMMARY_VIEW}")
+        )
+        return True
+
+
+fleet_summary_repo = FleetSummaryRepository()
@@ -0,0 +1,43 @@
+from typing import Any
+
+from sqlalchemy import ColumnElement, Float, func, or_
+
+_LIKE_ESCAPE = "/"
+
+
+def escape_like(term: str) -> str:
+    """Escapes LIKE wildcards so the term is matched literally."""
+    for char in (_LIKE_ESCAPE, "%", "_"):
+        term = term.replace(char, _LIKE_ESCAPE + char)
+    return term
+
+
+class TrigramSearch:
+    """
+    Substring search over a fixed set of text columns.
+
+    Matching uses `column ILIKE '%term%'`, which PostgreSQL serves from pg_trgm
+    GIN indexes (one per column, combined with a BitmapOr) for terms of three or
+    more characters. Results are ranked by the best `word_similarity` between
+    the term and any of the columns.
+    """
+
+    def __init__(self, *columns: Any):
+        self.columns = columns
+
+    def condition(self, term: str) -> ColumnElement[bool]:
+        """Matches rows where any column contains the term, case-insensitively."""
+        pattern = f"%{escape_like(term)}%"
+        return or_(
+            *(column.ilike(pattern, escape=_LIKE_ESCAPE) for column in self.columns)
+        )
+
+    def score(self, term: str) -> ColumnElement[float]:
+        """Ranks rows by how closely the term matches a word in any column."""
+        return func.greatest(
+            *(
+                func.word_similarity(term, column, type_=Float)
+                for column in self.columns
+            ),
+            type_=Float,
+        )
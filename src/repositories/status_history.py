@@ -0,0 +1,334 @@
+import io
+import re
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import DateTime, TextClause, Uuid, bindparam, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from src.analytics.utilization import read_binary_copy
+from src.core.metrics import instrument_repository
+from src.models.status_history import (
+    STATUS_HISTORY_DEFAULT_PARTITION,
+    STATUS_HISTORY_TABLE,
+)
+from src.schemas.analytics import UtilizationGrouping
+from src.schemas.vehicle import VehicleStatus
+
+# (vehicle or vendor ID, status) -> seconds spent in that status
+TimeInStatus = Dict[Tuple[UUID, str], float]
+
+# Held while partitions are created or dropped, so that two workers never race
+# to create the same month.
+_PARTITION_LOCK_ID = 0x746D73687374  # "tmshst"
+
+_PARTITION_NAME = re.compile(rf"^{STATUS_HISTORY_TABLE}_(\d{{4}})_(\d{{2}})$")
+
+_LIST_PARTITIONS_SQL = f"""
+SELECT c.relname
+FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = '{STATUS_HISTORY_TABLE}'::regclass
+"""
+
+# Status spans per vehicle: its transitions within the range, plus the last
+# transition before it, which gives the status the vehicle was in when the
+# range started. That one row per vehicle is an index probe on (vehicle_id,
+# changed_at), so the query never reads history before `start`. Each vehicle
+# also gets the dense number of its group, for array-based consumers.
+_STATUS_SPANS_CTE = f"""
+WITH scope AS (
+    SELECT id, {{group_key}} AS group_key,
+           CAST(dense_rank() OVER (ORDER BY {{group_key}}) - 1 AS integer)
+               AS group_no
+    FROM vehicle WHERE {{scope}}
+),
+events AS (
+    SELECT s.id AS vehicle_id, s.group_key, s.group_no,
+           opening.to_status AS status,
+           :start AS changed_at, CAST(0 AS bigint) AS seq
+    FROM scope s
+    CROSS JOIN LATERAL (
+        SELECT h.to_status FROM {STATUS_HISTORY_TABLE} h
+        WHERE h.vehicle_id = s.id AND h.changed_at < :start
+        ORDER BY h.changed_at DESC, h.id DESC
+        LIMIT 1
+    ) opening
+    UNION ALL
+    SELECT h.vehicle_id, s.group_key, s.group_no, h.to_status, h.changed_at, h.id
+    FROM {STATUS_HISTORY_TABLE} h JOIN scope s ON s.id = h.vehicle_id
+    WHERE h.changed_at >= :start AND h.changed_at < :end
+),
+spans AS (
+    SELECT group_key, group_no, status, changed_at,
+           coalesce(
+               lead(changed_at) OVER (
+                   PARTITION BY vehicle_id ORDER BY changed_at, seq
+               ),
+               :end
+           ) AS until
+    FROM events
+)
+"""
+
+_TIME_IN_STATUS_SQL = (
+    _STATUS_SPANS_CTE
+    + """
+SELECT group_key, status, sum(extract(epoch FROM until - changed_at)) AS seconds
+FROM spans
+GROUP BY group_key, status
+ORDER BY group_key, status
+"""
+)
+
+_STATUS_NAMES = ", ".join(f"'{status.value}'" for status in VehicleStatus)
+
+# Fixed-width, NOT NULL columns only, for read_binary_copy. Statuses are
+# numbered by their position in VehicleStatus (-1 if unknown) and times are
+# seconds from the start of the range.
+_UTILIZATION_SPANS_SQL = (
+    _STATUS_SPANS_CTE
+    + f"""
+SELECT group_no, group_key,
+       CAST(
+           coalesce(array_position(ARRAY[{_STATUS_NAMES}], CAST(status AS text)), 0)
+           - 1 AS smallint
+       ),
+       CAST(extract(epoch FROM changed_at - :start) AS double precision),
+       CAST(extract(epoch FROM until - :start) AS double precision)
+FROM spans
+WHERE until > changed_at
+"""
+)
+UTILIZATION_SPAN_COLUMNS = [
+    ("group_no", ">i4"),
+    ("group_key", "V16"),
+    ("status", ">i2"),
+    ("start", ">f8"),
+    ("end", ">f8"),
+]
+
+# Stands in for the group key when the whole fleet is one group
+_FLEET_KEY = "CAST('00000000-0000-0000-0000-000000000000' AS uuid)"
+
+
+_GROUP_KEYS = {
+    UtilizationGrouping.FLEET: _FLEET_KEY,
+    UtilizationGrouping.VENDOR: "vendor_id",
+    UtilizationGrouping.VEHICLE: "id",
+}
+
+
+def _status_spans_query(
+    select_sql: str,
+    *,
+    start: datetime,
+    end: datetime,
+    vehicle_id: Optional[UUID],
+    vendor_id: Optional[UUID],
+    grouping: UtilizationGrouping,
+) -> TextClause:
+    conditions = ["TRUE"]
+    params: Dict[str, object] = {"start": start, "end": end}
+    if vehicle_id is not None:
+        conditions.append("id = :vehicle_id")
+        params["vehicle_id"] = vehicle_id
+    if vendor_id is not None:
+        conditions.append("vendor_id = :vendor_id")
+        params["vendor_id"] = vendor_id
+    query = select_sql.format(
+        scope=" AND ".join(conditions), group_key=_GROUP_KEYS[grouping]
+    )
+    return (
+        text(query)
+        .bindparams(
+            bindparam("start", type_=DateTime()),
+            bindparam("end", type_=DateTime()),
+            *(bindparam(name, type_=Uuid()) for name in params if name.endswith("_id")),
+        )
+        .params(params)
+    )
+
+
+def partition_name(month: date) -> str:
+    """Name of the history partition holding the given month."""
+    return f"{STATUS_HISTORY_TABLE}_{month.year:04d}_{month.month:02d}"
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+@instrument_repository("status_history")
+class StatusHistoryRepository:
+    """
+    Answers questions about the vehicle status history that the triggers in
+    src/models/status_history.py record, and manages its monthly partitions.
+    """
+
+    async def get_time_in_status(
+        self,
+        session: AsyncSession,
+        *,
+        start: datetime,
+        end: datetime,
+        vehicle_id: Optional[UUID] = None,
+        vendor_id: Optional[UUID] = None,
+        per_vendor: bool = False,
+    ) -> TimeInStatus:
+        """
+        Sums the time spent in each status within [start, end), per vehicle or,
+        with `per_vendor`, per the vehicles' current vendor.
+
+        Timestamps are naive UTC. Vehicles with no history at or before `end`
+        are left out, as is time before a vehicle's first recorded status.
+        """
+        query = _status_spans_query(
+            _TIME_IN_STATUS_SQL,
+            start=start,
+            end=end,
+            vehicle_id=vehicle_id,
+            vendor_id=vendor_id,
+            grouping=UtilizationGrouping.VENDOR
+            if per_vendor
+            else UtilizationGrouping.VEHICLE,
+        )
+        result = await session.execute(query)
+        return {(key, status): float(seconds) for key, status, seconds in result.all()}
+
+    async def copy_status_spans(
+        self,
+        session: AsyncSession,
+        *,
+        start: datetime,
+        end: datetime,
+        grouping: UtilizationGrouping,
+        vehicle_id: Optional[UUID] = None,
+        vendor_id: Optional[UUID] = None,
+    ) -> np.ndarray:
+        """
+        Bulk-loads every status span within [start, end) as a structured array
+        with UTILIZATION_SPAN_COLUMNS, streamed with binary COPY rather than
+        fetched row by row.
+
+        Args:
+            session: The database session. Requires the asyncpg driver.
+            start: Start of the range, naive UTC.
+            end: End of the range, naive UTC.
+            grouping: What `group_no` and `group_key` number: the whole fleet
+                (one group), vendors or vehicles.
+            vehicle_id: Only this vehicle.
+            vendor_id: Only this vendor's vehicles.
+        """
+        query = _status_spans_query(
+            _UTILIZATION_SPANS_SQL,
+            start=start,
+            end=end,
+            vehicle_id=vehicle_id,
+            vendor_id=vendor_id,
+            grouping=grouping,
+        )
+        connection = await session.connection()
+        compiled = query.compile(dialect=connection.dialect)
+        args = [compiled.params[name] for name in compiled.positiontup or []]
+        raw_connection = await connection.get_raw_connection()
+
+        output = io.BytesIO()
+        await raw_connection.driver_connection.copy_from_query(  # pyright: ignore [reportOptionalMemberAccess]
+            compiled.string, *args, output=output, format="binary"
+        )
+        return read_binary_copy(output.getvalue(), UTILIZATION_SPAN_COLUMNS)
+
+    async def maintain_partitions(
+        self,
+        session: AsyncSession,
+        *,
+        today: date,
+        months_ahead: int,
+        retain_months: int,
+    ) -> Optional[Tuple[List[str], List[str]]]:
+        """
+        Creates the partitions for this month and the next `months_ahead`
+        months, and drops those for months before the `retain_months` months
+        preceding this one, along with the default partition's rows from then.
+
+        Rows already in the default partition for a month being created are
+        moved into the new partition, as PostgreSQL requires.
+
+        Returns:
+            The names of the partitions created and dropped, or None if
+            another worker is already maintaining them.
+        """
+        locked = await session.execute(
+            select(func.pg_try_advisory_xact_lock(_PARTITION_LOCK_ID))
+        )
+        if not locked.scalar_one():
+            return None
+
+        existing = {
+            name for (name,) in (await session.execute(text(_LIST_PARTITIONS_SQL)))
+        }
+        this_month = today.replace(day=1)
+
+        created = []
+        for offset in range(months_ahead + 1):
+            month = _add_months(this_month, offset)
+            name = partition_name(month)
+            if name not in existing:
+                await self._create_partition(session, name, month)
+                created.append(name)
+
+        cutoff = _add_months(this_month, -retain_months)
+        dropped = []
+        for name in sorted(existing):
+            match = _PARTITION_NAME.match(name)
+            if match and date(int(match[1]), int(match[2]), 1) < cutoff:
+                await session.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+        await session.execute(
+            text(
+                f"DELETE FROM {STATUS_HISTORY_DEFAULT_PARTITION} "
+                "WHERE changed_at < :cutoff"
+            ),
+            {"cutoff": cutoff},
+        )
+        return created, dropped
+
+    async def _create_partition(
+        self, session: AsyncSession, name: str, month: date
+    ) -> None:
+        bounds = {"lower": month, "upper": _add_months(month, 1)}
+        await session.execute(
+            text(
+                "CREATE TEMP TABLE status_history_moved "
+                f"(LIKE {STATUS_HISTORY_TABLE}) ON COMMIT DROP"
+            )
+        )
+        await session.execute(
+            text(
+                "WITH moved AS ("
+                f"DELETE FROM {STATUS_HISTORY_DEFAULT_PARTITION} "
+                "WHERE changed_at >= :lower AND changed_at < :upper RETURNING *"
+                ") INSERT INTO status_history_moved SELECT * FROM moved"
+            ),
+            bounds,
+        )
+        # Bounds of a partition must be literals, not parameters
+        await session.execute(
+            text(
+                f"CREATE TABLE {name} PARTITION OF {STATUS_HISTORY_TABLE} "
+                f"FOR VALUES FROM ('{bounds['lower']}') TO ('{bounds['upper']}')"
+            )
+        )
+        await session.execute(
+            text(
+                f"INSERT INTO {STATUS_HISTORY_TABLE} SELECT * FROM status_history_moved"
+            )
+        )
+        await session.execute(text("DROP TABLE status_history_moved"))
+
+
+status_history_repo = StatusHistoryRepository()
@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import Any, List, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, literal, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+SyncKeyset = Tuple[datetime, UUID]
+
+# The start of the oldest transaction in this database still open with a
+# transaction ID, or now. Only those can still commit rows stamped before now
+# (see src/models/timestamps.py), so rows stamped before it can no longer
+# change or appear. Transactions that have only read, such as streaming exports
+# or sessions idle in transaction, hold nothing back. Backends of other roles
+# report no xact_start unless the application role is a member of
+# pg_read_all_stats.
+_HORIZON_SQL = """
+SELECT least(min(xact_start), statement_timestamp()) AT TIME ZONE 'UTC'
+FROM pg_stat_activity
+WHERE datname = current_database()
+  AND pid <> pg_backend_pid()
+  AND backend_xid IS NOT NULL
+"""
+
+
+class DeltaSync:
+    """
+    Reads the rows of a table changed after an (updated_at, id) position,
+    oldest change first, soft-deleted rows included, for clients that keep a
+    local copy up to date.
+
+    A transaction that commits late can add rows stamped behind those already
+    handed out. Pages therefore stop short of the start of the oldest open
+    transaction that has written, and a position taken from a returned page
+    never skips a row.
+
+    That transaction also holds back every later change: while one writer
+    stays open (a long import, or a session idle in transaction after a
+    write), pages come back empty up to its start, and clients catch up once
+    it ends. Bound this with idle_in_transaction_session_timeout on the
+    application role.
+
+    The horizon must be read on the primary: replicas neither show the
+    primary's transactions nor have necessarily replayed its commits.
+    """
+
+    def __init__(self, model: Any):
+        self.model = model
+
+    def query(self, *, after: SyncKeyset, horizon: datetime, limit: int) -> Select:
+        """Rows changed after `after` and before `horizon`, in sync order."""
+        return (
+            select(self.model)
+            .where(
+                tuple_(self.model.updated_at, self.model.id)
+                > tuple_(*map(literal, after)),
+                self.model.updated_at < horizon,
+            )
+            .order_by(self.model.updated_at, self.model.id)
+            .limit(limit)
+        )
+
+    async def changed_since(
+        self, session: AsyncSession, *, after: SyncKeyset, limit: int
+    ) -> List[Any]:
+        # A separate, earlier statement: anything it saw closed has committed
+        # before the page's snapshot is taken
+        horizon = (await session.execute(text(_HORIZON_SQL))).scalar_one()
+        query = self.query(after=after, horizon=horizon, limit=limit)
+        result = await session.execute(query)
+        return list(result.scalars().all())
@@ -0,0 +1,28 @@
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col, select
+
+from src.core.metrics import instrument_repository
+from src.models.table_version import TableVersion
+
+
+@instrument_repository("table_version")
+class TableVersionRepository:
+    """
+    Reads the change counters that triggers bump on every write to the
+    versioned tables (see src/models/table_version.py).
+    """
+
+    async def get(self, session: AsyncSession, table: str) -> int:
+        """
+        Gets a table's current version; 0 if it was never written. Read it
+        before the rows it describes, so that it is never newer than them.
+        """
+        query = select(func.coalesce(func.sum(TableVersion.version), 0)).where(
+            col(TableVersion.table_name) == table
+        )
+        result = await session.execute(query)
+        return int(result.scalar_one())
+
+
+table_version_repo = TableVersionRepository()
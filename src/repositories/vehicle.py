@@ -1,19 +1,215 @@
-from typing import List, Optional
-from uuid import UUID
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
 
-from sqlalchemy import or_
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Select,
+    String,
+    Uuid,
+    and_,
+    cast,
+    column,
+    insert,
+    literal,
+    not_,
+    or_,
+    text,
+    tuple_,
+    update,
+    values,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import col, select
 
+from src.core.db import get_naive_utc_now
+from src.core.metrics import instrument_repository
 from src.models.vehicle import Vehicle
-from src.schemas.vehicle import VehicleCreate, VehicleUpdate
+from src.repositories.counter import (
+    ACTIVE_VEHICLES,
+    counter_repo,
+    vehicle_status_counter,
+    vendor_vehicles_counter,
+)
+from src.repositories.search import TrigramSearch
+from src.repositories.sync import DeltaSync, SyncKeyset
+from src.repositories.table_version import table_version_repo
+from src.schemas.vehicle import (
+    VehicleCreate,
+    VehicleStatus,
+    VehicleStatusChange,
+    VehicleUpdate,
+)
 
+Keyset = Tuple[datetime, UUID]
+SearchKeyset = Tuple[float, UUID]
+CapacityKeyset = Tuple[float, UUID]
 
+# Served by the pg_trgm GIN indexes on these columns
+_trigram_search = TrigramSearch(
+    col(Vehicle.registration_number), col(Vehicle.make), col(Vehicle.model)
+)
+
+# Served by ix_vehicle_updated_at_id
+_delta_sync = DeltaSync(Vehicle)
+
+# Constraint names reported by PostgreSQL when a write violates them
+REGISTRATION_NUMBER_CONSTRAINT = "ix_vehicle_registration_number"
+VENDOR_FOREIGN_KEY = "vehicle_vendor_id_fkey"
+
+# Reasons reported by `bulk_create` for rows that were not inserted
+IMPORT_VENDOR_NOT_FOUND = "vendor_not_found"
+IMPORT_REGISTRATION_EXISTS = "registration_exists"
+
+_IMPORT_STAGING_TABLE = "vehicle_import_staging"
+_IMPORT_COLUMNS = [
+    "row_no",
+    "id",
+    "vendor_id",
+    "registration_number",
+    "make",
+    "model",
+    "capacity",
+    "status",
+    "is_active",
+    "created_at",
+    "updated_at",
+]
+
+# Set-based merge of the staging table into vehicle. Rows whose vendor does not
+# exist are skipped, repeated registrations within the batch keep only their
+# first occurrence, and registrations that already exist are left to ON CONFLICT.
+# Every staged row that was not inserted is returned with the reason.
+_IMPORT_MERGE_SQL = f"""
+WITH checked AS (
+    SELECT s.*, EXISTS (SELECT 1 FROM vendor v WHERE v.id = s.vendor_id) AS vendor_exists
+    FROM {_IMPORT_STAGING_TABLE} s
+),
+ranked AS (
+    SELECT c.*, row_number() OVER (
+        PARTITION BY c.registration_number, c.vendor_exists ORDER BY c.row_no
+    ) AS occurrence
+    FROM checked c
+),
+inserted AS (
+    INSERT INTO vehicle ({", ".join(_IMPORT_COLUMNS[1:])})
+    SELECT {", ".join(_IMPORT_COLUMNS[1:])}
+    FROM ranked
+    WHERE vendor_exists AND occurrence = 1
+    ORDER BY row_no
+    ON CONFLICT (registration_number) DO NOTHING
+    RETURNING id
+)
+SELECT r.row_no,
+       CASE WHEN r.vendor_exists THEN '{IMPORT_REGISTRATION_EXISTS}'
+            ELSE '{IMPORT_VENDOR_NOT_FOUND}' END AS reason
+FROM ranked r
+WHERE NOT EXISTS (SELECT 1 FROM inserted i WHERE i.id = r.id)
+"""
+
+
+@instrument_repository("vehicle")
 class VehicleRepository:
     """
     A self-contained repository for all vehicle-related database operations.
     """
 
+    @staticmethod
+    def _paginate(
+        query: Select, *, skip: int, limit: int, after: Optional[Keyset]
+    ) -> Select:
+        """
+        Orders by (created_at, id) and applies either keyset or offset pagination.
+        A keyset position takes precedence over `skip`.
+        """
+        query = query.order_by(col(Vehicle.created_at), col(Vehicle.id))
+        if after is not None:
+            position = tuple_(col(Vehicle.created_at), col(Vehicle.id))
+            query = query.where(position > tuple_(*map(literal, after)))
+        else:
+            query = query.offset(skip)
+        return query.limit(limit)
+
+    @classmethod
+    def _list_query(
+        cls,
+        *,
+        vendor_id: Optional[UUID] = None,
+        skip: int,
+        limit: int,
+        after: Optional[Keyset],
+    ) -> Select:
+        """
+        Active vehicles, optionally of one vendor, in (created_at, id) order.
+        The bare `is_active` filter matches the predicate of the partial indexes
+        on (created_at, id) and (vendor_id, created_at, id), which also provide
+        the order, so a page is read straight from the index without a sort.
+        """
+        query = select(Vehicle).where(col(Vehicle.is_active))
+        if vendor_id is not None:
+            query = query.where(col(Vehicle.vendor_id) == vendor_id)
+        return cls._paginate(query, skip=skip, limit=limit, after=after)
+
+    @staticmethod
+    def _capacity_query(
+        *,
+        statuses: Sequence[str] = (),
+        min_capacity: Optional[float] = None,
+        max_capacity: Optional[float] = None,
+        vendor_id: Optional[UUID] = None,
+        make: Optional[str] = None,
+        is_active: bool = True,
+        descending: bool = False,
+        limit: int,
+        after: Optional[CapacityKeyset],
+    ) -> Select:
+        """
+        Vehicles matching every given filter, in (capacity, id) order.
+
+        For active vehicles of a single status this is a range scan of the
+        partial index on (status, capacity, id), which also yields the order;
+        without a status filter, the partial index on (capacity, id) is used.
+        """
+        # Rendered without a bound parameter so that the predicate still matches
+        # the partial indexes when PostgreSQL switches to a generic plan.
+        active = col(Vehicle.is_active)
+        query = select(Vehicle).where(active if is_active else not_(active))
+        if len(statuses) == 1:
+            query = query.where(col(Vehicle.status) == statuses[0])
+        elif statuses:
+            query = query.where(col(Vehicle.status).in_(statuses))
+        if min_capacity is not None:
+            query = query.where(col(Vehicle.capacity) >= min_capacity)
+        if max_capacity is not None:
+            query = query.where(col(Vehicle.capacity) <= max_capacity)
+        if vendor_id is not None:
+            query = query.where(col(Vehicle.vendor_id) == vendor_id)
+        if make is not None:
+            query = query.where(col(Vehicle.make) == make)
+
+        position = tuple_(col(Vehicle.capacity), col(Vehicle.id))
+        if descending:
+            query = query.order_by(col(Vehicle.capacity).desc(), col(Vehicle.id).desc())
+            if after is not None:
+                query = query.where(position < tuple_(*map(literal, after)))
+        else:
+            query = query.order_by(col(Vehicle.capacity), col(Vehicle.id))
+            if after is not None:
+                query = query.where(position > tuple_(*map(literal, after)))
+        return query.limit(limit)
+
+    @staticmethod
+    def _search_condition(term: str) -> ColumnElement[bool]:
+        """Matches vehicles whose make, model, status, or registration contains term."""
+        condition = _trigram_search.condition(term)
+        # Status has a handful of known values, so resolve the substring match
+        # here and compare by equality instead of scanning the column.
+        statuses = [s.value for s in VehicleStatus if term.lower() in s.value.lower()]
+        if statuses:
+            condition = or_(condition, col(Vehicle.status).in_(statuses))
+        return condition
+
     async def get(self, session: AsyncSession, obj_id: UUID) -> Optional[Vehicle]:
         """Get a single active vehicle by ID."""
         query = select(Vehicle).where(Vehicle.id == obj_id, Vehicle.is_active)
@@ -21,38 +217,214 @@ class VehicleRepository:
         return result.scalars().first()
 
     async def get_multi(
-        self, session: AsyncSession, *, skip: int = 0, limit: int = 100
+        self,
+        session: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Keyset] = None,
     ) -> List[Vehicle]:
-        """Get multiple active vehicles with pagination."""
-        query = select(Vehicle).where(Vehicle.is_active).offset(skip).limit(limit)
+        """Get multiple active vehicles with offset or keyset pagination."""
+        query = self._list_query(skip=skip, limit=limit, after=after)
         result = await session.execute(query)
         return list(result.scalars().all())
 
+    async def get_version(self, session: AsyncSession) -> int:
+        """Get the vehicle table's change counter, behind the list ETags."""
+        return await table_version_repo.get(session, "vehicle")
+
+    async def get_changed(
+        self, session: AsyncSession, *, after: SyncKeyset, limit: int = 100
+    ) -> List[Vehicle]:
+        """
+        Get vehicles, soft-deleted ones included, changed after the given
+        (updated_at, id) position, oldest change first. Needs a primary session.
+        """
+        return await _delta_sync.changed_since(session, after=after, limit=limit)
+
     async def create(self, session: AsyncSession, *, obj_in: VehicleCreate) -> Vehicle:
-        """Create a new vehicle."""
-        db_obj = Vehicle.model_validate(obj_in)
-        session.add(db_obj)
-        await session.flush()
-        await session.refresh(db_obj)
-        return db_obj
+        """
+        Create a new vehicle with a single INSERT ... RETURNING.
+        Constraint violations surface as IntegrityError for the caller to map.
+        """
+        values = Vehicle.model_validate(obj_in).model_dump()
+        query = insert(Vehicle).values(**values).returning(Vehicle)
+        result = await session.execute(query)
+        return result.scalar_one()
 
     async def update(
-        self, session: AsyncSession, *, db_obj: Vehicle, obj_in: VehicleUpdate
-    ) -> Vehicle:
-        """Update an existing vehicle."""
+        self,
+        session: AsyncSession,
+        *,
+        obj_id: UUID,
+        obj_in: VehicleUpdate,
+        expected_updated_at: Optional[Sequence[datetime]] = None,
+    ) -> Optional[Vehicle]:
+        """
+        Update an active vehicle with a single UPDATE ... RETURNING.
+        Returns None if no active vehicle has the given ID or, when
+        `expected_updated_at` is given, if its updated_at is not one of those.
+        """
         update_data = obj_in.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_obj, field, value)
-        session.add(db_obj)
-        await session.flush()
-        await session.refresh(db_obj)
-        return db_obj
+        if not update_data:
+            current = await self.get(session, obj_id)
+            if (
+                current is not None
+                and expected_updated_at is not None
+                and current.updated_at not in expected_updated_at
+            ):
+                return None
+            return current
+
+        query = (
+            update(Vehicle)
+            .where(col(Vehicle.id) == obj_id, col(Vehicle.is_active))
+            .values(**update_data)
+            .returning(Vehicle)
+            .execution_options(populate_existing=True)
+        )
+        if expected_updated_at is not None:
+            query = query.where(col(Vehicle.updated_at).in_(expected_updated_at))
+        result = await session.execute(query)
+        return result.scalars().first()
+
+    async def bulk_create(
+        self, session: AsyncSession, *, rows: Sequence[Tuple[int, VehicleCreate]]
+    ) -> Dict[int, str]:
+        """
+        Insert many vehicles by COPYing them into a temporary staging table and
+        merging it into vehicle with one set-based statement.
+
+        Args:
+            session: The database session. Requires the asyncpg driver.
+            rows: Pairs of (row number, validated vehicle data).
+
+        Returns:
+            A mapping of row number to rejection reason for rows not inserted.
+        """
+        if not rows:
+            return {}
+
+        await session.execute(
+            text(
+                f"CREATE TEMP TABLE IF NOT EXISTS {_IMPORT_STAGING_TABLE} "
+                "(row_no integer NOT NULL, LIKE vehicle) ON COMMIT DROP"
+            )
+        )
+        await session.execute(text(f"TRUNCATE {_IMPORT_STAGING_TABLE}"))
+
+        now = get_naive_utc_now()
+        records = [
+            (
+                row_no,
+                uuid4(),
+                obj_in.vendor_id,
+                obj_in.registration_number,
+                obj_in.make,
+                obj_in.model,
+                obj_in.capacity,
+                obj_in.status.value,
+                obj_in.is_active,
+                now,
+                now,
+            )
+            for row_no, obj_in in rows
+        ]
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(  # pyright: ignore [reportOptionalMemberAccess]
+            _IMPORT_STAGING_TABLE, records=records, columns=_IMPORT_COLUMNS
+        )
+
+        result = await session.execute(text(_IMPORT_MERGE_SQL))
+        return {row_no: reason for row_no, reason in result.all()}
+
+    async def bulk_update_status(
+        self,
+        session: AsyncSession,
+        *,
+        changes: Sequence[Tuple[int, VehicleStatusChange]],
+    ) -> Dict[int, UUID]:
+        """
+        Apply many status changes with one UPDATE ... FROM (VALUES ...),
+        matching each change to an active vehicle by ID or registration number.
+
+        Args:
+            session: The database session.
+            changes: Pairs of (item number, validated change). A vehicle should
+                appear at most once, whether by ID or by registration number;
+                if it is referenced twice, only one of the changes is applied
+                and the other is reported as unmatched.
+
+        Returns:
+            A mapping of item number to vehicle ID for the changes applied.
+            Items missing from it matched no active vehicle.
+        """
+        if not changes:
+            return {}
+
+        batch = values(
+            column("item", Integer),
+            column("vehicle_id", Uuid),
+            column("registration_number", String),
+            column("status", String),
+            name="batch",
+        ).data(
+            [
+                (
+                    item,
+                    change.vehicle_id,
+                    change.registration_number,
+                    change.status.value,
+                )
+                for item, change in changes
+            ]
+        )
+        query = (
+            update(Vehicle)
+            .where(
+                col(Vehicle.is_active),
+                or_(
+                    # A column of only NULLs would otherwise be typed as text
+                    col(Vehicle.id) == cast(batch.c.vehicle_id, Uuid),
+                    col(Vehicle.registration_number) == batch.c.registration_number,
+                ),
+            )
+            .values(status=batch.c.status)
+            .returning(batch.c.item, col(Vehicle.id))
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(query)
+        return {item: vehicle_id for item, vehicle_id in result.all()}
 
     async def delete(self, session: AsyncSession, *, db_obj: Vehicle) -> None:
         """Delete a vehicle permanently."""
         await session.delete(db_obj)
         await session.flush()
 
+    async def get_active_counts(
+        self, session: AsyncSession
+    ) -> Tuple[int, Dict[VehicleStatus, int]]:
+        """
+        Gets the number of active vehicles, in total and per status, from the
+        trigger-maintained counters.
+        """
+        names = {
+            status: vehicle_status_counter(status.value) for status in VehicleStatus
+        }
+        counts = await counter_repo.get_many(
+            session, [ACTIVE_VEHICLES, *names.values()]
+        )
+        return counts[ACTIVE_VEHICLES], {
+            status: counts[name] for status, name in names.items()
+        }
+
+    async def count_by_vendor_id(
+        self, session: AsyncSession, *, vendor_id: UUID
+    ) -> int:
+        """Gets the number of a vendor's active vehicles from its counter."""
+        return await counter_repo.get(session, vendor_vehicles_counter(vendor_id))
+
     async def find_by_registration_number(
         self, session: AsyncSession, *, registration_number: str
     ) -> Optional[Vehicle]:
@@ -67,40 +439,170 @@ class VehicleRepository:
         result = await session.execute(query)
         return result.scalars().first()
 
+    async def find_ids_by_registration_numbers(
+        self, session: AsyncSession, *, registration_numbers: Sequence[str]
+    ) -> Dict[str, UUID]:
+        """
+        Map registration numbers to the IDs of the active vehicles bearing
+        them. Numbers of no active vehicle are left out.
+        """
+        if not registration_numbers:
+            return {}
+        query = select(col(Vehicle.registration_number), col(Vehicle.id)).where(
+            col(Vehicle.is_active),
+            col(Vehicle.registration_number).in_(registration_numbers),
+        )
+        result = await session.execute(query)
+        return {registration: vehicle_id for registration, vehicle_id in result.all()}
+
     async def find_by_vendor_id(
-        self, session: AsyncSession, *, vendor_id: UUID, skip: int = 0, limit: int = 100
+        self,
+        session: AsyncSession,
+        *,
+        vendor_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Keyset] = None,
     ) -> List[Vehicle]:
         """Find all active vehicles belonging to a specific vendor."""
-        query = (
-            select(Vehicle)
-            .where(Vehicle.vendor_id == vendor_id, Vehicle.is_active)
-            .offset(skip)
-            .limit(limit)
+        query = self._list_query(
+            vendor_id=vendor_id, skip=skip, limit=limit, after=after
         )
         result = await session.execute(query)
         return list(result.scalars().all())
 
-    async def search(
-        self, session: AsyncSession, *, term: str, skip: int, limit: int
+    async def find_by_capacity(
+        self,
+        session: AsyncSession,
+        *,
+        statuses: Sequence[str] = (),
+        min_capacity: Optional[float] = None,
+        max_capacity: Optional[float] = None,
+        vendor_id: Optional[UUID] = None,
+        make: Optional[str] = None,
+        is_active: bool = True,
+        descending: bool = False,
+        limit: int = 100,
+        after: Optional[CapacityKeyset] = None,
     ) -> List[Vehicle]:
-        """Search for vehicles by make, model, status, or registration number."""
-        search_pattern = f"%{term}%"
-        query = (
-            select(Vehicle)
-            .where(
-                Vehicle.is_active,
-                or_(
-                    col(Vehicle.registration_number).ilike(search_pattern),
-                    col(Vehicle.make).ilike(search_pattern),
-                    col(Vehicle.model).ilike(search_pattern),
-                    col(Vehicle.status).ilike(search_pattern),
-                ),
-            )
-            .offset(skip)
-            .limit(limit)
+        """
+        Find vehicles by status, capacity range, vendor and make, ordered by
+        capacity. A keyset position (`after`, as (capacity, id)) continues
+        from a previous page.
+        """
+        query = self._capacity_query(
+            statuses=statuses,
+            min_capacity=min_capacity,
+            max_capacity=max_capacity,
+            vendor_id=vendor_id,
+            make=make,
+            is_active=is_active,
+            descending=descending,
+            limit=limit,
+            after=after,
         )
         result = await session.execute(query)
         return list(result.scalars().all())
 
+    async def claim(
+        self,
+        session: AsyncSession,
+        *,
+        count: int,
+        min_capacity: Optional[float] = None,
+        max_capacity: Optional[float] = None,
+        vendor_id: Optional[UUID] = None,
+        make: Optional[str] = None,
+    ) -> List[Vehicle]:
+        """
+        Atomically moves up to `count` matching idle vehicles to In Transit,
+        smallest sufficient capacity first, and returns them.
+
+        Candidates are locked with FOR UPDATE SKIP LOCKED, so concurrent
+        claimers pass over each other's rows instead of waiting for them or
+        claiming them twice. Fewer than `count` vehicles are returned when not
+        enough are idle and unlocked.
+        """
+        claimable = (
+            self._capacity_query(
+                statuses=[VehicleStatus.IDLE.value],
+                min_capacity=min_capacity,
+                max_capacity=max_capacity,
+                vendor_id=vendor_id,
+                make=make,
+                limit=count,
+                after=None,
+            )
+            .with_only_columns(col(Vehicle.id))
+            .with_for_update(skip_locked=True)
+            .cte("claimable")
+        )
+        query = (
+            update(Vehicle)
+            .where(col(Vehicle.id) == claimable.c.id)
+            .values(status=VehicleStatus.IN_TRANSIT.value)
+            .returning(Vehicle)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
+        result = await session.execute(query)
+        return sorted(result.scalars().all(), key=lambda v: (v.capacity, v.id))
+
+    async def search(
+        self,
+        session: AsyncSession,
+        *,
+        term: str,
+        skip: int,
+        limit: int,
+        after: Optional[SearchKeyset] = None,
+    ) -> List[Tuple[Vehicle, float]]:
+        """
+        Search active vehicles by make, model, status, or registration number.
+        Returns (vehicle, score) pairs, best matches first. A keyset position
+        (`after`, as (score, id)) takes precedence over `skip`.
+        """
+        score = _trigram_search.score(term)
+        query = (
+            select(Vehicle, score.label("score"))
+            .where(Vehicle.is_active, self._search_condition(term))
+            .order_by(score.desc(), col(Vehicle.id))
+        )
+        if after is not None:
+            after_score, after_id = after
+            query = query.where(
+                or_(
+                    score < after_score,
+                    and_(score == after_score, col(Vehicle.id) > after_id),
+                )
+            )
+        else:
+            query = query.offset(skip)
+        result = await session.execute(query.limit(limit))
+        return [(vehicle, vehicle_score) for vehicle, vehicle_score in result.all()]
+
+    async def stream(
+        self,
+        session: AsyncSession,
+        *,
+        vendor_id: Optional[UUID] = None,
+        term: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream active vehicles as plain row dictionaries through a server-side
+        cursor, fetching `batch_size` rows at a time. Rows bypass the ORM so
+        memory use does not grow with the size of the result.
+        """
+        query = select(Vehicle.__table__).where(Vehicle.is_active)  # pyright: ignore [reportAttributeAccessIssue]
+        if vendor_id is not None:
+            query = query.where(Vehicle.vendor_id == vendor_id)
+        if term:
+            query = query.where(self._search_condition(term))
+        query = query.order_by(col(Vehicle.created_at), col(Vehicle.id))
+
+        result = await session.stream(query.execution_options(yield_per=batch_size))
+        async for row in result.mappings():
+            yield dict(row)
+
 
 vehicle_repo = VehicleRepository()
@@ -1,50 +1,206 @@
-from typing import List, Optional
+import asyncio
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from uuid import UUID
 
-from sqlalchemy import func, or_
+from sqlalchemy import ColumnElement, insert, literal, or_, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import col, select
 
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.core.db import replica_set
+from src.core.metrics import instrument_repository
+from src.core.notifications import notify
 from src.models.vendor import Vendor
+from src.repositories.counter import ACTIVE_VENDORS, counter_repo
+from src.repositories.search import TrigramSearch
+from src.repositories.sync import DeltaSync, SyncKeyset
+from src.repositories.table_version import table_version_repo
 from src.schemas.vendor import VendorCreate, VendorUpdate
 
+# Constraint names reported by PostgreSQL when a write violates them
+EMAIL_CONSTRAINT = "ix_vendor_email"
+PHONE_NUMBER_CONSTRAINT = "ix_vendor_phone_number"
 
+# NOTIFY channel carrying the ID of a vendor that was updated or deleted
+VENDOR_CHANGED_CHANNEL = "vendor_changed"
+
+# Vendor rows keyed by ("id", id), ("email", email) and ("phone", phone)
+vendor_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    max_size=settings.VENDOR_CACHE_SIZE, ttl=settings.VENDOR_CACHE_TTL
+)
+
+
+# Served by the pg_trgm GIN indexes on these columns
+_trigram_search = TrigramSearch(
+    col(Vendor.company_name), col(Vendor.contact_person), col(Vendor.email)
+)
+
+# Served by ix_vendor_updated_at_id
+_delta_sync = DeltaSync(Vendor)
+
+
+@instrument_repository("vendor")
 class VendorRepository:
     """
     A self-contained repository for all vendor-related database operations.
     """
 
+    @staticmethod
+    def _search_condition(term: str) -> ColumnElement[bool]:
+        """Matches vendors whose company, contact, or email contains term."""
+        return _trigram_search.condition(term)
+
     async def get(self, session: AsyncSession, obj_id: UUID) -> Optional[Vendor]:
         """Get a single vendor by ID."""
         return await session.get(Vendor, obj_id)
 
+    async def get_cached(self, session: AsyncSession, obj_id: UUID) -> Optional[Vendor]:
+        """
+        Get a vendor by ID through the per-worker cache.
+        The result is a detached copy; use `get` when the vendor will be modified.
+        """
+        return await self._cached_lookup(
+            ("id", obj_id), lambda: self.get(session, obj_id)
+        )
+
+    def invalidate_cached(self, vendor_id: UUID) -> None:
+        """Drop every cached entry for a vendor in this worker."""
+        vendor_cache.discard_where(lambda row: row["id"] == vendor_id)
+
+    async def publish_change(self, session: AsyncSession, *, vendor_id: UUID) -> None:
+        """
+        Invalidate a changed vendor locally and tell every worker to do the same
+        once the current transaction commits.
+        """
+        self.invalidate_cached(vendor_id)
+        await notify(session, VENDOR_CHANGED_CHANNEL, str(vendor_id))
+
+    def handle_change_notification(self, payload: str) -> None:
+        """Listener callback for VENDOR_CHANGED_CHANNEL."""
+        vendor_id = UUID(payload)
+        self.invalidate_cached(vendor_id)
+        if replica_set:
+            # A replica read may re-cache the old row until the replica has
+            # replayed the change, so invalidate again once it must have.
+            asyncio.get_running_loop().call_later(
+                settings.REPLICA_MAX_LAG_SECONDS
+                + settings.REPLICA_HEALTH_CHECK_INTERVAL,
+                self.invalidate_cached,
+                vendor_id,
+            )
+
+    async def _cached_lookup(
+        self, key: Tuple[str, Any], load: Callable[[], Awaitable[Optional[Vendor]]]
+    ) -> Optional[Vendor]:
+        """
+        Private helper that serves a lookup from the cache or runs `load`.
+        Only found vendors are cached, under all three lookup keys.
+        """
+        row = vendor_cache.get(key)
+        if row is not None:
+            return Vendor(**row)
+
+        vendor = await load()
+        if vendor is not None:
+            row = vendor.model_dump()
+            vendor_cache.set(("id", vendor.id), row)
+            vendor_cache.set(("email", vendor.email), row)
+            if vendor.phone_number:
+                vendor_cache.set(("phone", vendor.phone_number), row)
+        return vendor
+
     async def get_multi(
-        self, session: AsyncSession, *, skip: int = 0, limit: int = 100
+        self,
+        session: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
     ) -> List[Vendor]:
-        """Get multiple vendors with pagination."""
-        query = select(Vendor).offset(skip).limit(limit)
+        """
+        Get multiple vendors ordered by (created_at, id).
+        A keyset position (`after`) takes precedence over `skip`.
+        """
+        query = select(Vendor).order_by(col(Vendor.created_at), col(Vendor.id))
+        if after is not None:
+            position = tuple_(col(Vendor.created_at), col(Vendor.id))
+            query = query.where(position > tuple_(*map(literal, after)))
+        else:
+            query = query.offset(skip)
+        query = query.limit(limit)
         result = await session.execute(query)
         return list(result.scalars().all())
 
+    async def get_version(self, session: AsyncSession) -> int:
+        """Get the vendor table's change counter, behind the list ETags."""
+        return await table_version_repo.get(session, "vendor")
+
+    async def get_changed(
+        self, session: AsyncSession, *, after: SyncKeyset, limit: int = 100
+    ) -> List[Vendor]:
+        """
+        Get vendors, inactive ones included, changed after the given
+        (updated_at, id) position, oldest change first. Needs a primary session.
+        """
+        return await _delta_sync.changed_since(session, after=after, limit=limit)
+
     async def create(self, session: AsyncSession, *, obj_in: VendorCreate) -> Vendor:
-        """Create a new vendor."""
-        db_obj = Vendor.model_validate(obj_in)
-        session.add(db_obj)
-        await session.flush()
-        await session.refresh(db_obj)
-        return db_obj
+        """
+        Create a new vendor with a single INSERT ... RETURNING.
+        Constraint violations surface as IntegrityError for the caller to map.
+        """
+        values = Vendor.model_validate(obj_in).model_dump()
+        query = insert(Vendor).values(**values).returning(Vendor)
+        result = await session.execute(query)
+        return result.scalar_one()
 
     async def update(
-        self, session: AsyncSession, *, db_obj: Vendor, obj_in: VendorUpdate
-    ) -> Vendor:
-        """Update an existing vendor."""
+        self,
+        session: AsyncSession,
+        *,
+        obj_id: UUID,
+        obj_in: VendorUpdate,
+        expected_updated_at: Optional[Sequence[datetime]] = None,
+    ) -> Optional[Vendor]:
+        """
+        Update a vendor with a single UPDATE ... RETURNING.
+        Returns None if no vendor has the given ID or, when
+        `expected_updated_at` is given, if its updated_at is not one of those.
+        """
         update_data = obj_in.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_obj, field, value)
-        session.add(db_obj)
-        await session.flush()
-        await session.refresh(db_obj)
-        return db_obj
+        if not update_data:
+            current = await self.get(session, obj_id)
+            if (
+                current is not None
+                and expected_updated_at is not None
+                and current.updated_at not in expected_updated_at
+            ):
+                return None
+            return current
+
+        query = (
+            update(Vendor)
+            .where(col(Vendor.id) == obj_id)
+            .values(**update_data)
+            .returning(Vendor)
+            .execution_options(populate_existing=True)
+        )
+        if expected_updated_at is not None:
+            query = query.where(col(Vendor.updated_at).in_(expected_updated_at))
+        result = await session.execute(query)
+        return result.scalars().first()
 
     async def delete(self, session: AsyncSession, *, db_obj: Vendor) -> None:
         """Delete a vendor."""
@@ -54,14 +210,18 @@ class VendorRepository:
     async def find_by_email(
         self, session: AsyncSession, *, email: str
     ) -> Optional[Vendor]:
-        """Find a vendor by email."""
-        return await self._find_by_unique_fields(session, email=email)
+        """Find a vendor by email, through the per-worker cache."""
+        return await self._cached_lookup(
+            ("email", email), lambda: self._find_by_unique_fields(session, email=email)
+        )
 
     async def find_by_phone(
         self, session: AsyncSession, *, phone: str
     ) -> Optional[Vendor]:
-        """Find a vendor by phone number."""
-        return await self._find_by_unique_fields(session, phone=phone)
+        """Find a vendor by phone number, through the per-worker cache."""
+        return await self._cached_lookup(
+            ("phone", phone), lambda: self._find_by_unique_fields(session, phone=phone)
+        )
 
     async def _find_by_unique_fields(
         self,
@@ -85,30 +245,45 @@ class VendorRepository:
         return result.scalars().first()
 
     async def get_active_count(self, session: AsyncSession) -> int:
-        """Gets the count of active vendors."""
-        query = select(func.count(col(Vendor.id))).where(Vendor.is_active)
-        result = await session.execute(query)
-        return result.scalar_one()
+        """Gets the count of active vendors from the trigger-maintained counter."""
+        return await counter_repo.get(session, ACTIVE_VENDORS)
 
     async def search(
         self, session: AsyncSession, *, term: str, skip: int, limit: int
     ) -> List[Vendor]:
-        """Search for vendors by a search term."""
-        search_pattern = f"%{term}%"
+        """
+        Search for vendors by a search term, best matches first. Ties are
+        broken on id so that offset pages are stable.
+        """
         query = (
             select(Vendor)
-            .where(
-                or_(
-                    col(Vendor.company_name).ilike(search_pattern),
-                    col(Vendor.contact_person).ilike(search_pattern),
-                    col(Vendor.email).ilike(search_pattern),
-                )
-            )
+            .where(self._search_condition(term))
+            .order_by(_trigram_search.score(term).desc(), col(Vendor.id))
             .offset(skip)
             .limit(limit)
         )
         result = await session.execute(query)
         return list(result.scalars().all())
 
+    async def stream(
+        self,
+        session: AsyncSession,
+        *,
+        term: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream vendors as plain row dictionaries through a server-side cursor,
+        fetching `batch_size` rows at a time.
+        """
+        query = select(Vendor.__table__)  # pyright: ignore [reportAttributeAccessIssue]
+        if term:
+            query = query.where(self._search_condition(term))
+        query = query.order_by(col(Vendor.created_at), col(Vendor.id))
+
+        result = await session.stream(query.execution_options(yield_per=batch_size))
+        async for row in result.mappings():
+            yield dict(row)
+
 
 vendor_repo = VendorRepository()
@@ -0,0 +1,29 @@
+from datetime import date
+from enum import Enum
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from src.schemas.vehicle import VehicleStatus
+
+
+class UtilizationGrouping(str, Enum):
+    FLEET = "fleet"
+    VENDOR = "vendor"
+    VEHICLE = "vehicle"
+
+
+class DailyUtilization(BaseModel):
+    day: date
+    # Time with a recorded status; the percentages are shares of it
+    observed_seconds: float
+    percent: Dict[VehicleStatus, float]
+
+
+class Utilization(BaseModel):
+    """Daily status shares of one vehicle, one vendor's vehicles or the fleet."""
+
+    vehicle_id: Optional[UUID] = None
+    vendor_id: Optional[UUID] = None
+    days: List[DailyUtilization]
@@ -0,0 +1,32 @@
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from src.schemas.vehicle import VehicleStatus
+
+
+class ChangeEntity(str, Enum):
+    VENDOR = "vendor"
+    VEHICLE = "vehicle"
+
+
+class ChangeOperation(str, Enum):
+    INSERT = "insert"
+    UPDATE = "update"
+    # Also sent for soft deletes
+    DELETE = "delete"
+
+
+class EntityChange(BaseModel):
+    """A committed vendor or vehicle write, as published by the database."""
+
+    entity: ChangeEntity
+    op: ChangeOperation
+    id: UUID
+    # The vendor itself for vendor changes
+    vendor_id: UUID
+    is_active: bool
+    # Vehicle changes only
+    status: Optional[VehicleStatus] = None
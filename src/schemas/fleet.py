@@ -0,0 +1,19 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class FleetSummaryRead(BaseModel):
+    vendor_id: UUID
+    company_name: str
+    total_vehicles: int
+    idle_vehicles: int
+    in_transit_vehicles: int
+    maintenance_vehicles: int
+    out_of_service_vehicles: int
+    total_capacity: float
+    idle_capacity: float
+    refreshed_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
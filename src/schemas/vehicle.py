@@ -1,9 +1,9 @@
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from src.utils.sanitizers import SanitizationMixin
 
@@ -47,3 +47,64 @@ class VehicleRead(VehicleBase):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class VehicleClaim(BaseModel):
+    count: int = Field(default=1, ge=1, le=100, description="Vehicles to claim.")
+    min_capacity: Optional[float] = Field(default=None, ge=0.0)
+    max_capacity: Optional[float] = Field(default=None, ge=0.0)
+    vendor_id: Optional[UUID] = None
+    make: Optional[str] = None
+
+
+class VehicleImportRowError(BaseModel):
+    row: int = Field(description="1-based record number in the uploaded file.")
+    registration_number: Optional[str] = None
+    errors: List[str]
+
+
+class VehicleImportReport(BaseModel):
+    total_rows: int
+    imported: int
+    failed: int
+    errors: List[VehicleImportRowError]
+
+
+class VehicleStatusChange(BaseModel):
+    """A status change for one vehicle, identified by ID or registration number."""
+
+    vehicle_id: Optional[UUID] = None
+    registration_number: Optional[str] = Field(
+        default=None, min_length=1, max_length=50
+    )
+    status: VehicleStatus
+
+    @model_validator(mode="after")
+    def check_one_identifier(self) -> "VehicleStatusChange":
+        if (self.vehicle_id is None) == (self.registration_number is None):
+            raise ValueError("Give exactly one of vehicle_id or registration_number.")
+        return self
+
+
+class VehicleStatusChangeResult(BaseModel):
+    index: int = Field(description="0-based position of the change in the request.")
+    vehicle_id: Optional[UUID] = None
+    registration_number: Optional[str] = None
+    status: Optional[VehicleStatus] = None
+    updated: bool
+    errors: List[str] = []
+
+
+class VehicleStatusBatchReport(BaseModel):
+    total: int
+    updated: int
+    failed: int
+    results: List[VehicleStatusChangeResult]
+
+
+class TimeInStatus(BaseModel):
+    """Seconds spent in each status by one vehicle, or by a vendor's vehicles."""
+
+    vehicle_id: Optional[UUID] = None
+    vendor_id: Optional[UUID] = None
+    seconds: Dict[VehicleStatus, float]
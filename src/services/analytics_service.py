@@ -0,0 +1,116 @@
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.analytics.utilization import (
+    SECONDS_PER_DAY,
+    daily_status_seconds,
+    status_percentages,
+)
+from src.core.db import get_naive_utc_now
+from src.repositories.status_history import StatusHistoryRepository
+from src.schemas.analytics import DailyUtilization, Utilization, UtilizationGrouping
+from src.schemas.vehicle import VehicleStatus
+
+STATUSES = list(VehicleStatus)
+
+
+class InvalidUtilizationQuery(Exception):
+    """Raised when a utilization report cannot be computed as requested."""
+
+    pass
+
+
+class AnalyticsService:
+    def __init__(self, history_repo: StatusHistoryRepository):
+        self.repo = history_repo
+
+    async def get_utilization(
+        self,
+        session: AsyncSession,
+        *,
+        start: date,
+        days: int,
+        grouping: UtilizationGrouping,
+        vehicle_id: Optional[UUID] = None,
+        vendor_id: Optional[UUID] = None,
+    ) -> List[Utilization]:
+        """
+        Computes the share of each (UTC) day that vehicles spent in each
+        status, for the whole fleet, per vendor or per vehicle.
+
+        Status spans are bulk-loaded and bucketed by day with array operations;
+        days after the current time are left out. Groups with no recorded
+        status in the range are omitted.
+
+        Raises:
+            InvalidUtilizationQuery: If per-vehicle figures are requested for
+                the whole fleet, or the range starts in the future.
+        """
+        if (
+            grouping == UtilizationGrouping.VEHICLE
+            and vehicle_id is None
+            and vendor_id is None
+        ):
+            raise InvalidUtilizationQuery(
+                "Per-vehicle utilization needs a vehicle_id or vendor_id filter."
+            )
+        range_start = datetime.combine(start, time())
+        range_end = min(range_start + timedelta(days=days), get_naive_utc_now())
+        if range_end <= range_start:
+            raise InvalidUtilizationQuery("start must not be in the future.")
+        days = int(np.ceil((range_end - range_start).total_seconds() / SECONDS_PER_DAY))
+
+        spans = await self.repo.copy_status_spans(
+            session,
+            start=range_start,
+            end=range_end,
+            grouping=grouping,
+            vehicle_id=vehicle_id,
+            vendor_id=vendor_id,
+        )
+        if not len(spans):
+            return []
+
+        groups = spans["group_no"].astype(np.int64)
+        n_groups = int(groups.max()) + 1
+        seconds = daily_status_seconds(
+            groups,
+            spans["status"],
+            spans["start"],
+            spans["end"],
+            n_groups=n_groups,
+            n_statuses=len(STATUSES),
+            days=days,
+        )
+        percentages, observed = status_percentages(seconds)
+        keys = np.zeros(n_groups, dtype="V16")
+        keys[groups] = spans["group_key"]
+
+        day_dates = [start + timedelta(days=day) for day in range(days)]
+        reports = []
+        for group in np.flatnonzero(observed.sum(axis=1) > 0).tolist():
+            key = UUID(bytes=keys[group].tobytes())
+            daily = [
+                DailyUtilization(
+                    day=day,
+                    observed_seconds=day_observed,
+                    percent=dict(zip(STATUSES, day_percent)),
+                )
+                for day, day_observed, day_percent in zip(
+                    day_dates,
+                    observed[group].tolist(),
+                    percentages[group].tolist(),
+                )
+            ]
+            reports.append(
+                Utilization(
+                    vehicle_id=key if grouping == UtilizationGrouping.VEHICLE else None,
+                    vendor_id=key if grouping == UtilizationGrouping.VENDOR else None,
+                    days=daily,
+                )
+            )
+        return reports
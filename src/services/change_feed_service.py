@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import weakref
+from collections import OrderedDict
+from typing import Collection, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import ValidationError
+
+from src.core.config import settings
+from src.schemas.change import ChangeEntity, ChangeOperation, EntityChange
+from src.utils.streaming import encode_sse_event
+
+logger = logging.getLogger("tms.changes")
+
+# A change and its Server-Sent Event frame, encoded once for every subscriber
+_Frame = Tuple[EntityChange, bytes]
+
+# Tells a client that changes may have been missed and it should refetch
+RESYNC_EVENT = encode_sse_event("{}", event="resync")
+
+
+class TooManySubscribers(Exception):
+    """Raised when this worker already serves the maximum number of streams."""
+
+    pass
+
+
+def _encode(change: EntityChange) -> _Frame:
+    return change, encode_sse_event(change.model_dump_json(), event="change")
+
+
+class ChangeSubscription:
+    """
+    One client's filter and its pending, not yet sent, changes.
+
+    Pending changes to the same row are coalesced into the latest one, which
+    keeps the earlier one's place in the queue, so a slow client is at most
+    `max_pending` distinct rows behind. Past that its pending changes are
+    dropped and it is sent a single resync event instead. Publishing never
+    waits on a client.
+    """
+
+    def __init__(
+        self,
+        *,
+        entities: Collection[ChangeEntity] = (),
+        vendor_ids: Collection[UUID] = (),
+        max_pending: int,
+    ):
+        self.entities = frozenset(entities)
+        self.vendor_ids = frozenset(vendor_ids)
+        self.max_pending = max_pending
+        self.coalesced = 0
+        self._pending: "OrderedDict[Tuple[ChangeEntity, UUID], _Frame]" = OrderedDict()
+        self._resync = False
+        self._ready = asyncio.Event()
+
+    def matches(self, change: EntityChange) -> bool:
+        """Whether the change passes the entity and vendor filters (empty = all)."""
+        return (not self.entities or change.entity in self.entities) and (
+            not self.vendor_ids or change.vendor_id in self.vendor_ids
+        )
+
+    def push(self, frame: _Frame) -> None:
+        if self._resync:
+            # The client refetches everything anyway
+            return
+        change = frame[0]
+        key = (change.entity, change.id)
+        previous = self._pending.get(key)
+        if previous is not None:
+            # An unsent insert followed by an update is still news of an insert
+            if (
+                previous[0].op == ChangeOperation.INSERT
+                and change.op == ChangeOperation.UPDATE
+            ):
+                frame = _encode(change.model_copy(update={"op": previous[0].op}))
+            self.coalesced += 1
+        elif len(self._pending) >= self.max_pending:
+            self.resync()
+            return
+        self._pending[key] = frame
+        self._ready.set()
+
+    def resync(self) -> None:
+        """Drops the pending changes and queues a resync event instead."""
+        self._pending.clear()
+        self._resync = True
+        self._ready.set()
+
+    async def next_events(self, timeout: float) -> List[bytes]:
+        """
+        Waits up to `timeout` seconds for changes, then returns the encoded
+        events pending so far; an empty list if none arrived in time.
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._ready.clear()
+        if self._resync:
+            self._resync = False
+            return [RESYNC_EVENT]
+        events = [event for _, event in self._pending.values()]
+        self._pending.clear()
+        return events
+
+
+class ChangeBroadcaster:
+    """
+    Fans the vendor and vehicle changes published by the database out to this
+    worker's change stream clients.
+
+    It is fed by the worker's single NotificationListener connection, however
+    many clients are subscribed. Subscriptions are held weakly, so a stream
+    that is dropped without unsubscribing cannot leak.
+    """
+
+    def __init__(self, *, max_subscribers: int, max_pending: int):
+        self.max_subscribers = max_subscribers
+        self.max_pending = max_pending
+        self._subscriptions: "weakref.WeakSet[ChangeSubscription]" = weakref.WeakSet()
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(
+        self,
+        *,
+        entities: Collection[ChangeEntity] = (),
+        vendor_ids: Collection[UUID] = (),
+    ) -> ChangeSubscription:
+        """
+        Registers a client for the changes matching its filters.
+
+        Raises:
+            TooManySubscribers: If the worker is serving max_subscribers streams.
+        """
+        if len(self._subscriptions) >= self.max_subscribers:
+            raise TooManySubscribers(
+                "Too many open change streams; retry later or on another worker."
+            )
+        subscription = ChangeSubscription(
+            entities=entities, vendor_ids=vendor_ids, max_pending=self.max_pending
+        )
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: ChangeSubscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def handle_notification(self, payload: str) -> None:
+        """Listener callback for CHANGE_FEED_CHANNEL."""
+        try:
+            change = EntityChange.model_validate_json(payload)
+        except ValidationError:
+            logger.error(f"Ignoring malformed change notification: {payload!r}")
+            return
+        frame: Optional[_Frame] = None
+        for subscription in self._subscriptions:
+            if subscription.matches(change):
+                frame = frame or _encode(change)
+                subscription.push(frame)
+
+    def resync_all(self) -> None:
+        """
+        Asks every client to resync, for when notifications may have been
+        missed (the listener connection was re-established).
+        """
+        for subscription in self._subscriptions:
+            subscription.resync()
+
+
+change_broadcaster = ChangeBroadcaster(
+    max_subscribers=settings.CHANGE_STREAM_MAX_SUBSCRIBERS,
+    max_pending=settings.CHANGE_STREAM_MAX_PENDING,
+)
@@ -0,0 +1,30 @@
+from typing import List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.fleet import FleetSummary
+from src.repositories.fleet import FleetSummaryRepository
+from src.utils.pagination import decode_cursor, next_cursor
+
+
+class FleetService:
+    def __init__(self, fleet_repo: FleetSummaryRepository):
+        self.repo = fleet_repo
+
+    async def get_summary(
+        self,
+        session: AsyncSession,
+        vendor_ids: Sequence[UUID],
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[FleetSummary], Optional[str]]:
+        """
+        Returns a page of per-vendor fleet summaries, as of the last refresh,
+        and the cursor for the next page if there is one.
+        """
+        after = decode_cursor(cursor, str, UUID) if cursor else None
+        summaries = await self.repo.get_page(
+            session, vendor_ids=vendor_ids, limit=limit, after=after
+        )
+        return summaries, next_cursor(summaries, limit, "company_name", "vendor_id")
@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db import get_naive_utc_now
+from src.repositories.status_history import StatusHistoryRepository
+from src.schemas.vehicle import TimeInStatus
+
+
+class InvalidTimeRange(Exception):
+    """Raised when a history range does not start before it ends."""
+
+    pass
+
+
+def _to_naive_utc(moment: datetime) -> datetime:
+    """History timestamps are naive UTC; aware inputs are converted."""
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class StatusHistoryService:
+    def __init__(self, history_repo: StatusHistoryRepository):
+        self.repo = history_repo
+
+    async def get_time_in_status(
+        self,
+        session: AsyncSession,
+        *,
+        start: datetime,
+        end: Optional[datetime] = None,
+        vehicle_id: Optional[UUID] = None,
+        vendor_id: Optional[UUID] = None,
+        per_vendor: bool = False,
+    ) -> List[TimeInStatus]:
+        """
+        Returns the seconds spent in each status within [start, end), per
+        vehicle or per vendor. The range is cut off at the current time.
+        """
+        now = get_naive_utc_now()
+        start = _to_naive_utc(start)
+        end = min(_to_naive_utc(end), now) if end is not None else now
+        if start >= end:
+            raise InvalidTimeRange("start must be before end and in the past.")
+
+        durations = await self.repo.get_time_in_status(
+            session,
+            start=start,
+            end=end,
+            vehicle_id=vehicle_id,
+            vendor_id=vendor_id,
+            per_vendor=per_vendor,
+        )
+        grouped: Dict[UUID, Dict[str, float]] = {}
+        for (key, status), seconds in durations.items():
+            grouped.setdefault(key, {})[status] = seconds
+
+        field = "vendor_id" if per_vendor else "vehicle_id"
+        return [
+            TimeInStatus.model_validate({field: key, "seconds": seconds})
+            for key, seconds in grouped.items()
+        ]
@@ -0,0 +1,235 @@
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.repositories.vehicle import IMPORT_VENDOR_NOT_FOUND, VehicleRepository
+from src.schemas.vehicle import (
+    VehicleCreate,
+    VehicleImportReport,
+    VehicleImportRowError,
+)
+from src.utils.validation import format_validation_error
+
+CSV_CONTENT_TYPES = {"text/csv", "application/csv"}
+NDJSON_CONTENT_TYPES = {
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+    "application/x-jsonlines",
+}
+
+
+class VehicleImportError(Exception):
+    """Base exception for the vehicle import service."""
+
+    pass
+
+
+class UnsupportedImportFormat(VehicleImportError):
+    """Raised when the upload is neither CSV nor NDJSON."""
+
+    pass
+
+
+class InvalidImportFile(VehicleImportError):
+    """Raised when the upload cannot be parsed at all (e.g. missing CSV header)."""
+
+    pass
+
+
+class ImportLineTooLong(VehicleImportError):
+    """Raised when a line of the upload exceeds VEHICLE_IMPORT_MAX_LINE_BYTES."""
+
+    pass
+
+
+def _check_line_length(line: bytes) -> None:
+    if len(line) > settings.VEHICLE_IMPORT_MAX_LINE_BYTES:
+        raise ImportLineTooLong(
+            "Upload lines must not exceed "
+            f"{settings.VEHICLE_IMPORT_MAX_LINE_BYTES} bytes."
+        )
+
+
+async def _iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Re-chunks a byte stream into lines without buffering the whole body. Only
+    the current line is held in memory, so lines are capped in length.
+
+    Raises:
+        ImportLineTooLong: If a line exceeds VEHICLE_IMPORT_MAX_LINE_BYTES.
+    """
+    pending = b""
+    async for chunk in stream:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            _check_line_length(line)
+            yield line
+        # An unterminated line must not grow without bound either
+        _check_line_length(pending)
+    if pending:
+        yield pending
+
+
+async def _iter_ndjson(
+    stream: AsyncIterator[bytes],
+) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Yields (row number, record, parse error) for each non-blank NDJSON line."""
+    row_no = 0
+    async for line in _iter_lines(stream):
+        if not line.strip():
+            continue
+        row_no += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield row_no, None, "Invalid JSON."
+            continue
+        if not isinstance(record, dict):
+            yield row_no, None, "Each line must be a JSON object."
+            continue
+        yield row_no, record, None
+
+
+async def _iter_csv(
+    stream: AsyncIterator[bytes],
+) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Yields (row number, record, parse error) for each CSV record after the header.
+    Records must not contain embedded newlines. Empty cells fall back to defaults.
+    """
+    header: Optional[List[str]] = None
+    row_no = 0
+    async for line in _iter_lines(stream):
+        try:
+            decoded = line.decode("utf-8-sig" if header is None else "utf-8")
+        except UnicodeDecodeError:
+            if header is None:
+                raise InvalidImportFile("CSV header is not valid UTF-8.")
+            row_no += 1
+            yield row_no, None, "Row is not valid UTF-8."
+            continue
+        decoded = decoded.rstrip("\r")
+        if not decoded.strip():
+            continue
+        values = next(csv.reader([decoded]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row_no += 1
+        if len(values) != len(header):
+            yield row_no, None, f"Expected {len(header)} columns, got {len(values)}."
+            continue
+        yield (
+            row_no,
+            {name: value for name, value in zip(header, values) if value != ""},
+            None,
+        )
+    if header is None:
+        raise InvalidImportFile("CSV upload is missing a header row.")
+
+
+class VehicleImportService:
+    def __init__(self, vehicle_repo: VehicleRepository):
+        self.repo = vehicle_repo
+
+    async def import_vehicles(
+        self,
+        session: AsyncSession,
+        stream: AsyncIterator[bytes],
+        content_type: str,
+    ) -> VehicleImportReport:
+        """
+        Streams a CSV or NDJSON upload through VehicleCreate validation and bulk
+        inserts the valid rows chunk by chunk.
+
+        Rows that fail validation, reference a missing vendor, or reuse an existing
+        registration number are skipped and reported; the rest are imported.
+
+        Args:
+            session: The database session.
+            stream: The raw request body.
+            content_type: The media type of the upload.
+
+        Returns:
+            A per-row import report.
+        """
+        if content_type in CSV_CONTENT_TYPES:
+            records = _iter_csv(stream)
+        elif content_type in NDJSON_CONTENT_TYPES:
+            records = _iter_ndjson(stream)
+        else:
+            raise UnsupportedImportFormat(
+                f"Unsupported content type '{content_type}'. Upload text/csv or "
+                "application/x-ndjson."
+            )
+
+        errors: List[VehicleImportRowError] = []
+        chunk: List[Tuple[int, VehicleCreate]] = []
+        total_rows = 0
+        imported = 0
+
+        async for row_no, record, parse_error in records:
+            total_rows += 1
+            if record is None:
+                errors.append(
+                    VehicleImportRowError(row=row_no, errors=[parse_error or ""])
+                )
+                continue
+            try:
+                chunk.append((row_no, VehicleCreate.model_validate(record)))
+            except ValidationError as e:
+                registration_number = record.get("registration_number")
+                errors.append(
+                    VehicleImportRowError(
+                        row=row_no,
+                        registration_number=(
+                            str(registration_number) if registration_number else None
+                        ),
+                        errors=format_validation_error(e),
+                    )
+                )
+                continue
+            if len(chunk) >= settings.VEHICLE_IMPORT_CHUNK_SIZE:
+                imported += await self._flush(session, chunk, errors)
+                chunk = []
+
+        imported += await self._flush(session, chunk, errors)
+        errors.sort(key=lambda error: error.row)
+
+        return VehicleImportReport(
+            total_rows=total_rows,
+            imported=imported,
+            failed=total_rows - imported,
+            errors=errors,
+        )
+
+    async def _flush(
+        self,
+        session: AsyncSession,
+        chunk: List[Tuple[int, VehicleCreate]],
+        errors: List[VehicleImportRowError],
+    ) -> int:
+        """Bulk inserts one chunk, records its rejected rows, and returns the insert count."""
+        rejected = await self.repo.bulk_create(session, rows=chunk)
+        for row_no, vehicle in chunk:
+            reason = rejected.get(row_no)
+            if reason is None:
+                continue
+            if reason == IMPORT_VENDOR_NOT_FOUND:
+                message = f"Vendor with ID {vehicle.vendor_id} not found."
+            else:
+                message = "A vehicle with this registration number already exists."
+            errors.append(
+                VehicleImportRowError(
+                    row=row_no,
+                    registration_number=vehicle.registration_number,
+                    errors=[message],
+                )
+            )
+        return len(chunk) - len(rejected)
@@ -1,12 +1,48 @@
-from typing import List
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    NoReturn,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 from uuid import UUID
 
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.config import settings
+from src.core.db import get_violated_constraint
 from src.models.vehicle import Vehicle
-from src.repositories.vehicle import VehicleRepository
+from src.repositories.vehicle import (
+    REGISTRATION_NUMBER_CONSTRAINT,
+    VENDOR_FOREIGN_KEY,
+    VehicleRepository,
+)
 from src.repositories.vendor import VendorRepository
-from src.schemas.vehicle import VehicleCreate, VehicleUpdate
+from src.schemas.vehicle import (
+    VehicleClaim,
+    VehicleCreate,
+    VehicleStatus,
+    VehicleStatusBatchReport,
+    VehicleStatusChange,
+    VehicleStatusChangeResult,
+    VehicleUpdate,
+)
+from src.utils.etags import PreconditionFailed
+from src.utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+    next_cursor,
+    next_sync_token,
+    sync_position,
+)
+from src.utils.validation import format_validation_error
 
 
 class VehicleServiceError(Exception):
@@ -27,6 +63,41 @@ class VendorNotFound(VehicleServiceError):
     pass
 
 
+def _status_result(
+    index: int,
+    change: VehicleStatusChange,
+    *,
+    vehicle_id: Optional[UUID] = None,
+    errors: Optional[List[str]] = None,
+) -> VehicleStatusChangeResult:
+    return VehicleStatusChangeResult(
+        index=index,
+        vehicle_id=vehicle_id or change.vehicle_id,
+        registration_number=change.registration_number,
+        status=change.status,
+        updated=not errors,
+        errors=errors or [],
+    )
+
+
+def _not_found_message(change: VehicleStatusChange) -> str:
+    if change.vehicle_id is not None:
+        return f"Vehicle with ID {change.vehicle_id} not found."
+    return f"Vehicle with registration number {change.registration_number} not found."
+
+
+def _with_vehicle_id(
+    change: VehicleStatusChange, vehicle_ids: Dict[str, UUID]
+) -> VehicleStatusChange:
+    """The change addressed by vehicle ID, if its registration was resolved."""
+    vehicle_id = vehicle_ids.get(change.registration_number or "")
+    if vehicle_id is None:
+        return change
+    return change.model_copy(
+        update={"vehicle_id": vehicle_id, "registration_number": None}
+    )
+
+
 class VehicleService:
     def __init__(self, vehicle_repo: VehicleRepository, vendor_repo: VendorRepository):
         self.repo = vehicle_repo
@@ -35,21 +106,12 @@ class VehicleService:
     async def create_vehicle(
         self, session: AsyncSession, vehicle_data: VehicleCreate
     ) -> Vehicle:
-        # 1. Validate that the vendor exists
-        vendor = await self.vendor_repo.get(session, vehicle_data.vendor_id)
-        if not vendor:
-            raise VendorNotFound(f"Vendor with ID {vehicle_data.vendor_id} not found.")
-
-        # 2. Validate registration uniqueness
-        existing_vehicle = await self.repo.find_by_registration_number(
-            session, registration_number=vehicle_data.registration_number
-        )
-        if existing_vehicle:
-            raise RegistrationAlreadyExists(
-                "A vehicle with this registration number already exists."
-            )
-
-        return await self.repo.create(session, obj_in=vehicle_data)
+        # Vendor existence and registration uniqueness are enforced by the
+        # foreign key and unique index, so the INSERT is the only round trip.
+        try:
+            return await self.repo.create(session, obj_in=vehicle_data)
+        except IntegrityError as e:
+            self._raise_for_integrity_error(e, vendor_id=vehicle_data.vendor_id)
 
     async def get_vehicle_by_id(
         self, session: AsyncSession, vehicle_id: UUID
@@ -72,71 +134,341 @@ class VehicleService:
         return vehicle
 
     async def get_all_vehicles(
-        self, session: AsyncSession, skip: int, limit: int
+        self,
+        session: AsyncSession,
+        skip: int,
+        limit: int,
+        cursor: Optional[str] = None,
     ) -> List[Vehicle]:
-        return await self.repo.get_multi(session, skip=skip, limit=limit)
+        return await self.repo.get_multi(
+            session, skip=skip, limit=limit, after=self._decode_cursor(cursor)
+        )
+
+    async def sync_vehicles(
+        self,
+        session: AsyncSession,
+        *,
+        updated_since: Optional[datetime],
+        sync_token: Optional[str],
+        limit: int,
+    ) -> Tuple[List[Vehicle], str]:
+        """
+        Vehicles changed since a time or a previous sync, soft-deleted ones
+        included, and the token to continue from. A sync token takes
+        precedence over `updated_since`.
+        """
+        position = sync_position(updated_since, sync_token)
+        vehicles = await self.repo.get_changed(session, after=position, limit=limit)
+        return vehicles, next_sync_token(vehicles, position)
 
     async def get_vehicles_by_vendor(
-        self, session: AsyncSession, vendor_id: UUID, skip: int, limit: int
+        self,
+        session: AsyncSession,
+        vendor_id: UUID,
+        skip: int,
+        limit: int,
+        cursor: Optional[str] = None,
     ) -> List[Vehicle]:
         """Fetch vehicles for specific vendor, ensuring vendor exists first."""
 
-        vendor = await self.vendor_repo.get(session, vendor_id)
+        vendor = await self.vendor_repo.get_cached(session, vendor_id)
         if not vendor:
             raise VendorNotFound(f"Vendor with ID {vendor_id} not found.")
 
         return await self.repo.find_by_vendor_id(
-            session, vendor_id=vendor_id, skip=skip, limit=limit
+            session,
+            vendor_id=vendor_id,
+            skip=skip,
+            limit=limit,
+            after=self._decode_cursor(cursor),
         )
 
     async def update_vehicle(
-        self, session: AsyncSession, vehicle_id: UUID, vehicle_data: VehicleUpdate
+        self,
+        session: AsyncSession,
+        vehicle_id: UUID,
+        vehicle_data: VehicleUpdate,
+        expected_updated_at: Optional[Sequence[datetime]] = None,
     ) -> Vehicle:
-        db_vehicle = await self.get_vehicle_by_id(session, vehicle_id)
-        update_data = vehicle_data.model_dump(exclude_unset=True)
+        """
+        Updates an active vehicle, optionally only if its updated_at is one of
+        `expected_updated_at` (an If-Match precondition).
 
-        # Check if they are trying to change the vendor, and validate the new vendor exists
-        if (
-            "vendor_id" in update_data
-            and update_data["vendor_id"] != db_vehicle.vendor_id
-        ):
-            vendor = await self.vendor_repo.get(session, update_data["vendor_id"])
-            if not vendor:
-                raise VendorNotFound(
-                    f"Vendor with ID {update_data['vendor_id']} not found."
+        Raises:
+            PreconditionFailed: If the vehicle's updated_at was not expected.
+        """
+        try:
+            vehicle = await self.repo.update(
+                session,
+                obj_id=vehicle_id,
+                obj_in=vehicle_data,
+                expected_updated_at=expected_updated_at,
+            )
+        except IntegrityError as e:
+            self._raise_for_integrity_error(e, vendor_id=vehicle_data.vendor_id)
+
+        if not vehicle:
+            if expected_updated_at is not None and await self.repo.get(
+                session, vehicle_id
+            ):
+                raise PreconditionFailed(f"Vehicle {vehicle_id} has changed.")
+            raise VehicleNotFound(f"Vehicle with ID {vehicle_id} not found.")
+        return vehicle
+
+    async def update_vehicle_statuses(
+        self, session: AsyncSession, changes: Sequence[Any]
+    ) -> VehicleStatusBatchReport:
+        """
+        Validates a batch of raw status changes and applies the valid ones
+        chunk by chunk, one UPDATE per chunk.
+
+        Invalid items and items matching no active vehicle are reported rather
+        than failing the batch. When several items name the same vehicle, by
+        the same identifier or one by ID and another by registration number,
+        only the last one is applied and the others are reported as
+        superseded.
+
+        Returns:
+            A report with one result per item, in request order.
+        """
+        results: Dict[int, VehicleStatusChangeResult] = {}
+        valid: List[Tuple[int, VehicleStatusChange]] = []
+
+        for index, raw in enumerate(changes):
+            try:
+                valid.append((index, VehicleStatusChange.model_validate(raw)))
+            except ValidationError as e:
+                results[index] = VehicleStatusChangeResult(
+                    index=index, updated=False, errors=format_validation_error(e)
                 )
 
-        # Check registration uniqueness if it's being updated
-        if (
-            "registration_number" in update_data
-            and update_data["registration_number"] != db_vehicle.registration_number
-        ):
-            existing_vehicle = await self.repo.find_by_registration_number(
-                session, registration_number=update_data["registration_number"]
+        vehicle_ids = await self._resolve_registration_numbers(session, valid)
+        latest: Dict[Union[UUID, str], Tuple[int, VehicleStatusChange]] = {}
+        for index, change in valid:
+            key = (
+                change.vehicle_id
+                or vehicle_ids.get(change.registration_number or "")
+                or change.registration_number
+                or ""
             )
-            if existing_vehicle and existing_vehicle.id != vehicle_id:
-                raise RegistrationAlreadyExists(
-                    "A vehicle with this registration number already exists."
+            if key in latest:
+                earlier, superseded = latest[key]
+                results[earlier] = _status_result(
+                    earlier, superseded, errors=[f"Superseded by item {index}."]
                 )
+            latest[key] = (index, change)
+
+        pending = sorted(latest.values(), key=lambda item: item[0])
+        chunk_size = settings.VEHICLE_STATUS_BATCH_CHUNK_SIZE
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start : start + chunk_size]
+            applied = await self.repo.bulk_update_status(
+                session,
+                changes=[
+                    (index, _with_vehicle_id(change, vehicle_ids))
+                    for index, change in chunk
+                ],
+            )
+            for index, change in chunk:
+                vehicle_id = applied.get(index)
+                if vehicle_id is None:
+                    results[index] = _status_result(
+                        index, change, errors=[_not_found_message(change)]
+                    )
+                else:
+                    results[index] = _status_result(
+                        index, change, vehicle_id=vehicle_id
+                    )
+
+        ordered = [results[index] for index in range(len(changes))]
+        updated = sum(result.updated for result in ordered)
+        return VehicleStatusBatchReport(
+            total=len(ordered),
+            updated=updated,
+            failed=len(ordered) - updated,
+            results=ordered,
+        )
+
+    async def _resolve_registration_numbers(
+        self, session: AsyncSession, changes: Sequence[Tuple[int, VehicleStatusChange]]
+    ) -> Dict[str, UUID]:
+        """
+        Private helper that maps the registration numbers of a batch mixing
+        both kinds of identifier to vehicle IDs, one query per chunk, so that
+        items naming one vehicle both ways are deduplicated. A batch using a
+        single kind of identifier cannot name a vehicle twice without
+        repeating the identifier, and needs no lookup.
+        """
+        registration_numbers = list(
+            dict.fromkeys(
+                change.registration_number
+                for _, change in changes
+                if change.registration_number is not None
+            )
+        )
+        if not registration_numbers or all(
+            change.registration_number is not None for _, change in changes
+        ):
+            return {}
 
-        return await self.repo.update(session, db_obj=db_vehicle, obj_in=vehicle_data)
+        vehicle_ids: Dict[str, UUID] = {}
+        chunk_size = settings.VEHICLE_STATUS_BATCH_CHUNK_SIZE
+        for start in range(0, len(registration_numbers), chunk_size):
+            vehicle_ids.update(
+                await self.repo.find_ids_by_registration_numbers(
+                    session,
+                    registration_numbers=registration_numbers[
+                        start : start + chunk_size
+                    ],
+                )
+            )
+        return vehicle_ids
 
     async def delete_vehicle(
-        self, session: AsyncSession, vehicle_id: UUID, permanent: bool = False
+        self,
+        session: AsyncSession,
+        vehicle_id: UUID,
+        permanent: bool = False,
+        expected_updated_at: Optional[Sequence[datetime]] = None,
     ) -> None:
-        db_vehicle = await self.get_vehicle_by_id(session, vehicle_id)
         if permanent:
+            db_vehicle = await self.get_vehicle_by_id(session, vehicle_id)
+            if (
+                expected_updated_at is not None
+                and db_vehicle.updated_at not in expected_updated_at
+            ):
+                raise PreconditionFailed(f"Vehicle {vehicle_id} has changed.")
             await self.repo.delete(session, db_obj=db_vehicle)
         else:
             # Soft delete logic
             soft_delete_update = VehicleUpdate(is_active=False)
-            await self.repo.update(
-                session, db_obj=db_vehicle, obj_in=soft_delete_update
+            await self.update_vehicle(
+                session, vehicle_id, soft_delete_update, expected_updated_at
             )
 
-    async def search_vehicles(
-        self, session: AsyncSession, term: str, skip: int, limit: int
+    async def get_vehicles_version(self, session: AsyncSession) -> int:
+        """
+        Gets a number that grows with every committed vehicle write, to tell
+        whether a list of vehicles may have changed.
+        """
+        return await self.repo.get_version(session)
+
+    async def find_vehicles_by_capacity(
+        self,
+        session: AsyncSession,
+        *,
+        statuses: Sequence[VehicleStatus] = (),
+        min_capacity: Optional[float] = None,
+        max_capacity: Optional[float] = None,
+        vendor_id: Optional[UUID] = None,
+        make: Optional[str] = None,
+        is_active: bool = True,
+        descending: bool = False,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Vehicle], Optional[str]]:
+        """
+        Filters vehicles and orders them by capacity.
+        Returns the page and the cursor for the next page, if there is one.
+        """
+        after = decode_cursor(cursor, float, UUID) if cursor else None
+        vehicles = await self.repo.find_by_capacity(
+            session,
+            statuses=sorted({status.value for status in statuses}),
+            min_capacity=min_capacity,
+            max_capacity=max_capacity,
+            vendor_id=vendor_id,
+            make=make,
+            is_active=is_active,
+            descending=descending,
+            limit=limit,
+            after=after,
+        )
+        return vehicles, next_cursor(vehicles, limit, "capacity", "id")
+
+    async def claim_vehicles(
+        self, session: AsyncSession, claim: VehicleClaim
     ) -> List[Vehicle]:
+        """Claims up to `claim.count` idle vehicles, marking them In Transit."""
+        return await self.repo.claim(
+            session,
+            count=claim.count,
+            min_capacity=claim.min_capacity,
+            max_capacity=claim.max_capacity,
+            vendor_id=claim.vendor_id,
+            make=claim.make,
+        )
+
+    async def get_active_vehicle_counts(
+        self, session: AsyncSession, vendor_id: Optional[UUID] = None
+    ) -> Tuple[int, Optional[Dict[VehicleStatus, int]]]:
+        """
+        Counts active vehicles: in total and per status, or only in total for
+        a single vendor (no per-status counts), ensuring that vendor exists first.
+        """
+        if vendor_id is None:
+            return await self.repo.get_active_counts(session)
+
+        vendor = await self.vendor_repo.get_cached(session, vendor_id)
+        if not vendor:
+            raise VendorNotFound(f"Vendor with ID {vendor_id} not found.")
+        return await self.repo.count_by_vendor_id(session, vendor_id=vendor_id), None
+
+    async def search_vehicles(
+        self,
+        session: AsyncSession,
+        term: str,
+        skip: int,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Vehicle], Optional[str]]:
+        """
+        Searches active vehicles, best matches first.
+        Returns the page and the cursor for the next page, if there is one.
+        """
         if not term:
-            return []
-        return await self.repo.search(session, term=term, skip=skip, limit=limit)
+            return [], None
+        after = decode_cursor(cursor, float, UUID) if cursor else None
+        matches = await self.repo.search(
+            session, term=term, skip=skip, limit=limit, after=after
+        )
+        vehicles = [vehicle for vehicle, _ in matches]
+        if len(matches) < limit:
+            return vehicles, None
+        last_vehicle, last_score = matches[-1]
+        return vehicles, encode_cursor(last_score, last_vehicle.id)
+
+    def stream_vehicles(
+        self,
+        session: AsyncSession,
+        vendor_id: Optional[UUID] = None,
+        term: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Streams every matching active vehicle, for exports."""
+        return self.repo.stream(
+            session,
+            vendor_id=vendor_id,
+            term=term,
+            batch_size=settings.EXPORT_FETCH_SIZE,
+        )
+
+    @staticmethod
+    def _raise_for_integrity_error(
+        exc: IntegrityError, vendor_id: Optional[UUID]
+    ) -> NoReturn:
+        """Translates a constraint violation from a vehicle write into a service error."""
+        constraint = get_violated_constraint(exc)
+        if constraint == REGISTRATION_NUMBER_CONSTRAINT:
+            raise RegistrationAlreadyExists(
+                "A vehicle with this registration number already exists."
+            ) from exc
+        if constraint == VENDOR_FOREIGN_KEY:
+            raise VendorNotFound(f"Vendor with ID {vendor_id} not found.") from exc
+        raise exc
+
+    @staticmethod
+    def _decode_cursor(cursor: Optional[str]) -> Optional[tuple]:
+        """Decodes a (created_at, id) keyset cursor, if one was supplied."""
+        if not cursor:
+            return None
+        return decode_cursor(cursor, datetime, UUID)
@@ -1,12 +1,31 @@
-from typing import List
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    NoReturn,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from uuid import UUID
 
 from email_validator import EmailNotValidError, validate_email
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.config import settings
+from src.core.db import get_violated_constraint
 from src.models.vendor import Vendor
-from src.repositories.vendor import VendorRepository
+from src.repositories.vendor import (
+    EMAIL_CONSTRAINT,
+    PHONE_NUMBER_CONSTRAINT,
+    VendorRepository,
+)
 from src.schemas.vendor import VendorCreate, VendorUpdate
+from src.utils.etags import PreconditionFailed
+from src.utils.pagination import decode_cursor, next_sync_token, sync_position
 
 
 class VendorServiceError(Exception):
@@ -64,15 +83,12 @@ class VendorService:
         """
         self._validate_email_format(vendor_data.email)
 
-        if await self.repo.find_by_email(session, email=vendor_data.email):
-            raise EmailAlreadyExists("A vendor with this email already exists.")
-
-        if vendor_data.phone_number and await self.repo.find_by_phone(
-            session, phone=vendor_data.phone_number
-        ):
-            raise PhoneAlreadyExists("A vendor with this phone number already exists.")
-
-        return await self.repo.create(session, obj_in=vendor_data)
+        # Email and phone uniqueness are enforced by unique indexes, so the
+        # INSERT is the only round trip.
+        try:
+            return await self.repo.create(session, obj_in=vendor_data)
+        except IntegrityError as e:
+            self._raise_for_integrity_error(e)
 
     async def get_vendor_by_id(self, session: AsyncSession, vendor_id: UUID) -> Vendor:
         """
@@ -85,7 +101,7 @@ class VendorService:
         Returns:
             The Vendor object.
         """
-        vendor = await self.repo.get(session, vendor_id)
+        vendor = await self.repo.get_cached(session, vendor_id)
         if not vendor:
             raise VendorNotFound(f"Vendor with ID {vendor_id} not found.")
         return vendor
@@ -125,7 +141,11 @@ class VendorService:
         return vendor
 
     async def get_all_vendors(
-        self, session: AsyncSession, skip: int, limit: int
+        self,
+        session: AsyncSession,
+        skip: int,
+        limit: int,
+        cursor: Optional[str] = None,
     ) -> List[Vendor]:
         """
         Retrieves a paginated list of all vendors.
@@ -134,14 +154,45 @@ class VendorService:
             session: The database session.
             skip: Number of records to skip.
             limit: Maximum number of records to return.
+            cursor: Opaque keyset cursor from a previous page; overrides `skip`.
 
         Returns:
             A list of Vendor objects.
         """
-        return await self.repo.get_multi(session, skip=skip, limit=limit)
+        after = decode_cursor(cursor, datetime, UUID) if cursor else None
+        return await self.repo.get_multi(session, skip=skip, limit=limit, after=after)
+
+    async def sync_vendors(
+        self,
+        session: AsyncSession,
+        *,
+        updated_since: Optional[datetime],
+        sync_token: Optional[str],
+        limit: int,
+    ) -> Tuple[List[Vendor], str]:
+        """
+        Retrieves the vendors changed since a time or a previous sync,
+        inactive ones included.
+
+        Args:
+            session: A read session on the primary.
+            updated_since: Return vendors updated after this time.
+            sync_token: Token from a previous sync; overrides `updated_since`.
+            limit: Maximum number of records to return.
+
+        Returns:
+            The vendors, oldest change first, and the token to continue from.
+        """
+        position = sync_position(updated_since, sync_token)
+        vendors = await self.repo.get_changed(session, after=position, limit=limit)
+        return vendors, next_sync_token(vendors, position)
 
     async def update_vendor(
-        self, session: AsyncSession, vendor_id: UUID, vendor_data: VendorUpdate
+        self,
+        session: AsyncSession,
+        vendor_id: UUID,
+        vendor_data: VendorUpdate,
+        expected_updated_at: Optional[Sequence[datetime]] = None,
     ) -> Vendor:
         """
         Updates an existing vendor after validating business rules.
@@ -150,39 +201,44 @@ class VendorService:
             session: The database session.
             vendor_id: The ID of the vendor to update.
             vendor_data: The new data for the vendor.
+            expected_updated_at: Only update the vendor if its updated_at is
+                one of these (an If-Match precondition).
 
         Returns:
             The updated Vendor object.
+
+        Raises:
+            PreconditionFailed: If the vendor's updated_at was not expected.
         """
-        db_vendor = await self.get_vendor_by_id(session, vendor_id)
-        update_data = vendor_data.model_dump(exclude_unset=True)
+        if vendor_data.email is not None:
+            self._validate_email_format(vendor_data.email)
 
-        # Check email uniqueness
-        if "email" in update_data and update_data["email"] != db_vendor.email:
-            self._validate_email_format(update_data["email"])
-            existing_vendor = await self.repo.find_by_email(
-                session, email=update_data["email"]
-            )
-            if existing_vendor and existing_vendor.id != vendor_id:
-                raise EmailAlreadyExists("A vendor with this email already exists.")
-
-        # Check phone number uniqueness
-        if (
-            "phone_number" in update_data
-            and update_data["phone_number"] != db_vendor.phone_number
-        ):
-            existing_vendor = await self.repo.find_by_phone(
-                session, phone=update_data["phone_number"]
+        try:
+            vendor = await self.repo.update(
+                session,
+                obj_id=vendor_id,
+                obj_in=vendor_data,
+                expected_updated_at=expected_updated_at,
             )
-            if existing_vendor and existing_vendor.id != vendor_id:
-                raise PhoneAlreadyExists(
-                    "A vendor with this phone number already exists."
-                )
+        except IntegrityError as e:
+            self._raise_for_integrity_error(e)
 
-        return await self.repo.update(session, db_obj=db_vendor, obj_in=vendor_data)
+        if not vendor:
+            if expected_updated_at is not None and await self.repo.get(
+                session, vendor_id
+            ):
+                raise PreconditionFailed(f"Vendor {vendor_id} has changed.")
+            raise VendorNotFound(f"Vendor with ID {vendor_id} not found.")
+
+        await self.repo.publish_change(session, vendor_id=vendor_id)
+        return vendor
 
     async def delete_vendor(
-        self, session: AsyncSession, vendor_id: UUID, permanent: bool = False
+        self,
+        session: AsyncSession,
+        vendor_id: UUID,
+        permanent: bool = False,
+        expected_updated_at: Optional[Sequence[datetime]] = None,
     ) -> None:
         """
         Deletes a vendor, either permanently or by marking it as inactive (soft delete).
@@ -191,13 +247,36 @@ class VendorService:
             session: The database session.
             vendor_id: The ID of the vendor to delete.
             permanent: If True, the vendor is permanently deleted from the database.
+            expected_updated_at: Only delete the vendor if its updated_at is
+                one of these (an If-Match precondition).
+
+        Raises:
+            PreconditionFailed: If the vendor's updated_at was not expected.
         """
-        db_vendor = await self.get_vendor_by_id(session, vendor_id)
         if permanent:
+            # Deleting needs the session-bound row, not a cached copy
+            db_vendor = await self.repo.get(session, vendor_id)
+            if not db_vendor:
+                raise VendorNotFound(f"Vendor with ID {vendor_id} not found.")
+            if (
+                expected_updated_at is not None
+                and db_vendor.updated_at not in expected_updated_at
+            ):
+                raise PreconditionFailed(f"Vendor {vendor_id} has changed.")
             await self.repo.delete(session, db_obj=db_vendor)
+            await self.repo.publish_change(session, vendor_id=vendor_id)
         else:
             soft_delete_update = VendorUpdate(is_active=False)
-            await self.repo.update(session, db_obj=db_vendor, obj_in=soft_delete_update)
+            await self.update_vendor(
+                session, vendor_id, soft_delete_update, expected_updated_at
+            )
+
+    async def get_vendors_version(self, session: AsyncSession) -> int:
+        """
+        Gets a number that grows with every committed vendor write, to tell
+        whether a list of vendors may have changed.
+        """
+        return await self.repo.get_version(session)
 
     async def get_active_vendors_count(self, session: AsyncSession) -> int:
         """
@@ -231,6 +310,36 @@ class VendorService:
 
         return await self.repo.search(session, term=term, skip=skip, limit=limit)
 
+    def stream_vendors(
+        self, session: AsyncSession, term: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams every vendor matching an optional search term, for exports.
+
+        Args:
+            session: The database session, which must stay open while iterating.
+            term: Optional search term, matched like search_vendors.
+
+        Returns:
+            An async iterator of vendor row dictionaries.
+        """
+        return self.repo.stream(
+            session, term=term, batch_size=settings.EXPORT_FETCH_SIZE
+        )
+
+    def _raise_for_integrity_error(self, exc: IntegrityError) -> NoReturn:
+        """Private helper to translate a unique-index violation into a service error."""
+        constraint = get_violated_constraint(exc)
+        if constraint == EMAIL_CONSTRAINT:
+            raise EmailAlreadyExists(
+                "A vendor with this email already exists."
+            ) from exc
+        if constraint == PHONE_NUMBER_CONSTRAINT:
+            raise PhoneAlreadyExists(
+                "A vendor with this phone number already exists."
+            ) from exc
+        raise exc
+
     def _validate_email_format(self, email: str) -> None:
         """Private helper to validate email format."""
         try:
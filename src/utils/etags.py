@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi.responses import Response
+
+ETAG_HEADER = "ETag"
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class PreconditionFailed(Exception):
+    """Raised when an If-Match precondition does not hold for the current row."""
+
+    pass
+
+
+def _micros(value: datetime) -> int:
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def resource_etag(obj_id: UUID, updated_at: datetime) -> str:
+    """
+    Strong ETag of a single row. updated_at is stamped by the database on
+    every write (see src/models/timestamps.py), so it changes with the row.
+    """
+    return f'"{obj_id.hex}-{_micros(updated_at)}"'
+
+
+def collection_etag(table: str, version: int) -> str:
+    """Strong ETag of any list read from a table at the given table version."""
+    return f'"{table}-{version}"'
+
+
+def _etags(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def none_match(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches the current ETag, i.e. the client's
+    copy is current and a 304 can be sent. Compared weakly, as RFC 9110 asks.
+    """
+    if not if_none_match:
+        return False
+    tags = _etags(if_none_match)
+    return "*" in tags or etag in (tag.removeprefix("W/") for tag in tags)
+
+
+def expected_updated_at(
+    if_match: Optional[str], obj_id: UUID
+) -> Optional[List[datetime]]:
+    """
+    The updated_at values an If-Match header accepts for a row, so the write
+    can be made conditional on them. None when any version is acceptable (no
+    header, or `*`). Weak and foreign ETags never match.
+    """
+    if not if_match:
+        return None
+    tags = _etags(if_match)
+    if "*" in tags:
+        return None
+    accepted = []
+    for tag in tags:
+        tag_id, _, micros = tag.strip('"').partition("-")
+        if tag.startswith('"') and tag_id == obj_id.hex and micros.isdigit():
+            accepted.append(_EPOCH + timedelta(microseconds=int(micros)))
+    return accepted
+
+
+def not_modified(etag: str) -> Response:
+    """A bodyless 304 response confirming the client's copy."""
+    return Response(status_code=304, headers={ETAG_HEADER: etag})
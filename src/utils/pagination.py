@@ -0,0 +1,118 @@
+import base64
+import binascii
+import json
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+SYNC_TOKEN_HEADER = "X-Sync-Token"
+
+# Sorts after every real ID, so (t, _MAX_UUID) is "everything updated after t"
+_MAX_UUID = UUID(int=(1 << 128) - 1)
+
+_DECODERS: Dict[type, Callable[[Any], Any]] = {
+    datetime: datetime.fromisoformat,
+    UUID: UUID,
+    float: float,
+    int: int,
+    str: str,
+}
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    pass
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encodes the sort key of the last row of a page into an opaque cursor.
+
+    Args:
+        values: The sort key values, in ORDER BY order.
+
+    Returns:
+        A URL-safe cursor string.
+    """
+    payload: List[Any] = []
+    for value in values:
+        if isinstance(value, datetime):
+            payload.append(value.isoformat())
+        elif isinstance(value, UUID):
+            payload.append(str(value))
+        else:
+            payload.append(value)
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """
+    Decodes a cursor produced by `encode_cursor` back into typed sort key values.
+
+    Args:
+        cursor: The opaque cursor string.
+        types: The expected type of each sort key value.
+
+    Returns:
+        A tuple of decoded values.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor("Invalid pagination cursor.") from e
+
+    if not isinstance(payload, list) or len(payload) != len(types):
+        raise InvalidCursor("Invalid pagination cursor.")
+
+    try:
+        return tuple(_DECODERS[t](v) for t, v in zip(types, payload))
+    except (TypeError, ValueError) as e:
+        raise InvalidCursor("Invalid pagination cursor.") from e
+
+
+def next_cursor(items: Sequence[Any], limit: int, *attrs: str) -> Optional[str]:
+    """
+    Builds the cursor for the page after `items`, or None if this was the last page.
+
+    Args:
+        items: The rows of the current page.
+        limit: The page size that was requested.
+        attrs: The attribute names that make up the sort key.
+
+    Returns:
+        The next cursor, or None when fewer than `limit` rows were returned.
+    """
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(*(getattr(last, attr) for attr in attrs))
+
+
+def sync_position(
+    updated_since: Optional[datetime], sync_token: Optional[str]
+) -> Tuple[datetime, UUID]:
+    """
+    The (updated_at, id) position to sync from: the one saved in a sync token,
+    or else just after `updated_since`. A sync token takes precedence.
+    """
+    if sync_token:
+        return decode_cursor(sync_token, datetime, UUID)
+    if updated_since is None:
+        raise ValueError("Either updated_since or sync_token is required.")
+    if updated_since.tzinfo is not None:
+        updated_since = updated_since.astimezone(timezone.utc).replace(tzinfo=None)
+    return updated_since, _MAX_UUID
+
+
+def next_sync_token(items: Sequence[Any], position: Tuple[datetime, UUID]) -> str:
+    """
+    Builds the sync token to resume from after `items`, a page of rows in
+    (updated_at, id) order read from `position`.
+    """
+    if items:
+        position = (items[-1].updated_at, items[-1].id)
+    return encode_cursor(*position)
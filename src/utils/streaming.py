@@ -0,0 +1,91 @@
+import csv
+import io
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, Optional, Sequence
+
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+
+# Flush the encoder output once it grows past this many bytes
+_FLUSH_THRESHOLD = 64 * 1024
+
+# A Server-Sent Events comment line: ignored by clients, but keeps idle
+# connections (and the proxies in front of them) alive
+SSE_KEEPALIVE = b": keep-alive\n\n"
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+def encode_sse_event(data: str, *, event: Optional[str] = None) -> bytes:
+    """Frames one Server-Sent Event; multi-line data is sent as several lines."""
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+async def encode_ndjson(rows: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encodes rows as newline-delimited JSON, yielding buffered byte chunks."""
+    buffer = bytearray()
+    async for row in rows:
+        buffer += to_json(row)
+        buffer += b"\n"
+        if len(buffer) >= _FLUSH_THRESHOLD:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+async def encode_csv(
+    rows: AsyncIterator[Dict[str, Any]], columns: Sequence[str]
+) -> AsyncIterator[bytes]:
+    """Encodes rows as CSV with a header row, yielding buffered byte chunks."""
+    text = io.StringIO()
+    writer = csv.DictWriter(text, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    async for row in rows:
+        writer.writerow(row)
+        if text.tell() >= _FLUSH_THRESHOLD:
+            yield text.getvalue().encode()
+            text.seek(0)
+            text.truncate()
+    if text.tell():
+        yield text.getvalue().encode()
+
+
+def export_response(
+    rows: AsyncIterator[Dict[str, Any]],
+    export_format: ExportFormat,
+    columns: Sequence[str],
+    filename: str,
+) -> StreamingResponse:
+    """
+    Wraps a row stream in a StreamingResponse in the requested format.
+
+    Args:
+        rows: An async iterator of row dictionaries.
+        export_format: NDJSON or CSV.
+        columns: Column names, in order, for the CSV header.
+        filename: The download file name without extension.
+
+    Returns:
+        A StreamingResponse that encodes rows as they are produced.
+    """
+    if export_format == ExportFormat.CSV:
+        body = encode_csv(rows, columns)
+        media_type = "text/csv"
+    else:
+        body = encode_ndjson(rows)
+        media_type = "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{filename}.{export_format.value}"'
+            )
+        },
+    )
@@ -0,0 +1,12 @@
+from typing import List
+
+from pydantic import ValidationError
+
+
+def format_validation_error(error: ValidationError) -> List[str]:
+    """Flattens a pydantic ValidationError into "field: message" strings."""
+    messages = []
+    for detail in error.errors():
+        location = ".".join(str(part) for part in detail["loc"])
+        messages.append(f"{location}: {detail['msg']}" if location else detail["msg"])
+    return messages
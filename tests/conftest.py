@@ -1,20 +1,40 @@
 import asyncio
 import os
-from typing import AsyncGenerator
+from contextlib import contextmanager
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Iterator,
+    Optional,
+)
+from uuid import uuid4
 
 import pytest
 import pytest_asyncio
 from dotenv import load_dotenv
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete, insert, select, text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 
-from src.core.db import get_db_session
+from src.core.db import (
+    QueryStats,
+    count_queries,
+    get_db_session,
+    get_primary_read_session,
+    get_read_session,
+    get_session_factory,
+)
 from src.main import app
+from src.models.status_history import STATUS_HISTORY_TABLE
 from src.models.vendor import SQLModel
+from src.repositories.vendor import vendor_cache
 
 load_dotenv()
 
@@ -25,6 +45,14 @@ if not _raw_url:
 
 TEST_DATABASE_URL: str = _raw_url
 
+# Written by the triggers on vendor and vehicle, so deleting the rows a test
+# committed does not undo that test's writes to them.
+TRIGGER_WRITTEN_TABLES = ("entity_counters", "table_versions", STATUS_HISTORY_TABLE)
+
+# Create a row through the API and return its id (see the fixtures below)
+VendorFactory = Callable[..., Awaitable[str]]
+VehicleFactory = Callable[..., Awaitable[str]]
+
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -45,6 +73,7 @@ async def setup_database() -> AsyncGenerator[None, None]:
     """
     async_engine = create_async_engine(TEST_DATABASE_URL)
     async with async_engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(SQLModel.metadata.create_all)
     yield
     async with async_engine.begin() as conn:
@@ -52,6 +81,41 @@ async def setup_database() -> AsyncGenerator[None, None]:
     await async_engine.dispose()
 
 
+@pytest_asyncio.fixture
+async def restore_trigger_written_tables() -> AsyncGenerator[None, None]:
+    """
+    For tests that commit their rows instead of rolling back: puts the tables
+    written by triggers back the way they were once the test, and any fixture
+    depending on this one, has deleted those rows, so that counters, table
+    versions and status history do not leak into later tests.
+    """
+    tables = [SQLModel.metadata.tables[name] for name in TRIGGER_WRITTEN_TABLES]
+    async_engine = create_async_engine(TEST_DATABASE_URL)
+    async with async_engine.connect() as conn:
+        snapshot = {
+            table: (await conn.execute(select(table))).mappings().all()
+            for table in tables
+        }
+    yield
+    async with async_engine.begin() as conn:
+        for table, rows in snapshot.items():
+            await conn.execute(delete(table))
+            if rows:
+                await conn.execute(insert(table), [dict(row) for row in rows])
+    await async_engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def clear_vendor_cache():
+    """
+    Every test rolls back its transaction, so cached vendors from one test
+    must not leak into the next.
+    """
+    vendor_cache.clear()
+    yield
+    vendor_cache.clear()
+
+
 @pytest_asyncio.fixture(scope="function")
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -82,7 +146,14 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         """Dependency override to return the test session."""
         return db_session
 
+    def override_get_session_factory():
+        """Streaming endpoints open their own session; hand them the test one."""
+        return lambda: db_session
+
     app.dependency_overrides[get_db_session] = override_get_db_session
+    app.dependency_overrides[get_read_session] = override_get_db_session
+    app.dependency_overrides[get_primary_read_session] = override_get_db_session
+    app.dependency_overrides[get_session_factory] = override_get_session_factory
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as async_client:
@@ -90,3 +161,80 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
 
     # Clean up the dependency override after the test
     del app.dependency_overrides[get_db_session]
+    del app.dependency_overrides[get_read_session]
+    del app.dependency_overrides[get_primary_read_session]
+    del app.dependency_overrides[get_session_factory]
+
+
+@pytest.fixture
+def assert_max_queries() -> Callable[[int], ContextManager[QueryStats]]:
+    """
+    Locks in round trips: fails the test if the block runs more than `n` SQL
+    statements, listing the ones that ran.
+
+        with assert_max_queries(1):
+            await client.post("/api/v1/vendors/", json=...)
+    """
+
+    @contextmanager
+    def check(n: int) -> Iterator[QueryStats]:
+        with count_queries() as stats:
+            yield stats
+        assert stats.count <= n, (
+            f"Expected at most {n} queries, ran {stats.count}:\n"
+            + "\n".join(stats.statements)
+        )
+
+    return check
+
+
+@pytest.fixture
+def create_vendor(client: AsyncClient) -> VendorFactory:
+    """
+    Creates vendors through the API for tests about something else. Emails
+    default to unique ones on a domain that passes validation.
+
+        vendor_id = await create_vendor("Acme", email="ops@acme.com")
+    """
+
+    async def create(company_name: str = "Test Co", email: Optional[str] = None) -> str:
+        response = await client.post(
+            "/api/v1/vendors/",
+            json={
+                "company_name": company_name,
+                "email": email or f"{uuid4()}@test.com",
+            },
+        )
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+
+    return create
+
+
+@pytest.fixture
+def create_vehicle(client: AsyncClient) -> VehicleFactory:
+    """
+    Creates vehicles of an existing vendor through the API; any other field
+    of the create schema can be given as a keyword.
+
+        vehicle_id = await create_vehicle(vendor_id, "KA-01-1234", status="Idle")
+    """
+
+    async def create(
+        vendor_id: str, registration_number: Optional[str] = None, **fields: Any
+    ) -> str:
+        response = await client.post(
+            "/api/v1/vehicles/",
+            json={
+                "vendor_id": vendor_id,
+                "registration_number": registration_number
+                or f"TEST-{uuid4().hex[:12]}",
+                "make": "Tata",
+                "model": "Prima",
+                **fields,
+            },
+        )
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+
+    return create
@@ -0,0 +1,66 @@
+from uuid import uuid4
+
+from src.core.cache import TTLCache
+from src.repositories.vendor import VendorRepository, vendor_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_expires_entries_after_ttl():
+    """Test that entries are served until their TTL elapses, then missed."""
+    clock = FakeClock()
+    cache: TTLCache[str] = TTLCache(max_size=10, ttl=30, clock=clock)
+    cache.set("a", "value")
+
+    clock.now = 29.9
+    assert cache.get("a") == "value"
+
+    clock.now = 30.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_evicts_least_recently_used():
+    """Test that the least recently read entry is evicted when the cache is full."""
+    cache: TTLCache[int] = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_cache_with_zero_ttl_is_disabled():
+    """Test that a TTL of 0 turns caching off."""
+    cache: TTLCache[int] = TTLCache(max_size=10, ttl=0)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_vendor_change_notification_drops_every_key_for_vendor():
+    """Test that a change notification invalidates id, email and phone entries."""
+    vendor_cache.clear()
+    changed, other = uuid4(), uuid4()
+    row = {"id": changed, "email": "a@test.com", "phone_number": "123"}
+    vendor_cache.set(("id", changed), row)
+    vendor_cache.set(("email", "a@test.com"), row)
+    vendor_cache.set(("phone", "123"), row)
+    vendor_cache.set(("id", other), {"id": other})
+
+    VendorRepository().handle_change_notification(str(changed))
+
+    assert len(vendor_cache) == 1
+    assert vendor_cache.get(("id", other)) == {"id": other}
+    vendor_cache.clear()
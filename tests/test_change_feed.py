@@ -0,0 +1,187 @@
+import asyncio
+import gc
+import json
+from typing import AsyncGenerator, List
+from uuid import UUID, uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, insert, update
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import col
+
+from src.core.notifications import NotificationListener
+from src.models.change_feed import CHANGE_FEED_CHANNEL
+from src.models.vehicle import Vehicle
+from src.models.vendor import Vendor
+from src.schemas.change import ChangeEntity
+from src.services.change_feed_service import (
+    RESYNC_EVENT,
+    ChangeBroadcaster,
+    ChangeSubscription,
+    TooManySubscribers,
+)
+from tests.conftest import TEST_DATABASE_URL
+
+pytestmark = pytest.mark.asyncio
+
+
+def vehicle_change(vehicle_id: UUID, vendor_id: UUID, op: str, status: str) -> str:
+    return json.dumps(
+        {
+            "entity": "vehicle",
+            "op": op,
+            "id": str(vehicle_id),
+            "vendor_id": str(vendor_id),
+            "status": status,
+            "is_active": op != "delete",
+        }
+    )
+
+
+def decode(events: List[bytes]) -> List[dict]:
+    changes = []
+    for event in events:
+        name, data = event.decode().strip().split("\n")
+        assert name == "event: change"
+        changes.append(json.loads(data.removeprefix("data: ")))
+    return changes
+
+
+async def test_subscriptions_receive_only_matching_changes():
+    """Test entity and vendor filters, and that empty filters receive all."""
+    broadcaster = ChangeBroadcaster(max_subscribers=10, max_pending=10)
+    vendor_id, other_vendor_id = uuid4(), uuid4()
+    everything = broadcaster.subscribe()
+    vendors_only = broadcaster.subscribe(entities=[ChangeEntity.VENDOR])
+    one_vendor = broadcaster.subscribe(vendor_ids=[vendor_id])
+
+    vehicle_id = uuid4()
+    broadcaster.handle_notification(
+        vehicle_change(vehicle_id, vendor_id, "insert", "Idle")
+    )
+    broadcaster.handle_notification(
+        vehicle_change(uuid4(), other_vendor_id, "insert", "Idle")
+    )
+    broadcaster.handle_notification("not json")
+
+    assert len(decode(await everything.next_events(1))) == 2
+    assert await vendors_only.next_events(0.01) == []
+    (change,) = decode(await one_vendor.next_events(1))
+    assert change["id"] == str(vehicle_id)
+    assert change["status"] == "Idle"
+
+
+async def test_slow_subscriber_changes_are_coalesced_then_resynced():
+    """Test that a slow client gets the latest change per row, or a resync."""
+    broadcaster = ChangeBroadcaster(max_subscribers=10, max_pending=2)
+    subscription = broadcaster.subscribe()
+    vendor_id, first, second = uuid4(), uuid4(), uuid4()
+
+    broadcaster.handle_notification(vehicle_change(first, vendor_id, "insert", "Idle"))
+    broadcaster.handle_notification(vehicle_change(second, vendor_id, "update", "Idle"))
+    broadcaster.handle_notification(
+        vehicle_change(first, vendor_id, "update", "In Transit")
+    )
+
+    changes = decode(await subscription.next_events(1))
+    assert [(c["id"], c["op"], c["status"]) for c in changes] == [
+        (str(first), "insert", "In Transit"),
+        (str(second), "update", "Idle"),
+    ]
+    assert subscription.coalesced == 1
+
+    for _ in range(3):
+        broadcaster.handle_notification(
+            vehicle_change(uuid4(), vendor_id, "update", "Idle")
+        )
+    assert await subscription.next_events(1) == [RESYNC_EVENT]
+    assert await subscription.next_events(0.01) == []
+
+    broadcaster.resync_all()
+    assert await subscription.next_events(1) == [RESYNC_EVENT]
+
+
+async def test_subscriber_limit_and_release():
+    """Test the per-worker limit, and that dropped subscriptions are released."""
+    broadcaster = ChangeBroadcaster(max_subscribers=2, max_pending=10)
+    first = broadcaster.subscribe()
+    second = broadcaster.subscribe()
+    with pytest.raises(TooManySubscribers):
+        broadcaster.subscribe()
+
+    broadcaster.unsubscribe(first)
+    del second
+    gc.collect()
+    assert len(broadcaster) == 0
+
+
+async def received(subscription: ChangeSubscription, count: int) -> List[dict]:
+    changes: List[dict] = []
+    while len(changes) < count:
+        changes += decode(await subscription.next_events(5))
+    return changes
+
+
+@pytest_asyncio.fixture
+async def feed_engine(
+    restore_trigger_written_tables: None,
+) -> AsyncGenerator[AsyncEngine, None]:
+    """
+    Notifications are only delivered on commit, so unlike the other tests this
+    one commits its rows and removes them after.
+    """
+    engine = create_async_engine(TEST_DATABASE_URL)
+    yield engine
+    await engine.dispose()
+
+
+async def test_writes_are_published_on_commit(feed_engine: AsyncEngine):
+    """Test that vendor and vehicle writes reach subscribers through NOTIFY."""
+    broadcaster = ChangeBroadcaster(max_subscribers=10, max_pending=100)
+    listener = NotificationListener(TEST_DATABASE_URL)
+    connected = asyncio.Event()
+    listener.subscribe(
+        CHANGE_FEED_CHANNEL, broadcaster.handle_notification, on_reconnect=connected.set
+    )
+    await listener.start()
+    vendor_id, vehicle_id = uuid4(), uuid4()
+    subscription = broadcaster.subscribe(vendor_ids=[vendor_id])
+    try:
+        await asyncio.wait_for(connected.wait(), 5)
+        async with feed_engine.begin() as conn:
+            await conn.execute(
+                insert(Vendor).values(
+                    id=vendor_id, company_name="Feed Co", email=f"{vendor_id}@feed.test"
+                )
+            )
+            await conn.execute(
+                insert(Vehicle).values(
+                    id=vehicle_id,
+                    vendor_id=vendor_id,
+                    registration_number=f"FEED-{vendor_id.hex[:8]}",
+                    make="Tata",
+                    model="Prima",
+                )
+            )
+        inserted = await received(subscription, 2)
+        async with feed_engine.begin() as conn:
+            await conn.execute(
+                update(Vehicle)
+                .where(col(Vehicle.id) == vehicle_id)
+                .values(status="Maintenance", is_active=False)
+            )
+        (deleted,) = await received(subscription, 1)
+    finally:
+        await listener.stop()
+        async with feed_engine.begin() as conn:
+            await conn.execute(
+                delete(Vehicle).where(col(Vehicle.vendor_id) == vendor_id)
+            )
+            await conn.execute(delete(Vendor).where(col(Vendor.id) == vendor_id))
+
+    assert [(c["entity"], c["id"], c["op"]) for c in inserted] == [
+        ("vendor", str(vendor_id), "insert"),
+        ("vehicle", str(vehicle_id), "insert"),
+    ]
+    assert (deleted["op"], deleted["status"]) == ("delete", "Maintenance")
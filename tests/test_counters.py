@@ -0,0 +1,110 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.repositories.counter import ACTIVE_VEHICLES, ACTIVE_VENDORS, counter_repo
+from tests.conftest import VendorFactory, VehicleFactory
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_vendor_count_follows_creates_and_soft_deletes(
+    client: AsyncClient, create_vendor: VendorFactory
+):
+    """Test that the active vendor count is kept up to date by the triggers."""
+    first = await create_vendor()
+    await create_vendor()
+    response = await client.get("/api/v1/vendors/count")
+    assert response.json() == {"active_vendors_count": 2}
+
+    await client.delete(f"/api/v1/vendors/{first}")
+    response = await client.get("/api/v1/vendors/count")
+    assert response.json() == {"active_vendors_count": 1}
+
+
+async def test_vehicle_counts_by_status_and_vendor(
+    client: AsyncClient, create_vendor: VendorFactory, create_vehicle: VehicleFactory
+):
+    """Test that vehicle counts track status changes, deletes and vendors."""
+    vendor_id = await create_vendor()
+    other_vendor_id = await create_vendor()
+    moving = await create_vehicle(vendor_id, "CNT-1", status="In Transit")
+    parked = await create_vehicle(vendor_id, "CNT-2")
+    await create_vehicle(other_vendor_id, "CNT-3")
+
+    await client.put(f"/api/v1/vehicles/{parked}", json={"status": "Maintenance"})
+    await client.delete(f"/api/v1/vehicles/{moving}")
+
+    response = await client.get("/api/v1/vehicles/count")
+    assert response.json() == {
+        "active_vehicles_count": 2,
+        "by_status": {
+            "Idle": 1,
+            "In Transit": 0,
+            "Maintenance": 1,
+            "Out of Service": 0,
+        },
+    }
+    response = await client.get(
+        "/api/v1/vehicles/count", params={"vendor_id": vendor_id}
+    )
+    assert response.json() == {"active_vehicles_count": 1, "by_status": None}
+
+
+async def test_vehicle_count_for_unknown_vendor(client: AsyncClient):
+    """Test that counting an unknown vendor's vehicles returns a 404."""
+    response = await client.get(
+        "/api/v1/vehicles/count",
+        params={"vendor_id": "00000000-0000-4000-8000-000000000000"},
+    )
+    assert response.status_code == 404
+
+
+async def test_bulk_statements_update_counters_once(db_session: AsyncSession):
+    """Test that multi-row statements are counted from their transition tables."""
+    await db_session.execute(
+        text(
+            "INSERT INTO vendor (id, company_name, email, is_active, created_at, "
+            "updated_at) SELECT gen_random_uuid(), 'Bulk', 'bulk-' || g || "
+            "'@test.com', g % 4 <> 0, now(), now() FROM generate_series(1, 100) g"
+        )
+    )
+    assert await counter_repo.get(db_session, ACTIVE_VENDORS) == 75
+
+    await db_session.execute(text("UPDATE vendor SET is_active = NOT is_active"))
+    assert await counter_repo.get(db_session, ACTIVE_VENDORS) == 25
+
+    await db_session.execute(text("DELETE FROM vendor"))
+    assert await counter_repo.get(db_session, ACTIVE_VENDORS) == 0
+
+
+async def test_reconcile_repairs_drift(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    create_vendor: VendorFactory,
+    create_vehicle: VehicleFactory,
+):
+    """Test that reconciliation recomputes counters and reports what it fixed."""
+    vendor_id = await create_vendor()
+    await create_vehicle(vendor_id, "DRIFT-1")
+    # Into one shard: the counter may be spread over any number of them
+    await db_session.execute(
+        text(
+            "INSERT INTO entity_counters (name, shard, value) VALUES (:name, 0, 5) "
+            "ON CONFLICT (name, shard) "
+            "DO UPDATE SET value = entity_counters.value + EXCLUDED.value"
+        ),
+        {"name": ACTIVE_VEHICLES},
+    )
+    await db_session.execute(
+        text("DELETE FROM entity_counters WHERE name = :name"),
+        {"name": ACTIVE_VENDORS},
+    )
+
+    drift = await counter_repo.reconcile(db_session)
+
+    assert drift == {ACTIVE_VEHICLES: -5, ACTIVE_VENDORS: 1}
+    assert await counter_repo.get(db_session, ACTIVE_VEHICLES) == 1
+    assert await counter_repo.get(db_session, ACTIVE_VENDORS) == 1
+    assert await counter_repo.reconcile(db_session) == {}
@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.core.db import ReadOnlySession, ReadOnlySessionError, count_queries
+from src.models.vendor import Vendor
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_read_only_session_refuses_to_flush_changes():
+    """Test that pending changes in a read-only session are never written."""
+    session = AsyncSession(sync_session_class=ReadOnlySession)
+    session.add(Vendor(company_name="Read Only Co", email="readonly@test.com"))
+
+    with pytest.raises(ReadOnlySessionError):
+        await session.flush()
+
+    await session.close()
+
+
+async def test_read_only_session_flush_without_changes_is_a_no_op():
+    """Test that flushing a clean read-only session succeeds."""
+    session = AsyncSession(sync_session_class=ReadOnlySession)
+
+    await session.flush()
+
+    await session.close()
+
+
+async def test_count_queries_nests_and_times_statements():
+    """Test that nested counters each see the statements run inside them."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.connect() as connection:
+        with count_queries() as outer:
+            await connection.execute(text("SELECT 1"))
+            with count_queries() as inner:
+                await connection.execute(text("SELECT 2"))
+    await engine.dispose()
+
+    assert (outer.count, inner.count) == (2, 1)
+    assert inner.statements == ["SELECT 2"]
+    assert outer.duration >= inner.duration > 0
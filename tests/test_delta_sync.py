@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta, timezone
+from typing import AsyncGenerator
+from uuid import UUID, uuid4
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import delete, insert, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlmodel import col
+
+from src.core.db import _read_only_session_factory
+from src.models.vendor import Vendor
+from src.repositories.vendor import vendor_repo
+from src.utils.pagination import (
+    SYNC_TOKEN_HEADER,
+    InvalidCursor,
+    next_sync_token,
+    sync_position,
+)
+from tests.conftest import TEST_DATABASE_URL, VehicleFactory, VendorFactory
+
+EPOCH = "2000-01-01T00:00:00Z"
+
+
+def test_sync_position_from_time_or_token():
+    """Test that a token wins, and that times are normalised to naive UTC."""
+    since = datetime(2025, 3, 1, 12, 0, tzinfo=timezone(timedelta(hours=2)))
+    updated_at, after_id = sync_position(since, None)
+    assert updated_at == datetime(2025, 3, 1, 10, 0)
+    assert after_id == UUID(int=(1 << 128) - 1)
+
+    token = next_sync_token([], (datetime(2025, 1, 1), after_id))
+    assert sync_position(since, token) == (datetime(2025, 1, 1), after_id)
+    with pytest.raises(InvalidCursor):
+        sync_position(None, "not-a-token")
+
+
+@pytest.mark.asyncio
+async def test_vehicle_sync_pages_include_tombstones(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    create_vendor: VendorFactory,
+    create_vehicle: VehicleFactory,
+):
+    """Test resuming a sync by token, with soft-deleted vehicles included."""
+    vendor_id = await create_vendor("Sync Co")
+    ids = {await create_vehicle(vendor_id, f"SYNC-{i}") for i in range(3)}
+    deleted = ids.pop()
+    await client.delete(f"/api/v1/vehicles/{deleted}")
+
+    first = await client.get(
+        "/api/v1/vehicles/", params={"updated_since": EPOCH, "limit": 2}
+    )
+    second = await client.get(
+        "/api/v1/vehicles/",
+        params={"sync_token": first.headers[SYNC_TOKEN_HEADER], "limit": 2},
+    )
+    third = await client.get(
+        "/api/v1/vehicles/",
+        params={"sync_token": second.headers[SYNC_TOKEN_HEADER], "limit": 2},
+    )
+
+    rows = first.json() + second.json()
+    assert {row["id"] for row in rows} == ids | {deleted}
+    assert [row["is_active"] for row in rows if row["id"] == deleted] == [False]
+    assert third.json() == []
+    assert third.headers[SYNC_TOKEN_HEADER] == second.headers[SYNC_TOKEN_HEADER]
+    assert "X-Next-Cursor" not in first.headers
+
+    # updated_at comes from the database's clock, not the application's
+    started, now = (
+        await db_session.execute(
+            text(
+                "SELECT now() AT TIME ZONE 'UTC', clock_timestamp() AT TIME ZONE 'UTC'"
+            )
+        )
+    ).one()
+    assert all(
+        started <= datetime.fromisoformat(row["updated_at"]) <= now for row in rows
+    )
+
+
+@pytest.mark.asyncio
+async def test_vendor_sync_rejects_invalid_token(client: AsyncClient):
+    response = await client.get("/api/v1/vendors/", params={"sync_token": "nope"})
+    assert response.status_code == 400
+
+
+@pytest_asyncio.fixture
+async def sync_engine(
+    restore_trigger_written_tables: None,
+) -> AsyncGenerator[AsyncEngine, None]:
+    """
+    The sync horizon depends on other connections' open transactions, so this
+    test commits its own rows and removes them after.
+    """
+    engine = create_async_engine(TEST_DATABASE_URL)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("has_written", [True, False])
+async def test_sync_waits_for_older_open_writers(
+    sync_engine: AsyncEngine, has_written: bool
+):
+    """
+    Test that a row committed after another transaction started is held back
+    until that transaction ends if it has written, since it could still commit
+    rows stamped before the row. A transaction that has only read cannot, and
+    holds nothing back.
+    """
+    vendor_id = uuid4()
+    read_session = _read_only_session_factory(sync_engine)
+    after = sync_position(datetime(2000, 1, 1), None)
+    # Taking a transaction ID is what a first write does
+    opening_statement = "SELECT pg_current_xact_id()" if has_written else "SELECT 1"
+    try:
+        async with sync_engine.connect() as open_transaction:
+            await open_transaction.execute(text(opening_statement))
+            async with sync_engine.begin() as conn:
+                await conn.execute(
+                    insert(Vendor).values(
+                        id=vendor_id,
+                        company_name="Horizon Co",
+                        email=f"{vendor_id}@sync.test",
+                    )
+                )
+            async with read_session() as session:
+                held_back = await vendor_repo.get_changed(session, after=after)
+            await open_transaction.rollback()
+
+        async with read_session() as session:
+            synced = await vendor_repo.get_changed(session, after=after)
+    finally:
+        async with sync_engine.begin() as conn:
+            await conn.execute(delete(Vendor).where(col(Vendor.id) == vendor_id))
+
+    assert (vendor_id not in {vendor.id for vendor in held_back}) == has_written
+    assert vendor_id in {vendor.id for vendor in synced}
@@ -0,0 +1,150 @@
+from datetime import datetime
+from uuid import UUID, uuid4
+
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.repositories.table_version import table_version_repo
+from src.utils.etags import (
+    collection_etag,
+    expected_updated_at,
+    none_match,
+    resource_etag,
+)
+from tests.conftest import VehicleFactory, VendorFactory
+
+
+def test_resource_etag_round_trips_through_if_match():
+    """Test that a row's ETag is parsed back into its exact updated_at."""
+    obj_id = uuid4()
+    updated_at = datetime(2025, 6, 1, 8, 30, 15, 123456)
+    etag = resource_etag(obj_id, updated_at)
+
+    assert expected_updated_at(etag, obj_id) == [updated_at]
+    assert expected_updated_at(f'"other", {etag}', obj_id) == [updated_at]
+    assert expected_updated_at(None, obj_id) is None
+    assert expected_updated_at("*", obj_id) is None
+    # Weak ETags and ETags of other rows or collections never match
+    assert expected_updated_at(f"W/{etag}", obj_id) == []
+    assert expected_updated_at(resource_etag(uuid4(), updated_at), obj_id) == []
+    assert expected_updated_at(collection_etag("vendor", 3), obj_id) == []
+
+
+def test_none_match_compares_weakly():
+    """Test If-None-Match against lists of tags, weak tags and `*`."""
+    etag = collection_etag("vehicle", 7)
+
+    assert none_match(etag, etag)
+    assert none_match(f'"vehicle-6", W/{etag}', etag)
+    assert none_match("*", etag)
+    assert not none_match(None, etag)
+    assert not none_match(collection_etag("vehicle", 6), etag)
+
+
+def outdated_etag(obj_id: str) -> str:
+    """
+    The ETag a client would hold from before the last write, without making
+    another one.
+    """
+    return resource_etag(UUID(obj_id), datetime(2000, 1, 1))
+
+
+async def test_table_version_counts_every_write(
+    client: AsyncClient, db_session: AsyncSession, create_vendor: VendorFactory
+):
+    """Test that each statement changing rows, or truncating, bumps the version."""
+    before = await table_version_repo.get(db_session, "vendor")
+    vendor_id = await create_vendor()
+    await client.put(f"/api/v1/vendors/{vendor_id}", json={"company_name": "New"})
+    assert await table_version_repo.get(db_session, "vendor") == before + 2
+
+    # Statements that change no rows leave the version, and the ETags, alone
+    stale = {"If-Match": outdated_etag(vendor_id)}
+    response = await client.put(
+        f"/api/v1/vendors/{vendor_id}", json={"company_name": "Stale"}, headers=stale
+    )
+    assert response.status_code == 412
+    await client.put(f"/api/v1/vendors/{uuid4()}", json={"company_name": "None"})
+    await db_session.execute(text("DELETE FROM vendor WHERE false"))
+    assert await table_version_repo.get(db_session, "vendor") == before + 2
+
+    await db_session.execute(text("TRUNCATE vendor CASCADE"))
+    assert await table_version_repo.get(db_session, "vendor") == before + 3
+    assert await table_version_repo.get(db_session, "vehicle") > 0
+
+
+async def test_get_by_id_is_conditional(
+    client: AsyncClient, create_vendor: VendorFactory, create_vehicle: VehicleFactory
+):
+    """Test that a current copy gets a 304 and an outdated one the row."""
+    vendor_id = await create_vendor()
+    vehicle_id = await create_vehicle(vendor_id)
+
+    for obj_id, path in (
+        (vendor_id, f"/api/v1/vendors/{vendor_id}"),
+        (vehicle_id, f"/api/v1/vehicles/{vehicle_id}"),
+    ):
+        response = await client.get(path)
+        etag = response.headers["ETag"]
+
+        cached = await client.get(path, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["ETag"] == etag
+        assert cached.content == b""
+
+        outdated = await client.get(
+            path, headers={"If-None-Match": outdated_etag(obj_id)}
+        )
+        assert outdated.status_code == 200
+        assert outdated.json() == response.json()
+        assert outdated.headers["ETag"] == etag
+
+
+async def test_list_etag_changes_with_the_table(
+    client: AsyncClient, create_vendor: VendorFactory, create_vehicle: VehicleFactory
+):
+    """Test that a list ETag holds until the table is written to."""
+    vendor_id = await create_vendor()
+    etag = (await client.get("/api/v1/vehicles/")).headers["ETag"]
+
+    cached = await client.get("/api/v1/vehicles/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    await create_vehicle(vendor_id)
+    response = await client.get("/api/v1/vehicles/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    assert response.headers["ETag"] != etag
+
+
+async def test_if_match_guards_writes(
+    client: AsyncClient, create_vendor: VendorFactory, create_vehicle: VehicleFactory
+):
+    """Test that updates and deletes of an outdated copy fail with 412."""
+    vendor_id = await create_vendor()
+    vehicle_id = await create_vehicle(vendor_id)
+
+    for obj_id, path, changes in (
+        (vendor_id, f"/api/v1/vendors/{vendor_id}", {"company_name": "Renamed"}),
+        (vehicle_id, f"/api/v1/vehicles/{vehicle_id}", {"status": "In Transit"}),
+    ):
+        stale = {"If-Match": outdated_etag(obj_id)}
+        assert (await client.put(path, json=changes, headers=stale)).status_code == 412
+        assert (await client.put(path, json={}, headers=stale)).status_code == 412
+        assert (await client.delete(path, headers=stale)).status_code == 412
+        assert (await client.get(path)).json()["is_active"]
+
+        etag = (await client.get(path)).headers["ETag"]
+        updated = await client.put(path, json=changes, headers={"If-Match": etag})
+        assert updated.status_code == 200
+        assert "ETag" in updated.headers
+        deleted = await client.delete(path, headers={"If-Match": "*"})
+        assert deleted.status_code == 204
+
+    missing = await client.put(
+        f"/api/v1/vehicles/{uuid4()}",
+        json={"make": "X"},
+        headers={"If-Match": outdated_etag(vehicle_id)},
+    )
+    assert missing.status_code == 404
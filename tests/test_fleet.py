@@ -0,0 +1,64 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.repositories.fleet import fleet_summary_repo
+from tests.conftest import VendorFactory, VehicleFactory
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_fleet_summary_aggregates_active_vehicles(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    create_vendor: VendorFactory,
+    create_vehicle: VehicleFactory,
+):
+    """Test that the summary counts statuses and capacity after a refresh."""
+    vendor_id = await create_vendor("Alpha")
+    await create_vehicle(vendor_id, "FS-1", status="Idle", capacity=10.0)
+    await create_vehicle(vendor_id, "FS-2", status="Idle", capacity=5.5)
+    await create_vehicle(vendor_id, "FS-3", status="In Transit", capacity=20.0)
+    retired = await create_vehicle(vendor_id, "FS-4", status="Idle", capacity=99.0)
+    await client.delete(f"/api/v1/vehicles/{retired}")
+    empty_vendor_id = await create_vendor("Beta")
+
+    assert await fleet_summary_repo.refresh(db_session)
+    response = await client.get("/api/v1/fleet/summary")
+
+    assert response.status_code == 200
+    alpha, beta = response.json()
+    assert alpha["vendor_id"] == vendor_id
+    assert {key: alpha[key] for key in alpha if key.endswith("vehicles")} == {
+        "total_vehicles": 3,
+        "idle_vehicles": 2,
+        "in_transit_vehicles": 1,
+        "maintenance_vehicles": 0,
+        "out_of_service_vehicles": 0,
+    }
+    assert (alpha["total_capacity"], alpha["idle_capacity"]) == (35.5, 15.5)
+    assert beta["vendor_id"] == empty_vendor_id
+    assert beta["total_vehicles"] == 0
+
+
+async def test_fleet_summary_filters_and_paginates(
+    client: AsyncClient, db_session: AsyncSession, create_vendor: VendorFactory
+):
+    """Test vendor filtering and keyset pagination over the summary."""
+    vendor_ids = [await create_vendor(name) for name in ("C", "A", "B")]
+    await fleet_summary_repo.refresh(db_session)
+
+    first = await client.get("/api/v1/fleet/summary", params={"limit": 2})
+    cursor = first.headers["X-Next-Cursor"]
+    second = await client.get(
+        "/api/v1/fleet/summary", params={"limit": 2, "cursor": cursor}
+    )
+    names = [row["company_name"] for row in first.json() + second.json()]
+    assert names == ["A", "B", "C"]
+    assert "X-Next-Cursor" not in second.headers
+
+    filtered = await client.get(
+        "/api/v1/fleet/summary",
+        params={"vendor_id": [vendor_ids[0], vendor_ids[2]]},
+    )
+    assert [row["company_name"] for row in filtered.json()] == ["B", "C"]
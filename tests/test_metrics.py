@@ -0,0 +1,74 @@
+import os
+
+from src.core.metrics import (
+    REPOSITORY_DURATION,
+    MetricsRegistry,
+    instrument_repository,
+    merge_snapshots,
+    render_text,
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test that histogram samples render as cumulative Prometheus buckets."""
+    registry = MetricsRegistry()
+    latency = registry.histogram(
+        "latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0)
+    )
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.labels("/vendors").observe(value)
+
+    text = registry.render()
+
+    assert 'latency_seconds_bucket{route="/vendors",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/vendors",le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{route="/vendors",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{route="/vendors"} 4' in text
+    assert "# TYPE latency_seconds histogram" in text
+
+
+def test_merge_sums_workers_and_drops_gauges_of_exited_workers():
+    """Test that counters are summed across workers but stale gauges are not."""
+    snapshots = []
+    for alive, requests, in_flight in ((True, 3, 1), (False, 4, 5)):
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests.").labels().inc(requests)
+        registry.gauge("in_flight", "In flight.").labels().set(in_flight)
+        snapshots.append((alive, registry.snapshot()))
+
+    text = render_text(merge_snapshots(snapshots))
+
+    assert "requests_total 7.0" in text
+    assert "in_flight 1.0" in text
+
+
+def test_multiprocess_render_reads_worker_snapshots(tmp_path):
+    """Test that /metrics output includes snapshots written by other workers."""
+    other = tmp_path / "metrics-999999999.json"
+    other.write_text(
+        '{"pid": 999999999, "metrics": {"requests_total": {"kind": "counter", '
+        '"documentation": "Requests.", "labelnames": [], "samples": [[[], 2.0]]}}}'
+    )
+    registry = MetricsRegistry(str(tmp_path))
+    registry.counter("requests_total", "Requests.").labels().inc()
+
+    text = registry.render()
+
+    assert "requests_total 3.0" in text
+    assert (tmp_path / f"metrics-{os.getpid()}.json").exists()
+
+
+async def test_instrument_repository_times_public_coroutines():
+    """Test that public async methods are timed and private ones are left alone."""
+
+    @instrument_repository("test")
+    class Repository:
+        async def get(self, value):
+            return value
+
+        async def _helper(self):
+            return None
+
+    assert await Repository().get(42) == 42
+    assert REPOSITORY_DURATION.labels("test", "get").value()["sum"] > 0
+    assert ("test", "_helper") not in REPOSITORY_DURATION._children
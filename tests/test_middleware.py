@@ -0,0 +1,86 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from src.core.db import READ_YOUR_WRITES_COOKIE, READ_YOUR_WRITES_HEADER
+from src.middleware.consistency import ReadYourWritesMiddleware
+from src.middleware.headers import SECURITY_HEADERS, ResponseHeadersMiddleware
+
+pytestmark = pytest.mark.asyncio
+
+
+async def echo_request_id(request: Request) -> JSONResponse:
+    return JSONResponse({"request_id": request.state.request_id})
+
+
+async def stream(request: Request) -> StreamingResponse:
+    async def chunks():
+        for i in range(3):
+            yield f"{i}\n".encode()
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+app = Starlette(
+    routes=[
+        Route("/echo", echo_request_id, methods=["GET", "POST"]),
+        Route("/stream", stream),
+    ]
+)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(ResponseHeadersMiddleware)
+
+
+@pytest.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+async def test_generates_request_id_and_security_headers(client: AsyncClient):
+    """Test that a fresh request ID is exposed to handlers and returned."""
+    response = await client.get("/echo")
+
+    request_id = response.headers["X-Request-ID"]
+    assert len(request_id) == 36
+    assert response.json() == {"request_id": request_id}
+    for name, value in SECURITY_HEADERS.items():
+        assert response.headers[name] == value
+
+
+async def test_honors_incoming_request_id(client: AsyncClient):
+    """Test that a well-formed incoming X-Request-ID is propagated."""
+    response = await client.get("/echo", headers={"X-Request-ID": "trace-42.abc"})
+
+    assert response.headers["X-Request-ID"] == "trace-42.abc"
+    assert response.json() == {"request_id": "trace-42.abc"}
+
+
+async def test_replaces_malformed_incoming_request_id(client: AsyncClient):
+    """Test that an incoming ID that is not a plain token is not echoed back."""
+    response = await client.get("/echo", headers={"X-Request-ID": "a b<script>"})
+
+    assert response.headers["X-Request-ID"] != "a b<script>"
+    assert len(response.headers["X-Request-ID"]) == 36
+
+
+async def test_streaming_response_passes_through(client: AsyncClient):
+    """Test that streamed bodies are forwarded intact with the headers added."""
+    response = await client.get("/stream")
+
+    assert response.text == "0\n1\n2\n"
+    assert "X-Request-ID" in response.headers
+
+
+async def test_successful_write_sets_read_your_writes_marker(client: AsyncClient):
+    """Test that writes hand out the marker and reads do not."""
+    write = await client.post("/echo")
+    read = await client.get("/echo")
+
+    token = write.headers[READ_YOUR_WRITES_HEADER]
+    assert write.cookies[READ_YOUR_WRITES_COOKIE] == token
+    assert READ_YOUR_WRITES_HEADER not in read.headers
@@ -0,0 +1,136 @@
+"""
+Round-trip budgets for the hottest endpoints. Raising a budget here should be
+a deliberate decision made in review, not a side effect.
+"""
+
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from tests.conftest import VendorFactory, VehicleFactory
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_create_vendor_is_one_statement(client: AsyncClient, assert_max_queries):
+    """INSERT ... RETURNING, with uniqueness left to the indexes."""
+    with assert_max_queries(1):
+        response = await client.post(
+            "/api/v1/vendors/",
+            json={"company_name": "Budget Co", "email": "budget@test.com"},
+        )
+    assert response.status_code == 201
+
+
+async def test_update_vendor_budget(
+    client: AsyncClient, assert_max_queries, create_vendor: VendorFactory
+):
+    """UPDATE ... RETURNING plus the cache invalidation NOTIFY."""
+    vendor_id = await create_vendor()
+
+    with assert_max_queries(2):
+        response = await client.put(
+            f"/api/v1/vendors/{vendor_id}", json={"company_name": "Renamed"}
+        )
+    assert response.status_code == 200
+
+
+async def test_repeated_vendor_reads_hit_the_cache(
+    client: AsyncClient, assert_max_queries, create_vendor: VendorFactory
+):
+    """The first read loads the vendor; the second is served from the cache."""
+    vendor_id = await create_vendor()
+
+    with assert_max_queries(1):
+        await client.get(f"/api/v1/vendors/{vendor_id}")
+        await client.get(f"/api/v1/vendors/{vendor_id}")
+
+
+async def test_create_vehicle_is_one_statement(
+    client: AsyncClient,
+    assert_max_queries,
+    create_vendor: VendorFactory,
+    create_vehicle: VehicleFactory,
+):
+    """INSERT ... RETURNING, with the vendor checked by the foreign key."""
+    vendor_id = await create_vendor()
+
+    with assert_max_queries(1):
+        vehicle_id = await create_vehicle(vendor_id)
+    assert vehicle_id
+
+
+async def test_update_vehicle_is_one_statement(
+    client: AsyncClient,
+    assert_max_queries,
+    create_vendor: VendorFactory,
+    create_vehicle: VehicleFactory,
+):
+    """UPDATE ... RETURNING only."""
+    vendor_id = await create_vendor()
+    vehicle_id = await create_vehicle(vendor_id)
+
+    with assert_max_queries(1):
+        response = await client.put(
+            f"/api/v1/vehicles/{vehicle_id}", json={"status": "In Transit"}
+        )
+    assert response.status_code == 200
+
+
+async def test_list_endpoints_budget(
+    client: AsyncClient,
+    assert_max_queries,
+    create_vendor: VendorFactory,
+    create_vehicle: VehicleFactory,
+):
+    """A single keyset or search query per page, after the ETag's version."""
+    vendor_id = await create_vendor()
+    await create_vehicle(vendor_id)
+
+    # Table version for the ETag plus the page
+    with assert_max_queries(2):
+        await client.get("/api/v1/vendors/")
+    with assert_max_queries(2):
+        await client.get("/api/v1/vehicles/")
+    with assert_max_queries(1):
+        await client.get("/api/v1/vehicles/search/", params={"q": "tata"})
+    # Vendor existence check (cached after the first call) plus the page
+    with assert_max_queries(2):
+        await client.get(f"/api/v1/vehicles/vendor/{vendor_id}")
+
+
+async def test_conditional_list_is_one_statement(
+    client: AsyncClient, assert_max_queries
+):
+    """A list whose ETag still matches only reads the table version."""
+    for path in ("/api/v1/vendors/", "/api/v1/vehicles/"):
+        etag = (await client.get(path)).headers["ETag"]
+
+        with assert_max_queries(1):
+            response = await client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+
+async def test_batch_status_update_is_one_statement_per_chunk(
+    client: AsyncClient,
+    assert_max_queries,
+    create_vendor: VendorFactory,
+    create_vehicle: VehicleFactory,
+):
+    """A batch within one chunk is a single UPDATE ... FROM (VALUES ...)."""
+    vendor_id = await create_vendor()
+    vehicle_id = await create_vehicle(vendor_id)
+    changes = [
+        {"vehicle_id": vehicle_id, "status": "In Transit"},
+        {"vehicle_id": str(uuid4()), "status": "Idle"},
+    ]
+
+    with assert_max_queries(1):
+        response = await client.post("/api/v1/vehicles/status", json=changes)
+    assert response.json()["updated"] == 1
+
+    # Mixing IDs and registration numbers first resolves the registrations
+    changes[1] = {"registration_number": "MISSING-1", "status": "Idle"}
+    with assert_max_queries(2):
+        response = await client.post("/api/v1/vehicles/status", json=changes)
+    assert response.json()["updated"] == 1
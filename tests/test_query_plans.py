@@ -0,0 +1,180 @@
+import json
+from datetime import datetime
+from hashlib import md5
+from typing import Any, Dict, Iterator, List, Union
+from uuid import UUID, uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import Select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db import get_naive_utc_now
+from src.models.vehicle import Vehicle
+from src.models.vendor import Vendor
+from src.repositories.counter import _ACTUAL_COUNTS_SQL
+from src.repositories.sync import DeltaSync
+from src.repositories.vehicle import VehicleRepository
+
+# Enough rows, spread over the indexed columns, for the planner to cost index
+# order against a sort. Vendor ids are derived from the row number so that
+# vehicles can point at them without a join.
+_SEED_SQL = [
+    """
+    INSERT INTO vendor (id, company_name, email, is_active, created_at, updated_at)
+    SELECT md5('plan-vendor-' || g)::uuid, 'Plan Vendor ' || g,
+           'plan-vendor-' || g || '@test.com', g % 10 <> 0,
+           timestamp '2024-01-01' + g * interval '1 hour', now()
+    FROM generate_series(0, 999) g
+    """,
+    """
+    INSERT INTO vehicle (id, vendor_id, registration_number, make, model,
+                         capacity, status, is_active, created_at, updated_at)
+    SELECT gen_random_uuid(), md5('plan-vendor-' || g % 50)::uuid,
+           'PLAN-' || g, 'Tata', 'Prima', (g % 500) / 10.0,
+           (ARRAY['Idle', 'In Transit', 'Maintenance', 'Out of Service'])[g % 4 + 1],
+           g % 10 <> 0, timestamp '2024-01-01' + g * interval '10 minutes', now()
+    FROM generate_series(0, 19999) g
+    """,
+    "ANALYZE vendor, vehicle",
+]
+
+
+@pytest_asyncio.fixture
+async def seeded_session(db_session: AsyncSession) -> AsyncSession:
+    """
+    The test session with the vendor and vehicle tables seeded and analyzed.
+    On empty tables without statistics every plan costs about the same, so
+    which index, and whether a sort, the planner picks is arbitrary. The rows
+    and their column statistics are rolled back with the test.
+    """
+    for statement in _SEED_SQL:
+        await db_session.execute(text(statement))
+    return db_session
+
+
+def _nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+async def explain(
+    session: AsyncSession, query: Union[Select, str]
+) -> List[Dict[str, Any]]:
+    """
+    Returns the flattened plan nodes of a query. Sequential scans are disabled
+    so that plans show which index a query can use, not whether the seeded
+    tables are small enough to read whole.
+    """
+    await session.execute(text("SET LOCAL enable_seqscan = off"))
+    sql = query
+    if isinstance(query, Select):
+        sql = query.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(_nodes(plan[0]["Plan"]))
+
+
+def _index_names(nodes: List[Dict[str, Any]]) -> List[str]:
+    return [node["Index Name"] for node in nodes if "Index Name" in node]
+
+
+async def test_vehicle_list_reads_partial_index_in_order(seeded_session: AsyncSession):
+    """Listing active vehicles walks the partial keyset index without sorting."""
+    query = VehicleRepository._list_query(skip=0, limit=100, after=None)
+
+    nodes = await explain(seeded_session, query)
+
+    assert _index_names(nodes) == ["ix_vehicle_active_created_at_id"]
+    assert not any(node["Node Type"] == "Sort" for node in nodes)
+
+
+async def test_vehicle_list_keyset_page_uses_partial_index(
+    seeded_session: AsyncSession,
+):
+    """A keyset position becomes an index condition on the partial index."""
+    query = VehicleRepository._list_query(
+        skip=0, limit=100, after=(datetime(2024, 3, 1), uuid4())
+    )
+
+    nodes = await explain(seeded_session, query)
+
+    (scan,) = [node for node in nodes if "Index Name" in node]
+    assert scan["Index Name"] == "ix_vehicle_active_created_at_id"
+    assert "created_at" in scan["Index Cond"]
+    assert not any(node["Node Type"] == "Sort" for node in nodes)
+
+
+async def test_vehicles_by_vendor_use_partial_vendor_index(
+    seeded_session: AsyncSession,
+):
+    """A vendor's active vehicles come from the partial (vendor_id, ...) index."""
+    vendor_id = UUID(md5(b"plan-vendor-0").hexdigest())
+    query = VehicleRepository._list_query(
+        vendor_id=vendor_id, skip=0, limit=100, after=None
+    )
+
+    nodes = await explain(seeded_session, query)
+
+    assert _index_names(nodes) == ["ix_vehicle_active_vendor_id_created_at_id"]
+    assert not any(node["Node Type"] == "Sort" for node in nodes)
+
+
+async def test_counter_reconciliation_counts_vendors_from_partial_index(
+    seeded_session: AsyncSession,
+):
+    """Recounting active vendors reads only the partial index on active rows."""
+    nodes = await explain(seeded_session, _ACTUAL_COUNTS_SQL)
+
+    assert "ix_vendor_active_id" in _index_names(nodes)
+
+
+async def test_capacity_lookup_for_one_status_uses_status_capacity_index(
+    seeded_session: AsyncSession,
+):
+    """Status equality plus a capacity range is one ordered index range scan."""
+    query = VehicleRepository._capacity_query(
+        statuses=["Idle"], min_capacity=20.0, limit=50, after=None
+    )
+
+    nodes = await explain(seeded_session, query)
+
+    assert _index_names(nodes) == ["ix_vehicle_active_status_capacity_id"]
+    assert not any(node["Node Type"] == "Sort" for node in nodes)
+
+
+async def test_capacity_lookup_descending_keyset_uses_capacity_index(
+    seeded_session: AsyncSession,
+):
+    """Without a status, pages come from a backward scan of (capacity, id)."""
+    query = VehicleRepository._capacity_query(
+        max_capacity=40.0, descending=True, limit=50, after=(30.0, uuid4())
+    )
+
+    nodes = await explain(seeded_session, query)
+
+    assert _index_names(nodes) == ["ix_vehicle_active_capacity_id"]
+    assert not any(node["Node Type"] == "Sort" for node in nodes)
+
+
+@pytest.mark.parametrize("model", [Vehicle, Vendor])
+async def test_delta_sync_walks_updated_at_index(seeded_session: AsyncSession, model):
+    """A sync page is an ordered range scan of (updated_at, id) from the token."""
+    query = DeltaSync(model).query(
+        after=(datetime(2025, 1, 1), uuid4()),
+        horizon=get_naive_utc_now(),
+        limit=100,
+    )
+
+    nodes = await explain(seeded_session, query)
+
+    (scan,) = [node for node in nodes if "Index Name" in node]
+    assert scan["Index Name"] == f"ix_{model.__tablename__}_updated_at_id"
+    assert "updated_at" in scan["Index Cond"]
+    assert not any(node["Node Type"] == "Sort" for node in nodes)
@@ -0,0 +1,81 @@
+import time
+
+from starlette.requests import Request
+
+from src.core import db
+from src.core.config import settings
+from src.core.db import (
+    READ_YOUR_WRITES_COOKIE,
+    READ_YOUR_WRITES_HEADER,
+    ReplicaSet,
+    get_read_session,
+    is_pinned_to_primary,
+    read_your_writes_token,
+)
+
+# Nothing listens on port 1, so connecting fails immediately
+UNREACHABLE_URL = "postgresql+asyncpg://x:x@127.0.0.1:1/x"
+
+
+def make_request(headers: dict[str, str] | None = None) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "headers": raw})
+
+
+def test_fresh_write_marker_pins_reads_to_primary():
+    """Test that a marker from a recent write routes reads to the primary."""
+    now = time.time()
+    token = read_your_writes_token(now)
+
+    assert is_pinned_to_primary(make_request({READ_YOUR_WRITES_HEADER: token}), now)
+    assert is_pinned_to_primary(
+        make_request({"Cookie": f"{READ_YOUR_WRITES_COOKIE}={token}"}), now
+    )
+
+
+def test_expired_or_forged_write_markers_are_ignored():
+    """Test that expired, malformed, or too-distant markers do not pin reads."""
+    now = time.time()
+    expired = read_your_writes_token(now - settings.READ_YOUR_WRITES_SECONDS - 1)
+    too_far = str(int((now + 3600) * 1000))
+
+    for token in (expired, too_far, "not-a-number"):
+        request = make_request({READ_YOUR_WRITES_HEADER: token})
+        assert not is_pinned_to_primary(request, now)
+    assert not is_pinned_to_primary(make_request(), now)
+
+
+async def test_choose_skips_unhealthy_replicas():
+    """Test that round-robin only returns healthy replicas, or None."""
+    replicas = ReplicaSet(
+        [UNREACHABLE_URL, UNREACHABLE_URL.replace("/x", "/y")], max_lag=1, interval=1
+    )
+    first, second = replicas.replicas
+
+    assert {replicas.choose(), replicas.choose()} == {first, second}
+
+    first.healthy = False
+    assert [replicas.choose(), replicas.choose()] == [second, second]
+
+    second.healthy = False
+    assert replicas.choose() is None
+    await replicas.stop()
+
+
+async def test_unreachable_replica_falls_back_to_primary(monkeypatch):
+    """Test that a replica that cannot be reached is marked down and skipped."""
+    replicas = ReplicaSet([UNREACHABLE_URL], max_lag=1, interval=1)
+    monkeypatch.setattr(db, "replica_set", replicas)
+
+    sessions = get_read_session(make_request())
+    session = await anext(sessions)
+
+    assert session.bind is not None
+    assert session.bind.engine.url == db.engine.url
+    assert replicas.replicas[0].healthy is False
+    await sessions.aclose()
+
+    await replicas.check_all()
+    assert replicas.replicas[0].healthy is False
+    assert replicas.status()[0]["error"]
+    await replicas.stop()
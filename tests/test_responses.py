@@ -0,0 +1,40 @@
+import json
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from src.api.responses import ORMListSerializer
+from src.models.vehicle import Vehicle
+from src.schemas.vehicle import VehicleRead
+
+
+def test_orm_list_serializer_matches_read_schema():
+    """Test that dumping ORM rows yields the same JSON as the read schema."""
+    vehicle = Vehicle(
+        id=uuid4(),
+        vendor_id=uuid4(),
+        registration_number="KA-01-AB-1234",
+        make="Tata",
+        model="Prima",
+        capacity=12.5,
+        status="In Transit",
+        created_at=datetime(2025, 1, 1),
+        updated_at=datetime(2025, 1, 2),
+    )
+    serializer = ORMListSerializer(Vehicle, VehicleRead)
+
+    body = json.loads(serializer.dump_json([vehicle]))
+
+    expected = VehicleRead.model_validate(vehicle).model_dump(mode="json")
+    assert body == [expected]
+
+
+def test_orm_list_serializer_rejects_schema_fields_missing_from_model():
+    """Test that a read schema the model cannot satisfy fails at import time."""
+
+    class VehicleWithOwner(VehicleRead):
+        owner: str
+
+    with pytest.raises(TypeError, match="owner"):
+        ORMListSerializer(Vehicle, VehicleWithOwner)
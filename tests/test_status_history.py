@@ -0,0 +1,124 @@
+from datetime import date, datetime
+from uuid import UUID
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.status_history import VehicleStatusHistory
+from src.repositories.status_history import partition_name, status_history_repo
+from tests.conftest import VendorFactory, VehicleFactory
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_status_changes_are_recorded(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    create_vendor: VendorFactory,
+    create_vehicle: VehicleFactory,
+):
+    """Test that creates and status changes, but no other updates, are logged."""
+    vehicle_id = await create_vehicle(await create_vendor(), "HIST-1")
+    await client.put(f"/api/v1/vehicles/{vehicle_id}", json={"status": "In Transit"})
+    await client.put(f"/api/v1/vehicles/{vehicle_id}", json={"make": "Volvo"})
+    await client.post(
+        "/api/v1/vehicles/status",
+        json=[{"vehicle_id": vehicle_id, "status": "Maintenance"}],
+    )
+
+    result = await db_session.execute(
+        text(
+            "SELECT from_status, to_status FROM vehicle_status_history "
+            "WHERE vehicle_id = :vehicle_id ORDER BY id"
+        ),
+        {"vehicle_id": vehicle_id},
+    )
+    assert result.all() == [
+        (None, "Idle"),
+        ("Idle", "In Transit"),
+        ("In Transit", "Maintenance"),
+    ]
+
+
+async def test_time_in_status_over_a_range(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    create_vendor: VendorFactory,
+    create_vehicle: VehicleFactory,
+):
+    """Test that durations include the status held when the range starts."""
+    vehicle_id = UUID(await create_vehicle(await create_vendor(), "HIST-2"))
+    await db_session.execute(
+        insert(VehicleStatusHistory),
+        [
+            {"vehicle_id": vehicle_id, "to_status": status, "changed_at": changed_at}
+            for status, changed_at in [
+                ("Idle", datetime(2025, 1, 1, 0, 0)),
+                ("In Transit", datetime(2025, 1, 1, 10, 0)),
+                ("Idle", datetime(2025, 1, 1, 16, 0)),
+                ("Maintenance", datetime(2025, 1, 2, 0, 0)),
+            ]
+        ],
+    )
+
+    response = await client.get(
+        "/api/v1/vehicles/time-in-status",
+        params={
+            "vehicle_id": str(vehicle_id),
+            "start": "2025-01-01T06:00:00",
+            "end": "2025-01-02T06:00:00",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "vehicle_id": str(vehicle_id),
+            "vendor_id": None,
+            "seconds": {
+                "Idle": 12 * 3600.0,
+                "In Transit": 6 * 3600.0,
+                "Maintenance": 6 * 3600.0,
+            },
+        }
+    ]
+
+    response = await client.get(
+        "/api/v1/vehicles/time-in-status",
+        params={"start": "2025-01-02T00:00:00", "end": "2025-01-01T00:00:00"},
+    )
+    assert response.status_code == 400
+
+
+async def test_partitions_are_created_and_retired(db_session: AsyncSession):
+    """Test that maintenance adds upcoming months, moving early rows out of the
+    default partition, and drops months past retention."""
+    early = datetime(2031, 5, 20, 12, 0)
+    await db_session.execute(
+        insert(VehicleStatusHistory).values(
+            vehicle_id=UUID(int=1), to_status="Idle", changed_at=early
+        )
+    )
+
+    changes = await status_history_repo.maintain_partitions(
+        db_session, today=date(2031, 5, 10), months_ahead=1, retain_months=12
+    )
+
+    may, june = partition_name(date(2031, 5, 1)), partition_name(date(2031, 6, 1))
+    assert changes == ([may, june], [])
+    located = await db_session.execute(
+        text(
+            "SELECT tableoid::regclass::text FROM vehicle_status_history "
+            "WHERE changed_at = :early"
+        ),
+        {"early": early},
+    )
+    assert located.scalar_one() == may
+
+    created, dropped = await status_history_repo.maintain_partitions(
+        db_session, today=date(2032, 6, 1), months_ahead=0, retain_months=12
+    ) or ([], [])
+    assert created == [partition_name(date(2032, 6, 1))]
+    assert dropped == [may]
@@ -0,0 +1,135 @@
+import struct
+from datetime import date, datetime, timedelta
+from uuid import UUID, uuid4
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.analytics import utilization
+from src.analytics.utilization import (
+    SECONDS_PER_DAY,
+    daily_status_seconds,
+    read_binary_copy,
+    status_percentages,
+)
+from src.models.status_history import VehicleStatusHistory
+
+DAY = SECONDS_PER_DAY
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 1 << 20])
+def test_daily_status_seconds_splits_spans_across_days(monkeypatch, chunk_size):
+    """Test partial first/last days, whole days in between and clipping."""
+    monkeypatch.setattr(utilization, "CHUNK_SIZE", chunk_size)
+    seconds = daily_status_seconds(
+        groups=np.array([0, 0, 1, 1, 1]),
+        statuses=np.array([0, 1, 0, 1, -1]),
+        starts=np.array([0.5, 3.25, -2.0, 2.0, 0.0]) * DAY,
+        ends=np.array([3.25, 10.0, 0.25, 3.0, 5.0]) * DAY,
+        n_groups=2,
+        n_statuses=2,
+        days=5,
+    )
+
+    assert seconds.shape == (2, 5, 2)
+    np.testing.assert_allclose(
+        seconds / DAY,
+        [
+            [[0.5, 0], [1, 0], [1, 0], [0.25, 0.75], [0, 1]],
+            [[0.25, 0], [0, 0], [0, 1], [0, 0], [0, 0]],
+        ],
+    )
+
+
+def test_status_percentages_ignore_unobserved_days():
+    """Test that shares are of the recorded time, and 0 when none was."""
+    percentages, observed = status_percentages(
+        np.array([[[3600.0, 10800.0], [0.0, 0.0]]])
+    )
+    np.testing.assert_allclose(percentages, [[[25.0, 75.0], [0.0, 0.0]]])
+    np.testing.assert_allclose(observed, [[14400.0, 0.0]])
+
+
+def test_read_binary_copy():
+    """Test decoding fixed-width rows in PostgreSQL's binary COPY format."""
+    key = uuid4()
+    header = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+    rows = b"".join(
+        struct.pack(">hii", 3, 4, number)
+        + struct.pack(">i", 16)
+        + key.bytes
+        + struct.pack(">id", 8, number * 1.5)
+        for number in (1, 2)
+    )
+    data = header + rows + struct.pack(">h", -1)
+
+    spans = read_binary_copy(
+        data, [("number", ">i4"), ("key", "V16"), ("value", ">f8")]
+    )
+
+    assert spans["number"].tolist() == [1, 2]
+    assert spans["value"].tolist() == [1.5, 3.0]
+    assert UUID(bytes=spans["key"][1].tobytes()) == key
+    assert len(read_binary_copy(header + struct.pack(">h", -1), [("n", ">i4")])) == 0
+    with pytest.raises(ValueError):
+        read_binary_copy(data, [("number", ">i4")])
+
+
+@pytest.mark.asyncio
+async def test_utilization_endpoint(client: AsyncClient, db_session: AsyncSession):
+    """Test daily status shares per vendor from the recorded history."""
+    vendor = await client.post(
+        "/api/v1/vendors/",
+        json={"company_name": "Usage Co", "email": "usage@test.com"},
+    )
+    vendor_id = vendor.json()["id"]
+    vehicle = await client.post(
+        "/api/v1/vehicles/",
+        json={
+            "vendor_id": vendor_id,
+            "registration_number": "USE-1",
+            "make": "Tata",
+            "model": "Prima",
+        },
+    )
+    start = date(2025, 3, 1)
+    midnight = datetime(2025, 3, 1)
+    await db_session.execute(
+        insert(VehicleStatusHistory),
+        [
+            {
+                "vehicle_id": UUID(vehicle.json()["id"]),
+                "to_status": status,
+                "changed_at": midnight + timedelta(hours=hours),
+            }
+            for status, hours in [
+                ("Idle", -5),
+                ("In Transit", 6),
+                ("Maintenance", 30),
+            ]
+        ],
+    )
+
+    response = await client.get(
+        "/api/v1/analytics/utilization",
+        params={"start": start.isoformat(), "days": 2, "group_by": "vendor"},
+    )
+
+    assert response.status_code == 200
+    (report,) = [r for r in response.json() if r["vendor_id"] == vendor_id]
+    first, second = report["days"]
+    assert first["day"] == "2025-03-01"
+    assert first["observed_seconds"] == DAY
+    assert first["percent"]["Idle"] == 25.0
+    assert first["percent"]["In Transit"] == 75.0
+    assert second["percent"]["In Transit"] == 25.0
+    assert second["percent"]["Maintenance"] == 75.0
+
+    response = await client.get(
+        "/api/v1/analytics/utilization",
+        params={"start": start.isoformat(), "group_by": "vehicle"},
+    )
+    assert response.status_code == 400
@@ -0,0 +1,172 @@
+import pytest
+from httpx import AsyncClient
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_find_vehicles_by_capacity(client: AsyncClient):
+    """Test filtering by status, capacity and make, sorted and paged by capacity."""
+    vendor = await client.post(
+        "/api/v1/vendors/",
+        json={"company_name": "Capacity Co", "email": "capacity@test.com"},
+    )
+    vendor_id = vendor.json()["id"]
+    fleet = [
+        ("CAP-1", "Tata", "Idle", 25.0),
+        ("CAP-2", "Tata", "Idle", 12.0),
+        ("CAP-3", "Volvo", "Idle", 40.0),
+        ("CAP-4", "Tata", "In Transit", 30.0),
+        ("CAP-5", "Tata", "Idle", 35.0),
+    ]
+    for registration, make, vehicle_status, capacity in fleet:
+        await client.post(
+            "/api/v1/vehicles/",
+            json={
+                "vendor_id": vendor_id,
+                "registration_number": registration,
+                "make": make,
+                "model": "Any",
+                "status": vehicle_status,
+                "capacity": capacity,
+            },
+        )
+
+    params = {"status": "Idle", "min_capacity": 20, "vendor_id": vendor_id}
+    first = await client.get(
+        "/api/v1/vehicles/by-capacity", params={**params, "limit": 2}
+    )
+    second = await client.get(
+        "/api/v1/vehicles/by-capacity",
+        params={**params, "limit": 2, "cursor": first.headers["X-Next-Cursor"]},
+    )
+    registrations = [v["registration_number"] for v in first.json() + second.json()]
+    assert registrations == ["CAP-1", "CAP-5", "CAP-3"]
+
+    response = await client.get(
+        "/api/v1/vehicles/by-capacity",
+        params={"make": "Tata", "sort": "-capacity", "vendor_id": vendor_id},
+    )
+    capacities = [v["capacity"] for v in response.json()]
+    assert capacities == [35.0, 30.0, 25.0, 12.0]
+
+
+async def test_claim_vehicles(client: AsyncClient):
+    """Test that claiming takes the smallest matching idle vehicles first."""
+    vendor = await client.post(
+        "/api/v1/vendors/",
+        json={"company_name": "Dispatch Co", "email": "dispatch@test.com"},
+    )
+    vendor_id = vendor.json()["id"]
+    fleet = [
+        ("CLM-1", "Idle", 25.0),
+        ("CLM-2", "Idle", 12.0),
+        ("CLM-3", "Idle", 40.0),
+        ("CLM-4", "Maintenance", 20.0),
+        ("CLM-5", "Idle", 30.0),
+    ]
+    for registration, vehicle_status, capacity in fleet:
+        await client.post(
+            "/api/v1/vehicles/",
+            json={
+                "vendor_id": vendor_id,
+                "registration_number": registration,
+                "make": "Tata",
+                "model": "Prima",
+                "status": vehicle_status,
+                "capacity": capacity,
+            },
+        )
+
+    claim = {"count": 2, "min_capacity": 20, "vendor_id": vendor_id}
+    first = await client.post("/api/v1/vehicles/claim", json=claim)
+    assert first.status_code == 200
+    assert [v["registration_number"] for v in first.json()] == ["CLM-1", "CLM-5"]
+    assert {v["status"] for v in first.json()} == {"In Transit"}
+
+    second = await client.post("/api/v1/vehicles/claim", json=claim)
+    assert [v["registration_number"] for v in second.json()] == ["CLM-3"]
+    third = await client.post("/api/v1/vehicles/claim", json=claim)
+    assert third.json() == []
+
+    response = await client.post("/api/v1/vehicles/claim", json={"count": 0})
+    assert response.status_code == 422
+
+
+async def test_update_vehicle_statuses(client: AsyncClient):
+    """Test that a status batch reports every item and applies the valid ones."""
+    vendor = await client.post(
+        "/api/v1/vendors/",
+        json={"company_name": "Telematics Co", "email": "telematics@test.com"},
+    )
+    vendor_id = vendor.json()["id"]
+    vehicle_ids = []
+    for registration in ("TEL-1", "TEL-2"):
+        response = await client.post(
+            "/api/v1/vehicles/",
+            json={
+                "vendor_id": vendor_id,
+                "registration_number": registration,
+                "make": "Tata",
+                "model": "Prima",
+            },
+        )
+        vehicle_ids.append(response.json()["id"])
+
+    response = await client.post(
+        "/api/v1/vehicles/status",
+        json=[
+            {"vehicle_id": vehicle_ids[0], "status": "In Transit"},
+            {"registration_number": "TEL-2", "status": "Maintenance"},
+            {"registration_number": "TEL-404", "status": "Idle"},
+            {"registration_number": "TEL-1", "status": "Parked"},
+        ],
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["total"], report["updated"], report["failed"]) == (4, 2, 2)
+    first, second, missing, invalid = report["results"]
+    assert first["updated"] and second["updated"]
+    assert second["vehicle_id"] == vehicle_ids[1]
+    assert missing["errors"] == ["Vehicle with registration number TEL-404 not found."]
+    assert invalid["errors"][0].startswith("status:")
+
+    statuses = [
+        (await client.get(f"/api/v1/vehicles/{vehicle_id}")).json()["status"]
+        for vehicle_id in vehicle_ids
+    ]
+    assert statuses == ["In Transit", "Maintenance"]
+
+
+async def test_update_vehicle_statuses_by_id_and_registration(client: AsyncClient):
+    """Test that naming one vehicle by ID and by registration is a conflict."""
+    vendor = await client.post(
+        "/api/v1/vendors/",
+        json={"company_name": "Mixed Co", "email": "mixed@test.com"},
+    )
+    response = await client.post(
+        "/api/v1/vehicles/",
+        json={
+            "vendor_id": vendor.json()["id"],
+            "registration_number": "MIX-1",
+            "make": "Tata",
+            "model": "Prima",
+        },
+    )
+    vehicle_id = response.json()["id"]
+
+    response = await client.post(
+        "/api/v1/vehicles/status",
+        json=[
+            {"registration_number": "MIX-1", "status": "Maintenance"},
+            {"vehicle_id": vehicle_id, "status": "In Transit"},
+        ],
+    )
+
+    report = response.json()
+    assert (report["updated"], report["failed"]) == (1, 1)
+    superseded, applied = report["results"]
+    assert superseded["errors"] == ["Superseded by item 1."]
+    assert applied["updated"] and applied["vehicle_id"] == vehicle_id
+    vehicle = await client.get(f"/api/v1/vehicles/{vehicle_id}")
+    assert vehicle.json()["status"] == "In Transit"
@@ -0,0 +1,102 @@
+import asyncio
+from collections import Counter
+from typing import AsyncGenerator, List
+from uuid import UUID, uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlmodel import col
+
+from src.models.vehicle import Vehicle
+from src.models.vendor import Vendor
+from src.repositories.vehicle import vehicle_repo
+from tests.conftest import TEST_DATABASE_URL
+
+pytestmark = pytest.mark.asyncio
+
+FLEET_SIZE = 60
+CLAIMERS = 20
+CLAIM_SIZE = 4
+
+
+@pytest_asyncio.fixture
+async def claim_engine(
+    restore_trigger_written_tables: None,
+) -> AsyncGenerator[AsyncEngine, None]:
+    """
+    Claims only race each other across separate connections and committed
+    rows, so unlike the other tests this one cannot run inside a single
+    rolled-back transaction. It commits its own fleet and removes it after.
+    """
+    engine = create_async_engine(TEST_DATABASE_URL, pool_size=CLAIMERS)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def idle_fleet(claim_engine: AsyncEngine) -> AsyncGenerator[UUID, None]:
+    vendor_id = uuid4()
+    async with claim_engine.begin() as conn:
+        await conn.execute(
+            insert(Vendor).values(
+                id=vendor_id,
+                company_name="Claim Race Co",
+                email=f"{vendor_id}@claims.test",
+            )
+        )
+        await conn.execute(
+            insert(Vehicle),
+            [
+                {
+                    "id": uuid4(),
+                    "vendor_id": vendor_id,
+                    "registration_number": f"RACE-{vendor_id.hex[:8]}-{i}",
+                    "make": "Tata",
+                    "model": "Prima",
+                    "capacity": float(i % 7),
+                    "status": "Idle",
+                }
+                for i in range(FLEET_SIZE)
+            ],
+        )
+    yield vendor_id
+    async with claim_engine.begin() as conn:
+        await conn.execute(delete(Vehicle).where(col(Vehicle.vendor_id) == vendor_id))
+        await conn.execute(delete(Vendor).where(col(Vendor.id) == vendor_id))
+
+
+async def test_concurrent_claims_never_share_a_vehicle(
+    claim_engine: AsyncEngine, idle_fleet: UUID
+):
+    """
+    Test that many simultaneous claimers, each in its own transaction, split
+    the idle fleet between them without any vehicle being claimed twice.
+    """
+    session_factory = async_sessionmaker(claim_engine, expire_on_commit=False)
+    start = asyncio.Event()
+
+    async def claimer() -> List[UUID]:
+        claimed: List[UUID] = []
+        async with session_factory() as session:
+            await start.wait()
+            while True:
+                batch = await vehicle_repo.claim(
+                    session, count=CLAIM_SIZE, vendor_id=idle_fleet
+                )
+                await session.commit()
+                if not batch:
+                    return claimed
+                claimed.extend(vehicle.id for vehicle in batch)
+
+    tasks = [asyncio.create_task(claimer()) for _ in range(CLAIMERS)]
+    start.set()
+    results = await asyncio.gather(*tasks)
+
+    claims = Counter(vehicle_id for claimed in results for vehicle_id in claimed)
+    assert [vid for vid, times in claims.items() if times > 1] == []
+    assert len(claims) == FLEET_SIZE
+
+    async with session_factory() as session:
+        assert await vehicle_repo.claim(session, count=1, vendor_id=idle_fleet) == []
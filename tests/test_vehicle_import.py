@@ -0,0 +1,110 @@
+import json
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.config import settings
+from tests.conftest import VendorFactory
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_import_vehicles_csv_reports_rejected_rows(
+    client: AsyncClient, create_vendor: VendorFactory
+):
+    """Test a CSV import inserts valid rows and reports every rejected row."""
+    vendor_id = await create_vendor()
+    missing_vendor_id = uuid4()
+    body = "\n".join(
+        [
+            "vendor_id,registration_number,make,model,capacity,status",
+            f"{vendor_id},IMP-001,Tata,Prima,12.5,Idle",
+            f"{vendor_id},IMP-002,Tata,Signa,,In Transit",
+            f"{vendor_id},IMP-001,Tata,Prima,12.5,Idle",
+            f"{missing_vendor_id},IMP-003,Tata,Prima,1,Idle",
+            f"{vendor_id},IMP-004,Tata,Prima,1,Flying",
+        ]
+    )
+
+    response = await client.post(
+        "/api/v1/vehicles/import",
+        content=body,
+        headers={"Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["total_rows"] == 5
+    assert report["imported"] == 2
+    assert report["failed"] == 3
+    assert [error["row"] for error in report["errors"]] == [3, 4, 5]
+    assert "already exists" in report["errors"][0]["errors"][0]
+    assert str(missing_vendor_id) in report["errors"][1]["errors"][0]
+    assert report["errors"][2]["errors"][0].startswith("status")
+
+    listed = await client.get(f"/api/v1/vehicles/vendor/{vendor_id}")
+    assert {v["registration_number"] for v in listed.json()} == {"IMP-001", "IMP-002"}
+
+
+async def test_import_vehicles_ndjson_skips_existing_registration(
+    client: AsyncClient, create_vendor: VendorFactory
+):
+    """Test an NDJSON import rejects registrations that already exist."""
+    vendor_id = await create_vendor()
+    await client.post(
+        "/api/v1/vehicles/",
+        json={
+            "vendor_id": vendor_id,
+            "registration_number": "NDJ-001",
+            "make": "Tata",
+            "model": "Prima",
+        },
+    )
+    rows = [
+        {
+            "vendor_id": vendor_id,
+            "registration_number": reg,
+            "make": "Eicher",
+            "model": "Pro",
+        }
+        for reg in ("NDJ-001", "NDJ-002")
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\nnot json\n"
+
+    response = await client.post(
+        "/api/v1/vehicles/import",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["imported"] == 1
+    assert [error["row"] for error in report["errors"]] == [1, 3]
+
+
+async def test_import_vehicles_unsupported_content_type(client: AsyncClient):
+    """Test that uploads other than CSV or NDJSON are rejected."""
+    response = await client.post(
+        "/api/v1/vehicles/import",
+        content="<vehicles/>",
+        headers={"Content-Type": "application/xml"},
+    )
+    assert response.status_code == 415
+
+
+async def test_import_vehicles_rejects_overlong_lines(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that a line longer than the limit, even unterminated, gets a 413."""
+    monkeypatch.setattr(settings, "VEHICLE_IMPORT_MAX_LINE_BYTES", 100)
+
+    for body in ("{}\n" + "x" * 101 + "\n{}\n", "x" * 1000):
+        response = await client.post(
+            "/api/v1/vehicles/import",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == 413
+        assert "100 bytes" in response.json()["detail"]
@@ -2,10 +2,14 @@ from unittest.mock import AsyncMock
 from uuid import uuid4
 
 import pytest
+from sqlalchemy.exc import IntegrityError
 
+from src.core.config import settings
+from src.repositories.vehicle import REGISTRATION_NUMBER_CONSTRAINT, VENDOR_FOREIGN_KEY
 from src.schemas.vehicle import VehicleCreate, VehicleStatus, VehicleUpdate
 from src.services.vehicle_service import (
     RegistrationAlreadyExists,
+    VehicleNotFound,
     VehicleService,
     VendorNotFound,
 )
@@ -44,6 +48,15 @@ def valid_vehicle_create(dummy_vendor_id):
     )
 
 
+def integrity_error(constraint_name: str) -> IntegrityError:
+    """Builds an IntegrityError shaped like the asyncpg adapter's."""
+    driver_error = Exception(f"violates constraint {constraint_name}")
+    driver_error.constraint_name = constraint_name  # type: ignore[attr-defined]
+    orig = Exception("IntegrityError")
+    orig.__cause__ = driver_error
+    return IntegrityError("INSERT INTO vehicle ...", {}, orig)
+
+
 # --- Tests ---
 
 
@@ -53,35 +66,30 @@ async def test_create_vehicle_success(
     mock_vendor_repo,
     mock_vehicle_repo,
     valid_vehicle_create,
-    dummy_vendor_id,
 ):
-    """Test successful vehicle creation when vendor exists and registration is unique."""
-    # 1. Setup mocks: Pretend vendor exists, and vehicle does NOT exist
-    mock_vendor_repo.get.return_value = AsyncMock(id=dummy_vendor_id)
-    mock_vehicle_repo.find_by_registration_number.return_value = None
+    """Test that vehicle creation is a single repository write with no pre-checks."""
     mock_vehicle_repo.create.return_value = AsyncMock(
         id=uuid4(), **valid_vehicle_create.model_dump()
     )
 
-    # 2. Execute
     dummy_session = AsyncMock()
     result = await vehicle_service.create_vehicle(dummy_session, valid_vehicle_create)
 
-    # 3. Assert
     assert result.registration_number == valid_vehicle_create.registration_number
-    mock_vendor_repo.get.assert_called_once_with(dummy_session, dummy_vendor_id)
-    mock_vehicle_repo.create.assert_called_once()
+    mock_vehicle_repo.create.assert_called_once_with(
+        dummy_session, obj_in=valid_vehicle_create
+    )
+    mock_vendor_repo.get.assert_not_called()
+    mock_vehicle_repo.find_by_registration_number.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_create_vehicle_vendor_not_found(
-    vehicle_service, mock_vendor_repo, valid_vehicle_create, dummy_vendor_id
+    vehicle_service, mock_vehicle_repo, valid_vehicle_create, dummy_vendor_id
 ):
-    """Test that creating a vehicle fails if the vendor ID does not exist."""
-    # 1. Setup mock: Pretend vendor is NOT found
-    mock_vendor_repo.get.return_value = None
+    """Test that a vendor foreign key violation is raised as VendorNotFound."""
+    mock_vehicle_repo.create.side_effect = integrity_error(VENDOR_FOREIGN_KEY)
 
-    # 2. Execute & Assert
     dummy_session = AsyncMock()
     with pytest.raises(VendorNotFound) as exc_info:
         await vehicle_service.create_vehicle(dummy_session, valid_vehicle_create)
@@ -91,67 +99,77 @@ async def test_create_vehicle_vendor_not_found(
 
 @pytest.mark.asyncio
 async def test_create_vehicle_duplicate_registration(
-    vehicle_service,
-    mock_vendor_repo,
-    mock_vehicle_repo,
-    valid_vehicle_create,
-    dummy_vendor_id,
+    vehicle_service, mock_vehicle_repo, valid_vehicle_create
 ):
-    """Test that creating a vehicle fails if the registration number is already taken."""
-    # 1. Setup mocks: Pretend vendor exists, but vehicle ALSO already exists
-    mock_vendor_repo.get.return_value = AsyncMock(id=dummy_vendor_id)
-    mock_vehicle_repo.find_by_registration_number.return_value = AsyncMock(id=uuid4())
+    """Test that a registration unique violation is raised as RegistrationAlreadyExists."""
+    mock_vehicle_repo.create.side_effect = integrity_error(
+        REGISTRATION_NUMBER_CONSTRAINT
+    )
 
-    # 2. Execute & Assert
     dummy_session = AsyncMock()
     with pytest.raises(RegistrationAlreadyExists):
         await vehicle_service.create_vehicle(dummy_session, valid_vehicle_create)
 
 
+@pytest.mark.asyncio
+async def test_create_vehicle_unknown_integrity_error(
+    vehicle_service, mock_vehicle_repo, valid_vehicle_create
+):
+    """Test that violations of unrelated constraints are not swallowed."""
+    mock_vehicle_repo.create.side_effect = integrity_error("some_other_constraint")
+
+    dummy_session = AsyncMock()
+    with pytest.raises(IntegrityError):
+        await vehicle_service.create_vehicle(dummy_session, valid_vehicle_create)
+
+
 # --- Update Vehicle Tests ---
 
 
 @pytest.mark.asyncio
 async def test_update_vehicle_success(vehicle_service, mock_vehicle_repo):
-    """Test updating a vehicle without triggering validation errors."""
+    """Test that updating a vehicle is a single repository write."""
     dummy_session = AsyncMock()
     vehicle_id = uuid4()
+    mock_vehicle_repo.update.return_value = AsyncMock(id=vehicle_id, make="Toyota")
+
+    update_data = VehicleUpdate(make="Toyota")
+    result = await vehicle_service.update_vehicle(
+        dummy_session, vehicle_id, update_data
+    )
 
-    # Mock the existing vehicle in the DB
-    existing_vehicle = AsyncMock(
-        id=vehicle_id, vendor_id=uuid4(), registration_number="OLD-123"
+    assert result.make == "Toyota"
+    mock_vehicle_repo.update.assert_called_once_with(
+        dummy_session,
+        obj_id=vehicle_id,
+        obj_in=update_data,
+        expected_updated_at=None,
     )
-    mock_vehicle_repo.get.return_value = existing_vehicle
+    mock_vehicle_repo.get.assert_not_called()
 
-    # Execute
-    update_data = VehicleUpdate(make="Toyota")
-    await vehicle_service.update_vehicle(dummy_session, vehicle_id, update_data)
 
-    # Assert
-    mock_vehicle_repo.get.assert_called_once_with(dummy_session, vehicle_id)
-    mock_vehicle_repo.update.assert_called_once()
+@pytest.mark.asyncio
+async def test_update_vehicle_not_found(vehicle_service, mock_vehicle_repo):
+    """Test updating a vehicle fails if no active vehicle matched."""
+    dummy_session = AsyncMock()
+    mock_vehicle_repo.update.return_value = None
+
+    with pytest.raises(VehicleNotFound):
+        await vehicle_service.update_vehicle(
+            dummy_session, uuid4(), VehicleUpdate(make="Toyota")
+        )
 
 
 @pytest.mark.asyncio
-async def test_update_vehicle_vendor_not_found(
-    vehicle_service, mock_vehicle_repo, mock_vendor_repo
-):
+async def test_update_vehicle_vendor_not_found(vehicle_service, mock_vehicle_repo):
     """Test updating a vehicle fails if the new vendor does not exist."""
     dummy_session = AsyncMock()
-    vehicle_id = uuid4()
-
-    existing_vehicle = AsyncMock(
-        id=vehicle_id, vendor_id=uuid4(), registration_number="OLD-123"
-    )
-    mock_vehicle_repo.get.return_value = existing_vehicle
+    mock_vehicle_repo.update.side_effect = integrity_error(VENDOR_FOREIGN_KEY)
 
-    # Mock the new vendor failing to be found
-    mock_vendor_repo.get.return_value = None
-    new_vendor_id = uuid4()
-    update_data = VehicleUpdate(vendor_id=new_vendor_id)
+    update_data = VehicleUpdate(vendor_id=uuid4())
 
     with pytest.raises(VendorNotFound):
-        await vehicle_service.update_vehicle(dummy_session, vehicle_id, update_data)
+        await vehicle_service.update_vehicle(dummy_session, uuid4(), update_data)
 
 
 @pytest.mark.asyncio
@@ -160,21 +178,14 @@ async def test_update_vehicle_duplicate_registration(
 ):
     """Test updating a vehicle fails if the new registration number is taken."""
     dummy_session = AsyncMock()
-    vehicle_id = uuid4()
-
-    existing_vehicle = AsyncMock(
-        id=vehicle_id, vendor_id=uuid4(), registration_number="OLD-123"
+    mock_vehicle_repo.update.side_effect = integrity_error(
+        REGISTRATION_NUMBER_CONSTRAINT
     )
-    mock_vehicle_repo.get.return_value = existing_vehicle
-
-    # Mock finding a DIFFERENT vehicle with the requested new registration
-    other_vehicle = AsyncMock(id=uuid4(), registration_number="NEW-123")
-    mock_vehicle_repo.find_by_registration_number.return_value = other_vehicle
 
     update_data = VehicleUpdate(registration_number="NEW-123")
 
     with pytest.raises(RegistrationAlreadyExists):
-        await vehicle_service.update_vehicle(dummy_session, vehicle_id, update_data)
+        await vehicle_service.update_vehicle(dummy_session, uuid4(), update_data)
 
 
 # --- Delete Vehicle Tests ---
@@ -186,8 +197,7 @@ async def test_delete_vehicle_soft(vehicle_service, mock_vehicle_repo):
     dummy_session = AsyncMock()
     vehicle_id = uuid4()
 
-    existing_vehicle = AsyncMock(id=vehicle_id, is_active=True)
-    mock_vehicle_repo.get.return_value = existing_vehicle
+    mock_vehicle_repo.update.return_value = AsyncMock(id=vehicle_id, is_active=False)
 
     # Execute soft delete
     await vehicle_service.delete_vehicle(dummy_session, vehicle_id, permanent=False)
@@ -198,6 +208,7 @@ async def test_delete_vehicle_soft(vehicle_service, mock_vehicle_repo):
 
     # Assert the data passed to update sets is_active to False
     called_args = mock_vehicle_repo.update.call_args.kwargs
+    assert called_args["obj_id"] == vehicle_id
     assert called_args["obj_in"].is_active is False
 
 
@@ -218,3 +229,101 @@ async def test_delete_vehicle_permanent(vehicle_service, mock_vehicle_repo):
     mock_vehicle_repo.delete.assert_called_once_with(
         dummy_session, db_obj=existing_vehicle
     )
+
+
+# --- Batch Status Update Tests ---
+
+
+@pytest.mark.asyncio
+async def test_update_vehicle_statuses_reports_each_item(
+    vehicle_service, mock_vehicle_repo
+):
+    """Test validation, last-wins deduplication and not-found reporting."""
+    dummy_session = AsyncMock()
+    vehicle_id = uuid4()
+    resolved_id = uuid4()
+    mock_vehicle_repo.find_ids_by_registration_numbers.return_value = {
+        "KA-01-AB-1234": resolved_id
+    }
+    mock_vehicle_repo.bulk_update_status.return_value = {1: vehicle_id, 3: resolved_id}
+
+    report = await vehicle_service.update_vehicle_statuses(
+        dummy_session,
+        [
+            {"vehicle_id": str(vehicle_id), "status": "Idle"},
+            {"vehicle_id": str(vehicle_id), "status": "In Transit"},
+            {"status": "Idle"},
+            {"registration_number": "KA-01-AB-1234", "status": "Maintenance"},
+            {"registration_number": "KA-99-ZZ-9999", "status": "Idle"},
+        ],
+    )
+
+    applied = mock_vehicle_repo.bulk_update_status.call_args.kwargs["changes"]
+    assert [index for index, _ in applied] == [1, 3, 4]
+    assert (report.total, report.updated, report.failed) == (5, 2, 3)
+    superseded, moved, invalid, resolved, missing = report.results
+    assert superseded.errors == ["Superseded by item 1."]
+    assert moved.updated and moved.status == VehicleStatus.IN_TRANSIT
+    assert invalid.errors and not invalid.updated
+    assert resolved.vehicle_id == resolved_id
+    assert missing.errors == [
+        "Vehicle with registration number KA-99-ZZ-9999 not found."
+    ]
+
+
+@pytest.mark.asyncio
+async def test_update_vehicle_statuses_deduplicates_by_resolved_vehicle(
+    vehicle_service, mock_vehicle_repo
+):
+    """Test that a vehicle named once by ID and once by registration is one item."""
+    dummy_session = AsyncMock()
+    vehicle_id = uuid4()
+    mock_vehicle_repo.find_ids_by_registration_numbers.return_value = {
+        "KA-01-AB-1234": vehicle_id
+    }
+    mock_vehicle_repo.bulk_update_status.return_value = {1: vehicle_id}
+
+    report = await vehicle_service.update_vehicle_statuses(
+        dummy_session,
+        [
+            {"vehicle_id": str(vehicle_id), "status": "In Transit"},
+            {"registration_number": "KA-01-AB-1234", "status": "Maintenance"},
+        ],
+    )
+
+    mock_vehicle_repo.find_ids_by_registration_numbers.assert_called_once_with(
+        dummy_session, registration_numbers=["KA-01-AB-1234"]
+    )
+    ((index, applied),) = mock_vehicle_repo.bulk_update_status.call_args.kwargs[
+        "changes"
+    ]
+    assert (index, applied.vehicle_id, applied.registration_number) == (
+        1,
+        vehicle_id,
+        None,
+    )
+    superseded, resolved = report.results
+    assert superseded.errors == ["Superseded by item 1."]
+    assert resolved.updated and resolved.registration_number == "KA-01-AB-1234"
+
+
+@pytest.mark.asyncio
+async def test_update_vehicle_statuses_in_chunks(
+    vehicle_service, mock_vehicle_repo, monkeypatch
+):
+    """Test that large batches are applied one UPDATE per chunk."""
+    monkeypatch.setattr(settings, "VEHICLE_STATUS_BATCH_CHUNK_SIZE", 2)
+    mock_vehicle_repo.bulk_update_status.return_value = {}
+
+    await vehicle_service.update_vehicle_statuses(
+        AsyncMock(),
+        [{"registration_number": f"REG-{i}", "status": "Idle"} for i in range(5)],
+    )
+
+    chunk_sizes = [
+        len(call.kwargs["changes"])
+        for call in mock_vehicle_repo.bulk_update_status.call_args_list
+    ]
+    assert chunk_sizes == [2, 2, 1]
+    # Registration numbers alone cannot collide with IDs
+    mock_vehicle_repo.find_ids_by_registration_numbers.assert_not_called()
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from httpx import AsyncClient
 
@@ -55,3 +57,93 @@ async def test_create_vendor_conflict(client: AsyncClient):
     )
     assert response.status_code == 409
     assert "email already exists" in response.json()["detail"]
+
+
+async def test_list_vendors_cursor_pagination(client: AsyncClient):
+    """Test that following X-Next-Cursor walks every vendor exactly once."""
+    created_ids = set()
+    for i in range(5):
+        response = await client.post(
+            "/api/v1/vendors/",
+            json={"company_name": f"Cursor Co {i}", "email": f"cursor{i}@test.com"},
+        )
+        created_ids.add(response.json()["id"])
+
+    seen_ids = []
+    params = {"limit": 2}
+    while True:
+        response = await client.get("/api/v1/vendors/", params=params)
+        assert response.status_code == 200
+        seen_ids.extend(vendor["id"] for vendor in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params = {"limit": 2, "cursor": cursor}
+
+    assert len(seen_ids) == len(set(seen_ids))
+    assert created_ids <= set(seen_ids)
+
+
+async def test_list_vendors_invalid_cursor(client: AsyncClient):
+    """Test that a malformed cursor is rejected with a 400."""
+    response = await client.get("/api/v1/vendors/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+async def test_export_vendors_streams_ndjson_and_csv(client: AsyncClient):
+    """Test that the vendor export streams matching vendors in both formats."""
+    await client.post(
+        "/api/v1/vendors/",
+        json={"company_name": "Export Freight", "email": "export@test.com"},
+    )
+
+    ndjson = await client.get("/api/v1/vendors/export", params={"q": "Export"})
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [row["email"] for row in lines] == ["export@test.com"]
+
+    csv_response = await client.get(
+        "/api/v1/vendors/export", params={"q": "Export", "format": "csv"}
+    )
+    assert csv_response.status_code == 200
+    header, row = csv_response.text.splitlines()
+    assert header.startswith("company_name,")
+    assert "export@test.com" in row
+
+
+async def test_search_vendors_ranks_closest_match_first(client: AsyncClient):
+    """Test that vendor search returns substring matches ordered by similarity."""
+    for company, email in [
+        ("Shacmeton Haulage", "shacmeton@test.com"),
+        ("Acme Freight", "acme@test.com"),
+        ("Unrelated Movers", "movers@test.com"),
+    ]:
+        await client.post(
+            "/api/v1/vendors/", json={"company_name": company, "email": email}
+        )
+
+    response = await client.get("/api/v1/vendors/search/", params={"q": "acme"})
+
+    assert response.status_code == 200
+    names = [vendor["company_name"] for vendor in response.json()]
+    assert names == ["Acme Freight", "Shacmeton Haulage"]
+
+
+async def test_update_vendor_invalidates_cached_lookup(client: AsyncClient):
+    """Test that reads served from the vendor cache reflect a later update."""
+    create_response = await client.post(
+        "/api/v1/vendors/",
+        json={"company_name": "Cached Co", "email": "cached@test.com"},
+    )
+    vendor_id = create_response.json()["id"]
+
+    first = await client.get(f"/api/v1/vendors/{vendor_id}")
+    assert first.json()["company_name"] == "Cached Co"
+
+    await client.put(
+        f"/api/v1/vendors/{vendor_id}", json={"company_name": "Renamed Co"}
+    )
+
+    second = await client.get(f"/api/v1/vendors/{vendor_id}")
+    assert second.json()["company_name"] == "Renamed Co"